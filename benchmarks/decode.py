@@ -0,0 +1,115 @@
+"""Per-cycle decode time: per-entity ENTITIES_DICT loop vs. compiled DecodePlan.
+
+Usage (from the repository root, with homeassistant and pymodbus installed):
+
+    python -m benchmarks.decode --repeat 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import timeit
+from typing import Any
+
+from custom_components.ha_comfoconnectpro import MyModbusHub
+from custom_components.ha_comfoconnectpro.const import (
+    ENTITIES_DICT,
+    get_entity_factor,
+    get_entity_max,
+    get_entity_min,
+    get_entity_reg,
+    get_entity_select,
+    get_entity_switch,
+    is_entity_climate,
+    is_entity_readonly,
+    is_entity_select,
+    is_entity_switch,
+)
+
+
+def _decode_numeric(props: dict, raw: int) -> float | None:
+    # Sentinel für 'ungültig': -500
+    if raw == -500:
+        return None
+    return float(raw * (get_entity_factor(props) or 1.0))
+
+
+def legacy_decode_value(props: dict, raw: int | bool) -> Any:
+    """Former per-entity decoder of the hub: classify the entity on every call."""
+    if is_entity_switch(props):
+        off_v = (get_entity_switch(props) or {}).get("off", 0)
+        return "off" if raw == off_v else "on"
+    if is_entity_select(props):
+        values = get_entity_select(props) or {}
+        return values.get(raw, f"Ungültiger Wert: {raw}")
+    if is_entity_climate(props) and not is_entity_readonly(props):
+        return {
+            "temperature": _decode_numeric(props, raw),
+            "target_temp_low": get_entity_min(props),
+            "target_temp_high": get_entity_max(props),
+        }
+    return _decode_numeric(props, raw)
+
+
+def _random_buffers(hub: MyModbusHub) -> list[list[int | bool]]:
+    rnd = random.Random(0)
+    buffers: list[list[int | bool]] = []
+    for decoder in hub._decode_plan.blocks:
+        count = decoder.block.count
+        if decoder.is_bits:
+            buffers.append([rnd.random() < 0.5 for _ in range(count)])
+        else:
+            buffers.append([rnd.randrange(0, 300) for _ in range(count)])
+    return buffers
+
+
+def _legacy_cycle(hub: MyModbusHub, buffers: list[list[int | bool]]) -> dict:
+    """Former loop: classify and convert every entity on every poll."""
+    data: dict = {}
+    for block, buf in zip(hub._read_plan, buffers):
+        for entity_key in block.keys:
+            props = ENTITIES_DICT[entity_key]
+            reg, dt = get_entity_reg(props)
+            raw = hub.read_entity_value(buf, reg - block.address, dt)
+            data[entity_key] = legacy_decode_value(props, raw)
+    return data
+
+
+def _compiled_cycle(hub: MyModbusHub, buffers: list[list[int | bool]]) -> dict:
+    data: dict = {}
+    for buffer_id, buf in enumerate(buffers):
+        hub._decode_plan.decode_block(buffer_id, buf, data)
+    return data
+
+
+async def _run(repeat: int) -> dict:
+    hub = MyModbusHub(None, "bench", "127.0.0.1", 502, 15, 1)
+    buffers = _random_buffers(hub)
+    if _legacy_cycle(hub, buffers) != _compiled_cycle(hub, buffers):
+        raise AssertionError("compiled decode differs from legacy decode")
+
+    results = {}
+    for name, func in (("legacy_loop", _legacy_cycle), ("compiled_plan", _compiled_cycle)):
+        best = min(
+            timeit.repeat(lambda: func(hub, buffers), number=repeat, repeat=5)
+        )
+        results[name] = {"us_per_cycle": round(best / repeat * 1e6, 2)}
+    results["speedup"] = round(
+        results["legacy_loop"]["us_per_cycle"] / results["compiled_plan"]["us_per_cycle"], 2
+    )
+    results["entities"] = len(ENTITIES_DICT)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
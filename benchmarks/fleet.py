@@ -0,0 +1,289 @@
+"""Fleet load test: N simulated units, N config entries in one Home Assistant core.
+
+The simulators (benchmarks.simulator) run in a child process, so their CPU and memory
+do not count against the core. The core is a real HomeAssistant instance with this
+integration loaded from custom_components/; the fleet grows in steps and after a
+warm-up each step measures:
+
+- event-loop lag: lateness of a 10 ms ticker (p50/p99/max),
+- CPU of the event-loop thread per hub cycle (async_read_modbus_registers calls),
+- resident memory per hub (RSS growth of the step / added hubs),
+- entity state writes per second (hub counters) and state_changed events per second,
+- cycle overruns, skipped ticks and the worst cycle p95 reported by the hubs.
+
+Usage (from the repository root, with homeassistant and pymodbus installed):
+
+    python -m benchmarks.fleet --steps 10,50,100,200,400 --duration 30
+    python -m benchmarks.fleet --fleet-mode --units-per-gateway 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from multiprocessing.connection import Connection
+from pathlib import Path
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    EVENT_STATE_CHANGED,
+)
+from homeassistant.core import HomeAssistant
+
+from custom_components.ha_comfoconnectpro import MyModbusHub, const
+
+from .simulator import start_simulator
+
+_REPO = Path(__file__).resolve().parent.parent
+
+
+# ---- Simulatoren im Kindprozess ---------------------------------------------
+
+
+def _simulator_process(conn: Connection, latency: float, jitter: float) -> None:
+    """Startet auf Anfrage ("start", n) weitere Simulatoren und meldet deren Ports."""
+
+    async def serve() -> None:
+        loop = asyncio.get_running_loop()
+        sims = []
+        while True:
+            command, count = await loop.run_in_executor(None, conn.recv)
+            if command == "stop":
+                break
+            new = [
+                await start_simulator(latency=latency, jitter=jitter, seed=len(sims) + i)
+                for i in range(count)
+            ]
+            sims.extend(new)
+            conn.send([sim.port for sim in new])
+        for sim in sims:
+            await sim.stop()
+
+    asyncio.run(serve())
+
+
+# ---- Messhilfen ---------------------------------------------------------------
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+
+async def _loop_lag(interval: float, duration: float) -> list[float]:
+    """Verspätungen eines Tickers mit fester Periode (s)."""
+    lags: list[float] = []
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time() + interval
+    end = next_tick + duration
+    while next_tick < end:
+        await asyncio.sleep(max(next_tick - loop.time(), 0))
+        lags.append(max(loop.time() - next_tick, 0.0))
+        next_tick += interval
+    return lags
+
+
+class _CycleCounter:
+    """Zählt Lesezyklen aller Hubs über MyModbusHub.async_read_modbus_registers."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        original = MyModbusHub.async_read_modbus_registers
+        counter = self
+
+        async def counted(hub: MyModbusHub, *args, **kwargs):
+            counter.count += 1
+            return await original(hub, *args, **kwargs)
+
+        MyModbusHub.async_read_modbus_registers = counted
+
+
+# ---- Home Assistant Core ------------------------------------------------------
+
+
+async def _start_core(config_dir: str) -> HomeAssistant:
+    """Minimaler Core ohne configuration.yaml, die Integration aus custom_components/."""
+    os.symlink(_REPO / "custom_components", Path(config_dir) / "custom_components")
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    # Registries, Übersetzungen und Config Entries wie beim Start des Cores
+    await bootstrap.async_load_base_functionality(hass)
+    await hass.async_start()
+    return hass
+
+
+async def _add_entries(
+    hass: HomeAssistant, ports: list[int], units: range, args: argparse.Namespace
+) -> None:
+    """Unit i hängt am Simulator i // units_per_gateway mit Unit-ID i % units_per_gateway + 1."""
+    for index in units:
+        name = f"unit{index:04d}"
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=const.DOMAIN,
+            title=name,
+            data={
+                CONF_NAME: name,
+                CONF_HOST: "127.0.0.1",
+                CONF_PORT: ports[index // args.units_per_gateway],
+                const.CONF_HOSTID: index % args.units_per_gateway + 1,
+                CONF_SCAN_INTERVAL: args.scan_interval,
+                const.CONF_FLEET_MODE: args.fleet_mode,
+            },
+            source=config_entries.SOURCE_USER,
+        )
+        await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+
+
+def _hubs(hass: HomeAssistant) -> list[MyModbusHub]:
+    return [item["hub"] for item in hass.data.get(const.DOMAIN, {}).values()]
+
+
+async def _measure_step(
+    hass: HomeAssistant, cycles: _CycleCounter, duration: float
+) -> dict:
+    hubs = _hubs(hass)
+    changed = 0
+
+    def on_state_changed(_event) -> None:
+        nonlocal changed
+        changed += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, on_state_changed)
+    writes = sum(hub.state_writes for hub in hubs)
+    overruns = sum(hub.cycle_overruns for hub in hubs)
+    skipped = sum(hub.skipped_ticks for hub in hubs)
+    cycles_start = cycles.count
+    # thread_time im Loop-Thread: nur die CPU-Zeit des Event-Loops
+    cpu_start = time.thread_time()
+    lags = await _loop_lag(0.01, duration)
+    cpu = time.thread_time() - cpu_start
+    unsub()
+
+    run = cycles.count - cycles_start
+    p95 = [hub.data.get(const.C_DIAG_CYCLE_P95) for hub in hubs]
+    return {
+        "loop_lag_ms": {
+            "p50": round(_percentile(lags, 0.5) * 1000, 2),
+            "p99": round(_percentile(lags, 0.99) * 1000, 2),
+            "max": round(max(lags, default=0.0) * 1000, 2),
+        },
+        "loop_cpu_percent": round(cpu / duration * 100, 1),
+        "cycles": run,
+        "cpu_per_cycle_ms": round(cpu / run * 1000, 3) if run else None,
+        "state_writes_per_s": round(
+            (sum(hub.state_writes for hub in hubs) - writes) / duration, 1
+        ),
+        "state_changed_per_s": round(changed / duration, 1),
+        "cycle_overruns": sum(hub.cycle_overruns for hub in hubs) - overruns,
+        "skipped_ticks": sum(hub.skipped_ticks for hub in hubs) - skipped,
+        "worst_cycle_p95_ms": max((v for v in p95 if v is not None), default=None),
+        "unavailable_hubs": sum(not hub.available for hub in hubs),
+    }
+
+
+async def _run(args: argparse.Namespace, conn: Connection) -> dict:
+    steps = sorted({int(step) for step in args.steps.split(",")})
+    cycles = _CycleCounter()
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await _start_core(config_dir)
+        loop = asyncio.get_running_loop()
+        units = 0
+        ports: list[int] = []
+        try:
+            for target in steps:
+                gateways = -(-target // args.units_per_gateway)
+                conn.send(("start", gateways - len(ports)))
+                ports += await loop.run_in_executor(None, conn.recv)
+                rss_before = _rss_bytes()
+                entities_before = len(hass.states.async_all())
+                await _add_entries(hass, ports, range(units, target), args)
+                added, units = target - units, target
+                await asyncio.sleep(args.warmup)
+                result = {
+                    "units": units,
+                    "gateways": gateways,
+                    "entities": len(hass.states.async_all()),
+                    "rss_mb": round(_rss_bytes() / 2**20, 1),
+                    "rss_per_hub_kb": round((_rss_bytes() - rss_before) / added / 1024, 1),
+                    "entities_per_hub": round(
+                        (len(hass.states.async_all()) - entities_before) / added, 1
+                    ),
+                }
+                result.update(await _measure_step(hass, cycles, args.duration))
+                print(json.dumps(result), flush=True)
+                results.append(result)
+        finally:
+            for entry in hass.config_entries.async_entries(const.DOMAIN):
+                await hass.config_entries.async_unload(entry.entry_id)
+            await hass.async_stop(force=True)
+    return {
+        "fleet_mode": args.fleet_mode,
+        "units_per_gateway": args.units_per_gateway,
+        "scan_interval_s": args.scan_interval,
+        "latency_s": args.latency,
+        "duration_s": args.duration,
+        "steps": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", default="10,50,100,200,400", help="fleet sizes")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--warmup", type=float, default=10.0, help="seconds after setup")
+    parser.add_argument("--scan-interval", type=int, default=const.DEFAULT_SCAN_INTERVAL)
+    parser.add_argument("--latency", type=float, default=0.005, help="simulator s/request")
+    parser.add_argument("--jitter", type=float, default=0.001)
+    parser.add_argument("--units-per-gateway", type=int, default=1, help="unit IDs per port")
+    parser.add_argument("--fleet-mode", action="store_true", help="shared scheduler/pool")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+    # Die Integration setzt ihre Logger auf DEBUG: Logausgabe je Zyklus verfälscht die CPU-Zeit
+    logging.basicConfig(level=logging.WARNING)
+    for logger in (const.__name__, const.__name__.rpartition(".")[0]):
+        logging.getLogger(logger).setLevel(logging.WARNING)
+
+    conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.get_context("spawn").Process(
+        target=_simulator_process, args=(child_conn, args.latency, args.jitter), daemon=True
+    )
+    process.start()
+    try:
+        results = asyncio.run(_run(args, conn))
+    finally:
+        conn.send(("stop", 0))
+        process.join(10)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
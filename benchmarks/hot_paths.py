@@ -0,0 +1,237 @@
+"""Hub hot paths without network: decode, encode, description building and entity fan-out.
+
+A fake client answers every block read from the register tables of the simulator
+(benchmarks.simulator, without its TCP server), entities are created
+directly with a stub state writer (no Home Assistant core). Results are written as
+JSON; with --baseline the run fails if a benchmark got slower than the tolerance.
+
+Usage (from the repository root, with homeassistant and pymodbus installed):
+
+    python -m benchmarks.hot_paths --output bench.json
+    python -m benchmarks.hot_paths --baseline bench.json --tolerance 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+from importlib.metadata import version
+from typing import Any, Awaitable, Callable
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from custom_components.ha_comfoconnectpro import MyModbusHub, const
+from custom_components.ha_comfoconnectpro.binary_sensor import MyBinarySensor
+from custom_components.ha_comfoconnectpro.climate import MyClimate
+from custom_components.ha_comfoconnectpro.const import ENTITIES_DICT, get_entity_reg
+from custom_components.ha_comfoconnectpro.number import MyNumber
+from custom_components.ha_comfoconnectpro.select import MySelect
+from custom_components.ha_comfoconnectpro.sensor import MySensor
+from custom_components.ha_comfoconnectpro.switch import MySwitch
+
+from .decode import legacy_decode_value
+from .simulator import FaultProfile, Simulator
+
+# Ein Wert je beschreibbarer Entitätsart für den Encode-Pfad
+WRITE_SAMPLES = {
+    const.C_VENTILATION_PRESET: "Preset 2",
+    const.C_EXTERNAL_SETPOINT: {"temperature": 21.5},
+    const.C_BOOST_TIME: 30,
+    const.C_AUTO_MODE: "on",
+}
+
+
+class _Response:
+    def __init__(self, values: list[int | bool]) -> None:
+        self.registers = values
+        self.bits = values
+
+    def isError(self) -> bool:  # noqa: N802 (pymodbus API)
+        return False
+
+
+class FakeClient:
+    """Beantwortet Leseanfragen direkt aus den Registertabellen des Simulators (ohne Socket)."""
+
+    connected = True
+    convert_from_registers = staticmethod(AsyncModbusTcpClient.convert_from_registers)
+    convert_to_registers = staticmethod(AsyncModbusTcpClient.convert_to_registers)
+    DATATYPE = AsyncModbusTcpClient.DATATYPE
+
+    def __init__(self, sim: Simulator) -> None:
+        self._tables = sim.tables
+
+    def _read(reg_type: int):
+        async def read(self, address: int, count: int, device_id: int) -> _Response:
+            return _Response(self._tables[reg_type][address : address + count])
+
+        return read
+
+    read_coils = _read(const.C_REG_TYPE_COILS)
+    read_discrete_inputs = _read(const.C_REG_TYPE_DISCRETE_INPUTS)
+    read_holding_registers = _read(const.C_REG_TYPE_HOLDING_REGISTERS)
+    read_input_registers = _read(const.C_REG_TYPE_INPUT_REGISTERS)
+
+    def close(self) -> None:
+        pass
+
+
+def _entities(hub: MyModbusHub) -> list:
+    """Alle Entitäten wie setup_platform_from_types, ohne State-Schreiben in HA."""
+    device_info = {"identifiers": {(const.DOMAIN, "bench")}, "name": "bench"}
+    platforms = (
+        (const.SENSOR_TYPES, MySensor),
+        (const.DERIVED_TYPES, MySensor),
+        (const.DIAGNOSTIC_TYPES, MySensor),
+        (const.BINARYSENSOR_TYPES, MyBinarySensor),
+        (const.SELECT_TYPES, MySelect),
+        (const.BINARY_TYPES, MySwitch),
+        (const.CLIMATE_TYPES, MyClimate),
+        (const.NUMBER_TYPES, MyNumber),
+    )
+    entities = []
+    for types, cls in platforms:
+        for desc in types.values():
+            entity = cls("bench", hub, device_info, desc)
+            entity.async_write_ha_state = lambda: None
+            entities.append(entity)
+    return entities
+
+
+def _measure(func: Callable[[], Any], number: int) -> dict:
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return {"us": round(best / number * 1e6, 3), "number": number}
+
+
+async def _measure_async(func: Callable[[], Awaitable[Any]], number: int) -> dict:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        best = min(best, time.perf_counter() - start)
+    return {"us": round(best / number * 1e6, 3), "number": number}
+
+
+def _reinit_descriptions() -> None:
+    const._initialized = False
+    const.init()
+
+
+async def _run(number: int) -> dict:
+    sim = Simulator(FaultProfile(), seed=0)
+    hub = MyModbusHub(None, "bench", "127.0.0.1", 502, 15, 1)
+    hub._client = FakeClient(sim)
+    buffers = [
+        sim.tables[block.reg_type][block.address : block.address + block.count]
+        for block in hub._read_plan
+    ]
+    rnd = random.Random(0)
+
+    results: dict[str, dict] = {}
+    results["read_cycle_fake_client"] = await _measure_async(
+        hub.async_read_modbus_registers, number
+    )
+    results["decode_plan_all_blocks"] = _measure(
+        lambda: [
+            hub._decode_plan.decode_block(i, buf, {}) for i, buf in enumerate(buffers)
+        ],
+        number,
+    )
+
+    # read_entity_value + legacy_decode_value für jede Entität (Pfad des früheren Lesezyklus)
+    singles = []
+    for block, buf in zip(hub._read_plan, buffers):
+        for key in block.keys:
+            props = ENTITIES_DICT[key]
+            reg, dt = get_entity_reg(props)
+            singles.append((props, buf, reg - block.address, dt))
+
+    def read_and_decode_each() -> None:
+        for props, buf, idx, dt in singles:
+            legacy_decode_value(props, hub.read_entity_value(buf, idx, dt))
+
+    results["read_entity_value_decode_each"] = _measure(read_and_decode_each, number)
+    results["encode_write_samples"] = _measure(
+        lambda: [hub._encode_entity_value(k, v) for k, v in WRITE_SAMPLES.items()],
+        number,
+    )
+    results["const_init"] = _measure(_reinit_descriptions, max(number // 20, 1))
+
+    entities = _entities(hub)
+    for entity in entities:
+        hub._subscribers.setdefault(entity.entity_description.key, []).append(
+            entity._on_hub_update
+        )
+    await hub.async_read_modbus_registers()
+    hub._update_diagnostics()
+
+    def fan_out_all() -> None:
+        hub._async_dispatch_changes({}, force_keys=hub._subscribers)
+
+    def fan_out_changed() -> None:
+        # typischer Zyklus: ein Teil der Sensoren hat sich geändert
+        previous = dict(hub.data)
+        for key in rnd.sample(sorted(const.SENSOR_TYPES), 8):
+            previous[key] = None
+        hub._async_dispatch_changes(previous)
+
+    results["fan_out_all_entities"] = _measure(fan_out_all, number)
+    results["fan_out_eight_changed"] = _measure(fan_out_changed, number)
+    await hub.async_close()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pymodbus": version("pymodbus"),
+            "homeassistant": version("homeassistant"),
+            "entities": len(ENTITIES_DICT),
+            "subscribed_entities": len(entities),
+            "read_blocks": len(hub.read_plan),
+        },
+        "results": results,
+    }
+
+
+def _regressions(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    found = []
+    for name, base in baseline.get("results", {}).items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        if now["us"] > base["us"] * (1 + tolerance):
+            found.append(f"{name}: {base['us']} us -> {now['us']} us")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = asyncio.run(_run(args.number))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = _regressions(results, json.load(file), args.tolerance)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
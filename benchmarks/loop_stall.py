@@ -0,0 +1,108 @@
+"""Event-loop stall per poll cycle: blocking ModbusTcpClient vs. async MyModbusHub.
+
+Starts the simulator (benchmarks.simulator) with configurable latency in a separate
+thread and measures the worst-case lateness of a 1 ms ticker on the event loop
+while one poll cycle runs.
+
+Usage (from the repository root, with homeassistant and pymodbus installed):
+
+    python -m benchmarks.loop_stall --latency 0.05 --cycles 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from pymodbus.client import ModbusTcpClient
+
+from custom_components.ha_comfoconnectpro import MyModbusHub, const
+
+from .simulator import start_simulator_thread
+
+
+def _blocking_cycle(client: ModbusTcpClient, hostid: int) -> None:
+    """Replicates the former synchronous read_modbus_registers() block reads."""
+    client.read_input_registers(
+        address=const.C_MIN_INPUT_REGISTER,
+        count=const.C_MAX_INPUT_REGISTER - const.C_MIN_INPUT_REGISTER + 1,
+        device_id=hostid,
+    )
+    client.read_holding_registers(
+        address=const.C_MIN_HOLDING_REGISTER,
+        count=const.C_MAX_HOLDING_REGISTER - const.C_MIN_HOLDING_REGISTER + 1,
+        device_id=hostid,
+    )
+    client.read_coils(
+        address=const.C_MIN_COILS,
+        count=const.C_MAX_COILS - const.C_MIN_COILS + 1,
+        device_id=hostid,
+    )
+    client.read_discrete_inputs(
+        address=const.C_MIN_DISCRETE_INPUTS,
+        count=const.C_MAX_DISCRETE_INPUTS - const.C_MIN_DISCRETE_INPUTS + 1,
+        device_id=hostid,
+    )
+
+
+async def _measure(cycle, cycles: int) -> dict:
+    """Run `cycle` repeatedly and record the largest ticker lateness per cycle."""
+    stalls: list[float] = []
+    for _ in range(cycles):
+        worst = 0.0
+        running = True
+
+        async def ticker():
+            nonlocal worst
+            while running:
+                t0 = time.perf_counter()
+                await asyncio.sleep(0.001)
+                worst = max(worst, time.perf_counter() - t0 - 0.001)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0.005)
+        await cycle()
+        running = False
+        await task
+        stalls.append(worst)
+    stalls.sort()
+    return {
+        "cycles": cycles,
+        "max_stall_ms": round(stalls[-1] * 1000, 3),
+        "median_stall_ms": round(stalls[len(stalls) // 2] * 1000, 3),
+    }
+
+
+async def _run(latency: float, cycles: int) -> dict:
+    sim = start_simulator_thread(latency=latency, seed=0)
+    hostid = 1
+
+    sync_client = ModbusTcpClient(host="127.0.0.1", port=sim.port, timeout=3, retries=3)
+    sync_client.connect()
+
+    async def blocking():
+        _blocking_cycle(sync_client, hostid)
+
+    before = await _measure(blocking, cycles)
+    sync_client.close()
+
+    hub = MyModbusHub(None, "bench", "127.0.0.1", sim.port, 15, hostid)
+    await hub.async_connect()
+    after = await _measure(hub.async_read_modbus_registers, cycles)
+    await hub.async_shutdown()
+
+    return {"latency_s": latency, "blocking_client": before, "async_hub": after}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args.latency, args.cycles)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Poll-cycle latency: serial block reads vs. pipelined reads on one connection.
+
+Uses the simulator (benchmarks.simulator) with a per-request latency. Scenarios:
+serial reads, pipelined reads (the simulator answers requests independently), and
+pipelined reads against a simulator that rejects pipelining (the hub falls back to
+serial reads after the first cycle).
+
+Usage (from the repository root, with homeassistant and pymodbus installed):
+
+    python -m benchmarks.pipelined_reads --latency 0.02 --cycles 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from custom_components.ha_comfoconnectpro import MyModbusHub
+
+from .simulator import start_simulator
+
+
+async def _measure(
+    latency: float, cycles: int, pipeline: bool, reject_pipelined: bool = False
+) -> dict:
+    sim = await start_simulator(latency=latency, seed=0, reject_pipelined=reject_pipelined)
+    hub = MyModbusHub(None, "bench", "127.0.0.1", sim.port, 15, 1, pipeline_reads=pipeline)
+    await hub.async_connect()
+    sim.requests.clear()
+    durations: list[float] = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        if not await hub.async_read_modbus_registers():
+            raise AssertionError("read cycle failed")
+        durations.append(time.perf_counter() - start)
+    result = {
+        "blocks": len(hub.read_plan),
+        "requests_per_cycle": sum(sim.requests.values()) / cycles,
+        "first_cycle_ms": round(durations[0] * 1000, 2),
+        "median_cycle_ms": round(sorted(durations)[len(durations) // 2] * 1000, 2),
+        "pipelining_active": hub._pipeline is not None,
+    }
+    await hub.async_shutdown()
+    await sim.stop()
+    return result
+
+
+async def _run(latency: float, cycles: int) -> dict:
+    return {
+        "latency_s": latency,
+        "serial": await _measure(latency, cycles, False),
+        "pipelined": await _measure(latency, cycles, True),
+        "pipelined_rejected": await _measure(
+            latency, cycles, True, reject_pipelined=True
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--cycles", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args.latency, args.cycles)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
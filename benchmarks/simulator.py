@@ -0,0 +1,432 @@
+"""Local ComfoConnect PRO simulator: the ENTITIES_DICT register map over Modbus TCP.
+
+A Modbus TCP server (FC1-6, 15, 16, 23) holds the registers; a small model updates
+temperatures, humidities, CO2 zones and airflow from the written presets and coils.
+Each request can be delayed by a latency ± jitter and dropped with a given probability
+(a dropped request gets no answer, so the client runs into its timeout).
+Requests on one connection are answered independently, so pipelined reads work;
+with reject_pipelined, a request arriving while another one is still outstanding gets
+a "server device busy" exception response instead (a gateway without pipelining).
+
+The server speaks MBAP directly: the pymodbus server datastore API is being replaced
+(ModbusDeviceContext is deprecated in 3.x and changed its accessors), the client side
+is what the hub uses anyway.
+
+Usage (from the repository root, with homeassistant and pymodbus installed):
+
+    python -m benchmarks.simulator --port 5020 --latency 0.02 --jitter 0.005 --drop 0.01
+
+In benchmarks and tests:
+
+    sim = await start_simulator(latency=0.02, seed=1)
+    hub = MyModbusHub(hass, "sim", "127.0.0.1", sim.port, 15, 1)
+    ...
+    await sim.stop()
+
+For blocking clients, which would stall a simulator on the same event loop:
+
+    sim = start_simulator_thread(latency=0.05)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import math
+import random
+import struct
+import threading
+from dataclasses import dataclass, field
+
+from custom_components.ha_comfoconnectpro import const
+from custom_components.ha_comfoconnectpro.const import (
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+    ENTITIES_DICT,
+    get_entity_reg,
+    get_register_count,
+)
+
+# Lese-Funktionscode -> Registertyp
+_READ_FC = {
+    1: C_REG_TYPE_COILS,
+    2: C_REG_TYPE_DISCRETE_INPUTS,
+    3: C_REG_TYPE_HOLDING_REGISTERS,
+    4: C_REG_TYPE_INPUT_REGISTERS,
+}
+_ILLEGAL_FUNCTION = 0x01
+_ILLEGAL_ADDRESS = 0x02
+_SERVER_BUSY = 0x06
+# Zuluftmenge je Lüftungsstufe (Away, Preset 1-3) und bei Boost in m³/h
+_AIRFLOW = {0: 50, 1: 110, 2: 160, 3: 230}
+_AIRFLOW_BOOST = 300
+_CO2_ZONES = [
+    getattr(const, f"C_CO2_SENSOR_ZONE_{zone}") for zone in range(1, 9)
+]
+_DAY = 24 * 3600
+
+
+@dataclass
+class FaultProfile:
+    """Per request: latency ± jitter (s), dropped with probability drop_rate.
+
+    With reject_pipelined, a request arriving while another one on the same connection
+    is still outstanding gets a "server device busy" exception response.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    reject_pipelined: bool = False
+
+
+@dataclass
+class ComfoConnectModel:
+    """Simple physical model of the unit; one step per `step(dt)` of simulated time."""
+
+    rnd: random.Random
+    time: float = 8 * 3600.0
+    room_temperature: float = 21.5
+    room_humidity: float = 45.0
+    outdoor_humidity: float = 70.0
+    filter_days: float = 120.0
+    co2: list[float] = field(default_factory=lambda: [600.0] * len(_CO2_ZONES))
+    occupancy: list[int] = field(default_factory=lambda: [1] * len(_CO2_ZONES))
+    errors: list[int] = field(default_factory=list)
+
+    def step(self, dt: float, registers: dict[str, int]) -> dict[str, float | int | bool]:
+        """Advance by dt seconds; `registers` holds the current writable values."""
+        self.time += dt
+        preset = registers.get(const.C_VENTILATION_PRESET, 2)
+        boost = bool(registers.get(const.C_BOOST, 0))
+        airflow = _AIRFLOW_BOOST if boost else _AIRFLOW.get(preset, _AIRFLOW[2])
+
+        phase = 2 * math.pi * (self.time % _DAY) / _DAY
+        outdoor = 8.0 - 6.0 * math.cos(phase) + self.rnd.gauss(0, 0.05)
+        # Raumtemperatur driftet langsam innerhalb üblicher Grenzen
+        self.room_temperature += self.rnd.gauss(0, 0.01 * math.sqrt(dt))
+        self.room_temperature = min(max(self.room_temperature, 18.0), 26.0)
+        extract = self.room_temperature + 0.3
+        efficiency = 0.9 - 0.1 * (airflow - 50) / (_AIRFLOW_BOOST - 50)
+        supply = outdoor + efficiency * (extract - outdoor)
+        exhaust = extract - (supply - outdoor)
+
+        self.room_humidity += self.rnd.gauss(0, 0.05 * math.sqrt(dt))
+        self.room_humidity = min(max(self.room_humidity, 30.0), 65.0)
+        self.outdoor_humidity = 70.0 + 15.0 * math.cos(phase) + self.rnd.gauss(0, 0.2)
+
+        # CO2 je Zone: Personen erzeugen CO2, der Luftwechsel zieht Richtung Außenluft
+        air_change = airflow / 400.0 / 3600.0  # Anteil der Zonenluft je Sekunde
+        for zone in range(len(self.co2)):
+            if self.rnd.random() < dt / 1800:
+                self.occupancy[zone] = self.rnd.choice((0, 0, 1, 2, 3))
+            source = self.occupancy[zone] * 0.06 * dt
+            self.co2[zone] += source - (self.co2[zone] - 420.0) * min(air_change * dt, 1.0)
+            self.co2[zone] = max(self.co2[zone] + self.rnd.gauss(0, 1), 400.0)
+
+        self.filter_days = max(self.filter_days - dt / _DAY, 0.0)
+
+        values: dict[str, float | int | bool] = {
+            const.C_CONNECTION_STATE: 0,
+            const.C_AIRFLOW: airflow + self.rnd.randint(-2, 2),
+            const.C_ROOM_TEMPERATURE: self.room_temperature,
+            const.C_EXTRACT_TEMPERATURE: extract,
+            const.C_EXHAUST_TEMPERATURE: exhaust,
+            const.C_OUTDOOR_TEMPERATURE: outdoor,
+            const.C_SUPPLY_TEMPERATURE: supply,
+            const.C_ROOM_HUMIDITY: self.room_humidity,
+            const.C_EXTRACT_HUMIDITY: self.room_humidity + 1.0,
+            const.C_EXHAUST_HUMIDITY: min(self.outdoor_humidity + 10.0, 100.0),
+            const.C_OUTDOOR_HUMIDITY: self.outdoor_humidity,
+            const.C_SUPPLY_HUMIDITY: self.room_humidity - 5.0,
+            const.C_FILTER_DAYS_REMAINING: math.ceil(self.filter_days),
+            const.C_ERROR_FLAG: bool(self.errors),
+            const.C_STANDBY: False,
+            const.C_COMFOHOOD: False,
+            const.C_FILTER_DIRTY: self.filter_days <= 0,
+        }
+        for zone, key in enumerate(_CO2_ZONES):
+            values[key] = self.co2[zone]
+        errors = (self.errors + [0] * 5)[:5]
+        for index, code in enumerate(errors, start=1):
+            values[getattr(const, f"C_ACTIVEERROR{index}")] = code
+        return values
+
+
+def _encode(props: dict, value: float | int | bool) -> list[int | bool]:
+    """Physikalischer Wert -> Registerwörter bzw. Bit (umgekehrt zu FAKTOR/DT)."""
+    reg_type = props["RT"]
+    if reg_type in (C_REG_TYPE_COILS, C_REG_TYPE_DISCRETE_INPUTS):
+        return [bool(value)]
+    raw = round(value / (props.get("FAKTOR") or 1.0))
+    count = get_register_count(get_entity_reg(props)[1])
+    raw &= (1 << (16 * count)) - 1
+    return [(raw >> (16 * (count - 1 - i))) & 0xFFFF for i in range(count)]
+
+
+def _decode(words: list[int | bool]) -> int:
+    value = 0
+    for word in words:
+        value = (value << 16) | int(word)
+    return value
+
+
+class Simulator:
+    """Modbus TCP server with the ENTITIES_DICT register map, model loop and fault injection."""
+
+    def __init__(
+        self,
+        faults: FaultProfile,
+        seed: int | None = None,
+        speed: float = 1.0,
+        update_interval: float = 1.0,
+        unit: int = 1,
+    ) -> None:
+        self.faults = faults
+        self.speed = speed
+        self.update_interval = update_interval
+        self.unit = unit
+        self.rnd = random.Random(seed)
+        self.model = ComfoConnectModel(random.Random(seed))
+        self.requests: dict[int, int] = {}
+        self.dropped = 0
+        self.port = 0
+        size = {reg_type: 1 for reg_type in _READ_FC.values()}
+        for props in ENTITIES_DICT.values():
+            reg, dt = get_entity_reg(props)
+            size[props["RT"]] = max(size[props["RT"]], reg + get_register_count(dt))
+        # Registertyp -> Werte ab Adresse 0 (Bits als bool)
+        self.tables: dict[int, list[int | bool]] = {
+            reg_type: [False if reg_type in (C_REG_TYPE_COILS, C_REG_TYPE_DISCRETE_INPUTS) else 0]
+            * count
+            for reg_type, count in size.items()
+        }
+        self._server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._defaults()
+
+    # ---- Datastore ----------------------------------------------------------
+
+    def get(self, key: str) -> int:
+        """Rohwert einer Entität (ganzzahlig, ohne FAKTOR)."""
+        props = ENTITIES_DICT[key]
+        reg, dt = get_entity_reg(props)
+        return _decode(self.tables[props["RT"]][reg : reg + get_register_count(dt)])
+
+    def set(self, key: str, value: float | int | bool) -> None:
+        """Physikalischen Wert einer Entität in den Datastore schreiben."""
+        props = ENTITIES_DICT[key]
+        reg, _dt = get_entity_reg(props)
+        words = _encode(props, value)
+        self.tables[props["RT"]][reg : reg + len(words)] = words
+
+    def _defaults(self) -> None:
+        for key, props in ENTITIES_DICT.items():
+            default = (props.get("VALUES") or {}).get("default")
+            if props["RT"] == C_REG_TYPE_HOLDING_REGISTERS and default is not None:
+                self.set(key, default)
+        self.set(const.C_EXTERNAL_SETPOINT, 21.0)
+        self.set(const.C_AUTO_MODE, True)
+        self.update(0.0)
+
+    def update(self, dt: float) -> None:
+        """Modell um dt (simulierte) Sekunden weiterrechnen und Eingänge aktualisieren."""
+        writable = {
+            key: self.get(key)
+            for key, props in ENTITIES_DICT.items()
+            if props["RT"] in (C_REG_TYPE_HOLDING_REGISTERS, C_REG_TYPE_COILS)
+        }
+        if writable.get(const.C_RESET_ERRORS):
+            # selbstrücksetzende Coil: Fehler quittieren
+            self.model.errors.clear()
+            self.set(const.C_RESET_ERRORS, False)
+        if writable.get(const.C_BOOST):
+            remaining = max(writable.get(const.C_BOOST_TIME, 0) - dt, 0)
+            self.set(const.C_BOOST_TIME, remaining * ENTITIES_DICT[const.C_BOOST_TIME]["FAKTOR"])
+            if remaining == 0:
+                self.set(const.C_BOOST, False)
+        for key, value in self.model.step(dt, writable).items():
+            self.set(key, value)
+
+    # ---- Modbus -------------------------------------------------------------
+
+    def handle_pdu(self, pdu: bytes) -> bytes:
+        """Request-PDU -> Antwort-PDU (Exception-Antwort bei unbekanntem FC/Adresse)."""
+        fc = pdu[0]
+        try:
+            if fc in _READ_FC:
+                address, count = struct.unpack_from(">HH", pdu, 1)
+                return bytes([fc]) + self._read(_READ_FC[fc], address, count)
+            if fc == 5:
+                address, value = struct.unpack_from(">HH", pdu, 1)
+                self._write(C_REG_TYPE_COILS, address, [value == 0xFF00])
+                return pdu[:5]
+            if fc == 6:
+                address, value = struct.unpack_from(">HH", pdu, 1)
+                self._write(C_REG_TYPE_HOLDING_REGISTERS, address, [value])
+                return pdu[:5]
+            if fc == 15:
+                address, count, _n = struct.unpack_from(">HHB", pdu, 1)
+                bits = [bool(pdu[6 + i // 8] >> (i % 8) & 1) for i in range(count)]
+                self._write(C_REG_TYPE_COILS, address, bits)
+                return pdu[:5]
+            if fc == 16:
+                address, count, _n = struct.unpack_from(">HHB", pdu, 1)
+                words = list(struct.unpack_from(f">{count}H", pdu, 6))
+                self._write(C_REG_TYPE_HOLDING_REGISTERS, address, words)
+                return pdu[:5]
+            if fc == 23:
+                r_addr, r_count, w_addr, w_count, _n = struct.unpack_from(">HHHHB", pdu, 1)
+                words = list(struct.unpack_from(f">{w_count}H", pdu, 10))
+                self._write(C_REG_TYPE_HOLDING_REGISTERS, w_addr, words)
+                return bytes([fc]) + self._read(C_REG_TYPE_HOLDING_REGISTERS, r_addr, r_count)
+        except IndexError:
+            return bytes([fc | 0x80, _ILLEGAL_ADDRESS])
+        return bytes([fc | 0x80, _ILLEGAL_FUNCTION])
+
+    def _read(self, reg_type: int, address: int, count: int) -> bytes:
+        table = self.tables[reg_type]
+        if address + count > len(table):
+            raise IndexError(address)
+        values = table[address : address + count]
+        if reg_type in (C_REG_TYPE_COILS, C_REG_TYPE_DISCRETE_INPUTS):
+            packed = bytearray((count + 7) // 8)
+            for i, bit in enumerate(values):
+                packed[i // 8] |= bool(bit) << (i % 8)
+            return bytes([len(packed)]) + bytes(packed)
+        return bytes([count * 2]) + struct.pack(f">{count}H", *values)
+
+    def _write(self, reg_type: int, address: int, values: list[int | bool]) -> None:
+        table = self.tables[reg_type]
+        if address + len(values) > len(table):
+            raise IndexError(address)
+        table[address : address + len(values)] = values
+
+    # ---- Server -------------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._spawn(self._update_loop())
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.sleep(0)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _update_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.update_interval)
+            self.update(self.update_interval * self.speed)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        outstanding = 0
+
+        async def answer(tid: int, unit: int, pdu: bytes, delay: float, busy: bool) -> None:
+            nonlocal outstanding
+            await asyncio.sleep(delay)
+            outstanding -= 1
+            response = bytes([pdu[0] | 0x80, _SERVER_BUSY]) if busy else self.handle_pdu(pdu)
+            if not writer.is_closing():
+                writer.write(struct.pack(">HHHB", tid, 0, len(response) + 1, unit) + response)
+
+        self._writers.add(writer)
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                tid, _pid, length, unit = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                self.requests[pdu[0]] = self.requests.get(pdu[0], 0) + 1
+                if self.rnd.random() < self.faults.drop_rate:
+                    self.dropped += 1
+                    continue
+                delay = self.faults.latency + self.rnd.uniform(
+                    -self.faults.jitter, self.faults.jitter
+                )
+                busy = self.faults.reject_pipelined and outstanding > 0
+                outstanding += 1
+                self._spawn(answer(tid, unit, pdu, max(delay, 0.0), busy))
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+async def start_simulator(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    drop_rate: float = 0.0,
+    seed: int | None = None,
+    speed: float = 1.0,
+    reject_pipelined: bool = False,
+) -> Simulator:
+    """Simulator im laufenden Event-Loop starten (port=0: freien Port wählen)."""
+    sim = Simulator(
+        FaultProfile(latency, jitter, drop_rate, reject_pipelined), seed=seed, speed=speed
+    )
+    await sim.start(host, port)
+    return sim
+
+
+def start_simulator_thread(**kwargs) -> Simulator:
+    """Simulator mit eigenem Event-Loop in einem Daemon-Thread (für blockierende Clients)."""
+    loop = asyncio.new_event_loop()
+    started: list[Simulator] = []
+    ready = threading.Event()
+
+    async def serve() -> None:
+        started.append(await start_simulator(**kwargs))
+        ready.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=lambda: loop.run_until_complete(serve()), daemon=True).start()
+    ready.wait()
+    return started[0]
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    sim = await start_simulator(
+        args.host, args.port, args.latency, args.jitter, args.drop, args.seed, args.speed
+    )
+    print(f"ComfoConnect PRO simulator listening on {args.host}:{sim.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sim.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± seconds")
+    parser.add_argument("--drop", type=float, default=0.0, help="drop probability")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--speed", type=float, default=1.0, help="simulated s per real s")
+    args = parser.parse_args()
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Modbus round trips per user command: one request per word/entity vs. batched FC15/FC16.
+
+Uses the simulator (benchmarks.simulator) with a per-request latency and counts the
+requests it receives for each scenario (writes plus the read-back of the written
+range; FC23 combines both for holding registers). All writes are forced: every command
+is repeated, the register shadow would otherwise skip values that are already set.
+
+Usage (from the repository root, with homeassistant and pymodbus installed):
+
+    python -m benchmarks.write_round_trips --latency 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+
+from custom_components.ha_comfoconnectpro import MyModbusHub
+from custom_components.ha_comfoconnectpro.const import C_REG_TYPE_HOLDING_REGISTERS
+
+from .simulator import Simulator, start_simulator
+
+HOLDING_BATCH = {
+    "ventilation_preset": 1,
+    "temperature_profile": 0,
+    "temperature_profile_mode": 1,
+    "boost_time": 600,
+}
+COIL_BATCH = {"auto_mode": "on", "boost": "off", "away_function": "off", "comfocool": "on"}
+
+
+# Die Registerkarte hat keinen UINT32-Holding-Wert: zwei Wörter ab external_setpoint
+UINT32_ADDRESS = 3
+
+
+async def _per_word_uint32(hub: MyModbusHub) -> None:
+    """Former behaviour: one FC6 per register word."""
+    for offset, word in enumerate((0x0001, 0x86A0)):
+        await hub._client.write_register(
+            address=UINT32_ADDRESS + offset, value=word, device_id=1
+        )
+
+
+async def _batched_uint32(hub: MyModbusHub) -> None:
+    await hub._write_modbus_registers(
+        C_REG_TYPE_HOLDING_REGISTERS, UINT32_ADDRESS, (0x0001, 0x86A0)
+    )
+
+
+def _per_entity(values: dict):
+    async def run(hub: MyModbusHub) -> None:
+        for key, value in values.items():
+            await hub.write_entity_value(key, value, force=True)
+
+    return run
+
+
+def _batched(values: dict):
+    async def run(hub: MyModbusHub) -> None:
+        await hub.write_entity_values(values, force=True)
+
+    return run
+
+
+async def _measure(hub: MyModbusHub, sim: Simulator, command, repeat: int) -> dict:
+    sim.requests.clear()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await command(hub)
+    elapsed = time.perf_counter() - start
+    return {
+        "round_trips_per_command": sum(sim.requests.values()) / repeat,
+        "function_codes": {str(fc): n // repeat for fc, n in sorted(sim.requests.items())},
+        "ms_per_command": round(elapsed / repeat * 1000, 2),
+    }
+
+
+async def _run(latency: float, repeat: int) -> dict:
+    sim = await start_simulator(latency=latency, seed=0)
+    hub = MyModbusHub(None, "bench", "127.0.0.1", sim.port, 15, 1)
+    await hub.async_connect()
+
+    scenarios = {
+        "uint32_value": (_per_word_uint32, _batched_uint32),
+        "four_holding_registers": (_per_entity(HOLDING_BATCH), _batched(HOLDING_BATCH)),
+        "four_coils": (_per_entity(COIL_BATCH), _batched(COIL_BATCH)),
+    }
+    results: dict = {"latency_s": latency}
+    for name, (before, after) in scenarios.items():
+        results[name] = {
+            "unbatched": await _measure(hub, sim, before, repeat),
+            "batched": await _measure(hub, sim, after, repeat),
+        }
+    await hub.async_shutdown()
+    await sim.stop()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args.latency, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import asyncio
 import struct
+import time
+from collections import deque
 from datetime import timedelta
-import threading
-from typing import Any, Dict, Iterable, Tuple, Optional
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple, Optional
 
 
-from pymodbus.client import ModbusTcpClient
+from pymodbus.client import AsyncModbusTcpClient
 
-from pymodbus.exceptions import ConnectionException
+from pymodbus.exceptions import ConnectionException, ModbusException, ModbusIOException
 
 import voluptuous as vol
 
@@ -29,10 +31,84 @@ from homeassistant.helpers.event import async_track_time_interval
 
 from . import const
 from .const import (
+    C_DIAG_STATE_WRITES,
+    C_DIAG_SUPPRESSED_STATE_WRITES,
+    C_DIAG_FILTERED_STATE_WRITES,
+    C_DIAG_SCAN_INTERVAL,
+    C_DIAG_CYCLE_OVERRUNS,
+    C_DIAG_SKIPPED_TICKS,
+    C_DIAG_CYCLE_P50,
+    C_DIAG_CYCLE_P95,
+    C_DIAG_IO_QUEUE_DEPTH,
+    C_DIAG_WRITE_WAIT,
+    C_DIAG_READ_WAIT,
+    C_DIAG_IO_SERVICE,
+    C_DIAG_COALESCED_WRITES,
+    C_DIAG_SUPPRESSED_WRITES,
+    C_DIAG_CONNECTION_FAILURES,
+    C_DIAG_RTT,
+    C_DIAG_REQUEST_TIMEOUT,
+    CONF_TIMEOUT_MAX_MS,
+    CONF_TIMEOUT_MIN_MS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT_MAX_MS,
+    DEFAULT_TIMEOUT_MIN_MS,
+    CONF_PIPELINE_READS,
+    DEFAULT_PIPELINE_READS,
+    PIPELINE_MAX_FAILURES,
+    CONF_OVERSAMPLING_WINDOW,
+    DEFAULT_OVERSAMPLING_WINDOW,
+    OVERSAMPLING_CAPACITY,
+    CONF_FLEET_MODE,
+    DATA_FLEET,
+    DATA_PIPELINES,
+    DEFAULT_FLEET_MODE,
+    FLEET_MAX_CONCURRENT_CYCLES,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_BACKOFF_MIN,
+    DIAGNOSTICS_DICT,
+    DERIVED_DICT,
+    HEAT_RECOVERY_INPUTS,
+    HEAT_RECOVERY_MIN_DELTA,
+    HUMIDITY_PAIRS,
+    C_HEAT_RECOVERY_EFFICIENCY,
+    ACTIVE_ERROR_KEYS,
+    C_ACTIVE_ERRORS,
+    ERROR_DICT,
+    EVENT_ERROR_CLEARED,
+    EVENT_ERROR_RAISED,
+    ATTR_CODE,
+    ATTR_DESCRIPTION,
+    ATTR_HUB,
+    ATTR_CHANGES,
+    CONF_CHANGE_EVENTS,
+    DEFAULT_CHANGE_EVENTS,
+    EVENT_CHANGES,
+    CONF_WRITE_SETTLE_MS,
+    DEFAULT_WRITE_SETTLE_MS,
+    C_WRITE_UNCHANGED,
+    C_WRITE_UNCONFIRMED,
+    C_WRITE_WRITTEN,
+    CYCLE_DEADLINE_FACTOR,
+    MAX_CONSECUTIVE_OVERRUNS,
+    CYCLE_STATS_WINDOW,
+    ADAPTIVE_DELTAS,
+    ADAPTIVE_INCREASE_FACTOR,
+    CONF_ADAPTIVE_SCAN,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_ADAPTIVE_SCAN,
+    MIN_SCAN_INTERVAL,
+    DEFAULT_FORCED_REFRESH_INTERVAL,
     DEFAULT_NAME,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     CONF_HOSTID,
+    C_POLL_FAST,
+    C_POLL_NORMAL,
+    C_POLL_ONCE,
+    C_POLL_SLOW,
+    DEFAULT_POLL_FAST_INTERVAL,
+    DEFAULT_POLL_SLOW_INTERVAL,
     ENTITIES_DICT,
     BINARYSENSOR_TYPES,
     SENSOR_TYPES,
@@ -40,27 +116,55 @@ from .const import (
     CLIMATE_TYPES,
     NUMBER_TYPES,
     BINARY_TYPES,
-    get_entity_switch,
     get_entity_type,
-    get_entity_select,
     get_entity_factor,
     get_entity_max,
     get_entity_min,
     get_entity_reg,
     get_entity_props,
+    get_entity_deadband,
+    get_entity_min_publish_interval,
+    get_entity_poll,
+    get_entity_unit,
+    is_entity_measurement,
     is_entity_readonly,
     is_entity_switch,
     is_entity_select,
     is_entity_climate,
-    C_MIN_INPUT_REGISTER,
-    C_MAX_INPUT_REGISTER,
-    C_MIN_HOLDING_REGISTER,
-    C_MAX_HOLDING_REGISTER,
-    C_MIN_COILS,
-    C_MAX_COILS,
-    C_MIN_DISCRETE_INPUTS,
-    C_MAX_DISCRETE_INPUTS,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
 )
+from .coalesce import WriteCoalescer
+from .decode_plan import DecodePlan
+from .changes import ChangeCallback, ChangeStream
+from .derived import DerivedValues
+from .errors import ActiveErrors, error_codes
+from .fleet import FleetScheduler, PooledConnection
+from .oversampling import Oversampler
+from .shadow import RegisterShadow
+from .write_plan import EncodedWrite, build_write_plan
+from .io_queue import (
+    PRIORITY_CONTROL,
+    PRIORITY_READ,
+    PRIORITY_WRITE,
+    ModbusIOQueue,
+    percentile,
+)
+from .read_plan import (
+    FUNCTION_CODE,
+    ReadBlock,
+    ReadCostModel,
+    ReadRequest,
+    build_read_plan,
+    describe_read_plan,
+    plan_requests,
+)
+from .pipeline import PipelinedReader, PipelinePool, PipelineRejected
+from .rtt import RttEstimator
+from .services import async_setup_services, async_unload_services
+from .supervisor import CIRCUIT_HALF_OPEN, ConnectionSupervisor
 
 
 import sys
@@ -80,6 +184,21 @@ PLATFORMS = [
     Platform.NUMBER,  # NUMBER_TYPES (r/w)
 ]
 
+# Platzhalter für "noch kein Wert" beim Vergleich alter/neuer Daten
+_MISSING = object()
+# Rundungsreserve beim Deadband-Vergleich (21.7 - 21.5 < 0.2 in float)
+_DEADBAND_EPSILON = 1e-9
+# Modbus-Exception-Code "Illegal Function" (Funktionscode vom Gerät nicht unterstützt)
+_ILLEGAL_FUNCTION = 0x01
+
+# Registertyp -> (Bezeichnung, Lesemethode des Clients, Attribut der Antwort)
+_BLOCK_READERS = {
+    C_REG_TYPE_INPUT_REGISTERS: ("Input-Register", "read_input_registers", "registers"),
+    C_REG_TYPE_HOLDING_REGISTERS: ("Holding-Register", "read_holding_registers", "registers"),
+    C_REG_TYPE_COILS: ("Coils", "read_coils", "bits"),
+    C_REG_TYPE_DISCRETE_INPUTS: ("Discrete Inputs", "read_discrete_inputs", "bits"),
+}
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up a modbus connection."""
@@ -90,15 +209,48 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     name = entry.data.get(CONF_NAME)
     port = entry.data.get(CONF_PORT)
     scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    if scan_interval < 5:
+    if scan_interval < MIN_SCAN_INTERVAL:
         scan_interval = DEFAULT_SCAN_INTERVAL
     hostid = entry.data.get(CONF_HOSTID)
+    adaptive_scan = entry.data.get(CONF_ADAPTIVE_SCAN, DEFAULT_ADAPTIVE_SCAN)
+    write_settle_ms = entry.data.get(CONF_WRITE_SETTLE_MS, DEFAULT_WRITE_SETTLE_MS)
+    timeout_min_ms = entry.data.get(CONF_TIMEOUT_MIN_MS, DEFAULT_TIMEOUT_MIN_MS)
+    timeout_max_ms = entry.data.get(CONF_TIMEOUT_MAX_MS, DEFAULT_TIMEOUT_MAX_MS)
+    pipeline_reads = entry.data.get(CONF_PIPELINE_READS, DEFAULT_PIPELINE_READS)
+    oversampling_window = entry.data.get(CONF_OVERSAMPLING_WINDOW, DEFAULT_OVERSAMPLING_WINDOW)
+    change_events = entry.data.get(CONF_CHANGE_EVENTS, DEFAULT_CHANGE_EVENTS)
+    fleet = None
+    if entry.data.get(CONF_FLEET_MODE, DEFAULT_FLEET_MODE):
+        if DATA_FLEET not in hass.data:
+            hass.data[DATA_FLEET] = FleetScheduler(hass, FLEET_MAX_CONCURRENT_CYCLES)
+        fleet = hass.data[DATA_FLEET]
+    pipelines = None
+    if pipeline_reads:
+        if DATA_PIPELINES not in hass.data:
+            hass.data[DATA_PIPELINES] = PipelinePool()
+        pipelines = hass.data[DATA_PIPELINES]
 
     _LOGGER.info("Setup %s.%s", DOMAIN, name)
 
-    hub = MyModbusHub(hass, name, host, port, scan_interval, hostid)
+    hub = MyModbusHub(
+        hass,
+        name,
+        host,
+        port,
+        scan_interval,
+        hostid,
+        adaptive_scan=adaptive_scan,
+        write_settle=write_settle_ms / 1000,
+        timeout_bounds=(timeout_min_ms / 1000, max(timeout_min_ms, timeout_max_ms) / 1000),
+        pipeline_reads=pipeline_reads,
+        pipelines=pipelines,
+        fleet=fleet,
+        oversampling_window=oversampling_window,
+        change_events=change_events,
+    )
     # """Register the hub."""
     hass.data[DOMAIN][name] = {"hub": hub}
+    async_setup_services(hass)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -118,12 +270,19 @@ async def async_unload_entry(hass, entry):
     if not unload_ok:
         return False
 
-    hass.data[DOMAIN].pop(entry.data["name"])
+    hub: MyModbusHub = hass.data[DOMAIN].pop(entry.data["name"])["hub"]
+    await hub.async_shutdown()
+    if DATA_FLEET in hass.data and hass.data[DATA_FLEET].idle:
+        hass.data.pop(DATA_FLEET)
+    if DATA_PIPELINES in hass.data and hass.data[DATA_PIPELINES].idle:
+        hass.data.pop(DATA_PIPELINES)
+    if not hass.data[DOMAIN]:
+        async_unload_services(hass)
     return True
 
 
 class MyModbusHub:
-    """Thread safe wrapper class for pymodbus."""
+    """Asyncio wrapper class for pymodbus (AsyncModbusTcpClient)."""
 
     def __init__(
         self,
@@ -133,66 +292,601 @@ class MyModbusHub:
         port,
         scan_interval,
         hostid,
+        cost_model: ReadCostModel | None = None,
+        adaptive_scan: bool = DEFAULT_ADAPTIVE_SCAN,
+        write_settle: float = DEFAULT_WRITE_SETTLE_MS / 1000,
+        timeout_bounds: Tuple[float, float] = (
+            DEFAULT_TIMEOUT_MIN_MS / 1000,
+            DEFAULT_TIMEOUT_MAX_MS / 1000,
+        ),
+        pipeline_reads: bool = DEFAULT_PIPELINE_READS,
+        pipelines: PipelinePool | None = None,
+        fleet: FleetScheduler | None = None,
+        oversampling_window: float = DEFAULT_OVERSAMPLING_WINDOW,
+        change_events: bool = DEFAULT_CHANGE_EVENTS,
     ):
         """Initialize the Modbus hub."""
         self._hass = hass
-        self._client = ModbusTcpClient(host=host, port=port, timeout=3, retries=3)
-        self._lock = threading.Lock()
+        # Timeouts und Wiederholungen pro Request regelt der Hub (_request), der Client
+        # selbst wiederholt nicht und wartet höchstens die Obergrenze
+        self._rtt = RttEstimator(*timeout_bounds, DEFAULT_MAX_RETRIES)
+        # Fleet-Modus: Client und I/O-Queue gehören dem Pool (eine Verbindung je host:port)
+        self._fleet = fleet
+        self._connection: PooledConnection | None = None
+        if fleet is not None:
+            self._connection = fleet.acquire(host, port, timeout_bounds[1])
+            self._client = self._connection.client
+            # Ein Worker besitzt die Verbindung: Schreibzugriffe vor Lesezugriffen
+            self._io = self._connection.io
+        else:
+            self._client = AsyncModbusTcpClient(
+                host=host, port=port, timeout=timeout_bounds[1], retries=0
+            )
+            self._io = ModbusIOQueue()
+        # Optional: Leseblöcke eines Zyklus gleichzeitig senden (None = seriell); alle Hubs
+        # eines Gateways teilen sich eine Pipeline-Verbindung (pymodbus serialisiert seine
+        # Transaktionen, über dessen Socket geht kein Pipelining)
+        self._pipelines: PipelinePool | None = None
+        self._pipeline: PipelinedReader | None = None
+        # Gescheiterte Batches in Folge, die seriell gelesen werden konnten
+        self._pipeline_failures = 0
+        if pipeline_reads:
+            self._pipelines = pipelines if pipelines is not None else PipelinePool()
+            self._pipeline = self._pipelines.acquire(host, port)
+        # FC23 (Read/Write Multiple) wird beim ersten Schreibzugriff erkannt; None = unbekannt
+        self._fc23_supported: bool | None = None
+        # NUMBER/CLIMATE: nur der letzte Wert eines Bursts wird geschrieben
+        self._coalescer = WriteCoalescer(self.write_entity_value, write_settle)
+        # Letzte bestätigte Rohwerte der Holding-Register/Coils: gleiche Werte nicht erneut schreiben
+        self._shadow = RegisterShadow()
+        # Circuit Breaker: bei totem Gerät keine Zyklen bis zum nächsten Backoff-Versuch
+        self._supervisor = ConnectionSupervisor(DEFAULT_BACKOFF_MIN, DEFAULT_BACKOFF_MAX)
         self._name = name
-        self._scan_interval = timedelta(seconds=scan_interval)
+        # Periode je Pollklasse in Sekunden (None = nur einmal lesen)
+        self._poll_intervals: Dict[str, float | None] = {
+            C_POLL_FAST: min(DEFAULT_POLL_FAST_INTERVAL, scan_interval),
+            C_POLL_NORMAL: scan_interval,
+            C_POLL_SLOW: max(DEFAULT_POLL_SLOW_INTERVAL, scan_interval),
+            C_POLL_ONCE: None,
+        }
+        # Adaptives Intervall: gilt für NORMAL, FAST wird proportional mitskaliert
+        self._adaptive_scan = adaptive_scan
+        self._effective_interval = float(scan_interval)
+        self._adaptive_bounds = (
+            MIN_SCAN_INTERVAL,
+            max(DEFAULT_ADAPTIVE_MAX_INTERVAL, scan_interval),
+        )
+        self._adaptive_deltas: Dict[str, float] = {
+            key: ADAPTIVE_DELTAS[get_entity_unit(props)]
+            for key, props in ENTITIES_DICT.items()
+            if get_entity_unit(props) in ADAPTIVE_DELTAS
+        }
+        # Referenzwerte: seit der letzten Bewegung gilt "ruhig", solange |Wert - Referenz| <= Delta
+        self._adaptive_reference: Dict[str, Any] = {}
+        # Dekodierte Werte des letzten Lesezyklus vor dem Oversampling (nur adaptiv)
+        self._cycle_values: Dict[str, Any] = {}
+        self._write_activity = False
         self._hostid = hostid
         self._unsub_interval_method = None
-        self._sensors = []
+        # Abo-Index: Entity-Key -> Update-Callbacks
+        self._subscribers: Dict[str, list[Callable[[], None]]] = {}
         self.data: Dict[str, Any] = {}
+        self._forced_refresh_interval = DEFAULT_FORCED_REFRESH_INTERVAL
+        self._last_forced_refresh = time.monotonic()
+        self.state_writes = 0
+        self.state_writes_suppressed = 0
+        self.state_writes_filtered = 0
+        # Publish-Filter je Entity-Key: (Deadband, Mindestabstand in s); nur Keys mit Filter
+        self._publish_filters: Dict[str, Tuple[float, float]] = {}
+        for key, props in (ENTITIES_DICT | DIAGNOSTICS_DICT | DERIVED_DICT).items():
+            deadband = get_entity_deadband(props)
+            min_interval = get_entity_min_publish_interval(props)
+            if deadband or min_interval:
+                self._publish_filters[key] = (deadband, min_interval)
+        # Zuletzt veröffentlichter Wert und Zeitpunkt (nur Keys mit Filter)
+        self._published: Dict[str, Tuple[Any, float]] = {}
+        # Oversampling: Messwerte jeden Zyklus puffern, je Fenster nur das Aggregat veröffentlichen
+        self._oversampler: Oversampler | None = None
+        if oversampling_window > 0:
+            self._oversampler = Oversampler(
+                [key for key, props in ENTITIES_DICT.items() if is_entity_measurement(props)],
+                oversampling_window,
+                OVERSAMPLING_CAPACITY,
+            )
+        # Keys mit frisch abgeschlossenem Fenster: werden am Publish-Filter vorbei aktualisiert
+        self._fresh_aggregates: set[str] = set()
+        # Abgeleitete Werte (DERIVED_DICT) aus den Werten desselben Zyklus
+        self._derived = DerivedValues(
+            HUMIDITY_PAIRS,
+            HEAT_RECOVERY_INPUTS,
+            C_HEAT_RECOVERY_EFFICIENCY,
+            HEAT_RECOVERY_MIN_DELTA,
+        )
+        self._read_plan = build_read_plan(ENTITIES_DICT, cost_model)
+        self._cost_model = cost_model
+        # Requests je Kombination fälliger Blöcke (überlappende Blöcke ein Request)
+        self._read_requests: Dict[Tuple[int, ...], list[ReadRequest]] = {}
+        self._decode_plan = DecodePlan(self._read_plan, ENTITIES_DICT)
+        # Aktive Fehler als Bitset; Übergänge (neu aktiv, behoben) bis zum Dispatch sammeln
+        self._active_errors = ActiveErrors(self._decode_plan, ACTIVE_ERROR_KEYS, ERROR_DICT)
+        self._error_transitions: list[Tuple[int, int]] = []
+        # Attribute der Diagnosewerte (RTT/Timeout je Funktionscode); geänderte Attribute
+        # erzwingen ein Update, auch wenn der Zustand (Maximum) gleich bleibt
+        self._diagnostic_attributes: Dict[str, Dict[str, Any]] = {}
+        self._changed_attributes: set[str] = set()
+        # Change-Stream: geänderte Keys je Zyklus als Event (optional) und an Abonnenten
+        self._changes = ChangeStream(self._decode_plan, DIAGNOSTICS_DICT)
+        self._changes.events_enabled = change_events
+        # Scheduler: Fälligkeit je Pollklasse (monotonic), Tick = kürzeste Periode
+        polls = {block.poll for block in self._read_plan}
+        self._next_due: Dict[str, float] = {poll: 0.0 for poll in polls}
+        tick = min(
+            (self._poll_intervals[p] for p in polls if self._poll_intervals[p]),
+            default=scan_interval,
+        )
+        if adaptive_scan:
+            tick = min(tick, MIN_SCAN_INTERVAL)
+        self._tick = timedelta(seconds=tick)
+        # Zyklus-Überwachung: Deadline, Überläufe, ausgelassene Ticks, Laufzeiten
+        self._cycle_deadline = tick * CYCLE_DEADLINE_FACTOR
+        self._cycle_running = False
+        self.cycle_overruns = 0
+        self._consecutive_overruns = 0
+        self._skipped_ticks = 0
+        self._cycle_durations: deque[float] = deque(maxlen=CYCLE_STATS_WINDOW)
+        _LOGGER.debug(f"Leseplan: {describe_read_plan(self._read_plan)}")
 
     @callback
-    def async_add_my_modbus_sensor(self, update_callback):
-        """Listen for data updates."""
+    def async_add_my_modbus_sensor(self, entity_key: str, update_callback):
+        """Listen for data updates of one entity key."""
         # This is the first sensor, set up interval.
-        if not self._sensors:
-            self.connect()
-            self._unsub_interval_method = async_track_time_interval(
-                self._hass, self.async_refresh_modbus_data, self._scan_interval
-            )
+        if not self._subscribers:
+            # Verbindungsaufbau läuft als Task, der Event-Loop wird nicht blockiert
+            self._hass.async_create_task(self.async_connect())
+            if self._fleet is not None:
+                self._unsub_interval_method = self._fleet.async_track(
+                    self._async_scheduled_refresh, self._tick
+                )
+            else:
+                self._unsub_interval_method = async_track_time_interval(
+                    self._hass, self._async_scheduled_refresh, self._tick
+                )
 
-        self._sensors.append(update_callback)
+        self._subscribers.setdefault(entity_key, []).append(update_callback)
 
     @callback
-    def async_remove_my_modbus_sensor(self, update_callback):
+    def async_remove_my_modbus_sensor(self, entity_key: str, update_callback):
         """Remove data update."""
-        self._sensors.remove(update_callback)
+        callbacks = self._subscribers.get(entity_key, [])
+        callbacks.remove(update_callback)
+        if not callbacks:
+            self._subscribers.pop(entity_key, None)
 
-        if not self._sensors:
+        if not self._subscribers:
             # """stop the interval timer upon removal of last sensor"""
             self._unsub_interval_method()
             self._unsub_interval_method = None
-            self.close()
+            self._hass.async_create_task(self.async_close())
 
-    async def async_refresh_modbus_data(self, _now: Optional[int] = None) -> None:
-        """Time to update."""
-        if not self._sensors:
+    async def _async_scheduled_refresh(self, _now: Optional[int] = None) -> None:
+        """
+        Timer-Callback: höchstens ein Zyklus gleichzeitig, mit Deadline.
+        Läuft noch ein Zyklus, wird der Tick ausgelassen; fällige Pollklassen bleiben
+        fällig und werden im nächsten Zyklus mitgelesen.
+        Bei offenem Circuit wird nicht gelesen; nach Ablauf des Backoffs prüft ein
+        Health-Check die Verbindung, erst danach folgt ein vollständiger Zyklus.
+        Ein Überlauf der Deadline zählt als ausgelassener Zyklus (Verbindung bleibt),
+        erst MAX_CONSECUTIVE_OVERRUNS Überläufe in Folge als Fehlschlag.
+        """
+        if self._cycle_running:
+            self._skipped_ticks += 1
+            _LOGGER.debug("Vorheriger Zyklus läuft noch, Tick ausgelassen.")
+            return
+        start = time.monotonic()
+        if not self._due_polls(start) or not self._supervisor.allow(start):
             return
 
-        update_result = self.read_modbus_registers()
+        self._cycle_running = True
+        # Spitzentiefe je Zyklus; _update_diagnostics liest sie nur (läuft zweimal je Zyklus)
+        self._io.reset_peak_depth()
+        probe = self._supervisor.state == CIRCUIT_HALF_OPEN
+        success = False
+        overrun = False
+        try:
+            async with asyncio.timeout(self._cycle_deadline):
+                if probe:
+                    success = await self._async_health_check() and (
+                        await self.async_refresh_modbus_data(full=True)
+                    )
+                elif self._client.connected or await self.async_connect():
+                    success = await self.async_refresh_modbus_data()
+        except TimeoutError:
+            overrun = True
+            self.cycle_overruns += 1
+            self._consecutive_overruns += 1
+            _LOGGER.warning(
+                f"Zyklus hat die Deadline von {self._cycle_deadline:.1f} s überschritten, "
+                "offene Requests abgebrochen."
+            )
+        finally:
+            self._cycle_running = False
+            self._cycle_durations.append(time.monotonic() - start)
+            if success:
+                self._consecutive_overruns = 0
+                availability_changed = self._supervisor.record_success()
+            elif (
+                overrun
+                and not probe
+                and self._consecutive_overruns < MAX_CONSECUTIVE_OVERRUNS
+            ):
+                # z. B. ein langsamer Schreibzugriff vor den Lesezugriffen: kein Gerätefehler,
+                # die fälligen Pollklassen bleiben fällig
+                availability_changed = False
+            else:
+                self._consecutive_overruns = 0
+                availability_changed = self._supervisor.record_failure(time.monotonic())
+                # Tote Verbindung bzw. Antworten auf abgebrochene Requests verwerfen,
+                # der Health-Check baut die Verbindung neu auf
+                await self.async_close()
+            # Die Werte hat async_refresh_modbus_data bereits verteilt: hier nur die
+            # Diagnosewerte, alle Entitäten nur bei geänderter Verfügbarkeit
+            previous = dict(self.data)
+            self._update_diagnostics()
+            if availability_changed:
+                self._async_dispatch_changes(previous, force_keys=self._subscribers)
+            else:
+                self._async_dispatch_changes(previous, keys=DIAGNOSTICS_DICT)
+
+    async def _async_health_check(self) -> bool:
+        """Verbinden und ein einzelnes Element des ersten Leseblocks lesen."""
+        if not await self.async_connect():
+            return False
+        first = self._read_plan[0]
+        probe = ReadBlock(first.reg_type, first.address, 1, (), first.poll)
+        return await self._async_read_block(probe) is not None
+
+    def entity_attributes(self, entity_key: str) -> Dict[str, Any] | None:
+        """Zusätzliche Attribute einer Entität (aktive Fehler, RTT je FC, Oversampling-Aggregate)."""
+        if entity_key == C_ACTIVE_ERRORS:
+            return self._active_errors.attributes
+        if entity_key in self._diagnostic_attributes:
+            return self._diagnostic_attributes[entity_key]
+        return self.aggregates.get(entity_key)
+
+    @property
+    def aggregates(self) -> Dict[str, Dict[str, Any]]:
+        """Mittelwert, Min, Max, Standardabweichung des letzten Fensters je Key (Oversampling)."""
+        return self._oversampler.attributes if self._oversampler is not None else {}
+
+    @property
+    def available(self) -> bool:
+        """Gerät erreichbar (Circuit geschlossen)."""
+        return self._supervisor.available
+
+    def is_available(self, entity_key: str) -> bool:
+        """Verfügbarkeit einer Entität; Diagnosewerte liefert der Hub auch ohne Gerät."""
+        return self._supervisor.available or entity_key in DIAGNOSTICS_DICT
+
+    @staticmethod
+    def _percentile_ms(values: Iterable[float], q: float) -> float | None:
+        """Perzentil von Zeiten in Sekunden als ms (None ohne Messwerte)."""
+        value = percentile(values, q)
+        return None if value is None else round(value * 1000, 1)
+
+    async def async_refresh_modbus_data(
+        self,
+        _now: Optional[int] = None,
+        force_keys: Iterable[str] = (),
+        full: bool = False,
+    ) -> bool:
+        """
+        Time to update: liest die fälligen Pollklassen (full=True: alle Blöcke).
+        Gibt False zurück, wenn ein Lesezugriff fehlgeschlagen ist.
+        """
+        if not self._subscribers:
+            return True
+
+        now = time.monotonic()
+        due = set(self._next_due) if full else self._due_polls(now)
+        if not due:
+            return True
+        buffer_ids = [
+            buffer_id
+            for buffer_id, block in enumerate(self._read_plan)
+            if block.poll in due
+        ]
+
+        previous = dict(self.data)
+        update_result = await self.async_read_modbus_registers(buffer_ids)
+        force_keys = {*force_keys, *self._fresh_aggregates}
+        self._fresh_aggregates.clear()
+        # Gleiche Anzahl, andere Codes: Attribute trotzdem aktualisieren
+        if self._error_transitions:
+            force_keys.add(C_ACTIVE_ERRORS)
 
         if update_result:
-            for update_callback in self._sensors:
-                update_callback()
+            if self._adaptive_scan:
+                self._adapt_interval(self._cycle_values, now)
+            for poll in due:
+                interval = self._poll_interval(poll)
+                self._next_due[poll] = now + interval if interval else float("inf")
+            self._update_diagnostics()
+            self._async_dispatch_changes(previous, force_keys)
+            self._async_fire_error_events()
+        return update_result
+
+    @callback
+    def _async_fire_error_events(self) -> None:
+        """Je Fehlercode ein Event beim Auftreten bzw. Beheben (nur Übergänge)."""
+        for raised, cleared in self._error_transitions:
+            for event_type, bits in ((EVENT_ERROR_RAISED, raised), (EVENT_ERROR_CLEARED, cleared)):
+                for code in error_codes(bits):
+                    self._hass.bus.async_fire(
+                        event_type,
+                        {
+                            ATTR_HUB: self._name,
+                            ATTR_CODE: code,
+                            ATTR_DESCRIPTION: self._active_errors.describe(code),
+                        },
+                    )
+        self._error_transitions.clear()
+
+    def _poll_interval(self, poll: str) -> float | None:
+        """Aktuelle Periode einer Pollklasse in Sekunden (None = nur einmal lesen)."""
+        base = self._poll_intervals[poll]
+        if not self._adaptive_scan or poll not in (C_POLL_FAST, C_POLL_NORMAL):
+            return base
+        if poll == C_POLL_NORMAL:
+            return self._effective_interval
+        scale = self._effective_interval / self._poll_intervals[C_POLL_NORMAL]
+        return min(max(base * scale, MIN_SCAN_INTERVAL), self._effective_interval)
+
+    def _shadow_max_age(self, entity_key: str) -> float:
+        """
+        Schattenwerte gelten höchstens eine Pollperiode der Entität: danach kann das Gerät
+        (z. B. am Bedienteil) geändert worden sein, ohne dass der Hub es gelesen hat.
+        """
+        return self._poll_interval(get_entity_poll(ENTITIES_DICT[entity_key])) or 0.0
+
+    def _adapt_interval(self, values: Dict[str, Any], now: float) -> None:
+        """
+        Intervall verlängern, solange alle gelesenen Werte innerhalb ihrer Deltas bleiben;
+        bei Bewegung oder nach einem Schreibzugriff auf das Minimum zurücksetzen.
+        values: gelesene Werte des Zyklus (roh, nicht die Oversampling-Mittelwerte).
+        """
+        moving = self._write_activity or any(
+            self._is_moving(key, value) for key, value in values.items()
+        )
+        self._write_activity = False
+        low, high = self._adaptive_bounds
+        if moving:
+            self._adaptive_reference.update(values)
+            self._set_effective_interval(low, now)
+        else:
+            self._set_effective_interval(
+                min(self._effective_interval * ADAPTIVE_INCREASE_FACTOR, high), now
+            )
+
+    def _is_moving(self, key: str, new: Any) -> bool:
+        if key not in self._adaptive_reference:
+            self._adaptive_reference[key] = new
+            return False
+        old = self._adaptive_reference[key]
+        delta = self._adaptive_deltas.get(key)
+        if delta is not None and isinstance(new, float) and isinstance(old, float):
+            return abs(new - old) > delta
+        return new != old
+
+    def _set_effective_interval(self, interval: float, now: float) -> None:
+        """Neues effektives Intervall; bereits geplante Lesungen ggf. vorziehen."""
+        if interval != self._effective_interval:
+            _LOGGER.debug(f"Effektives Abfrage-Intervall: {interval:.1f} s")
+        self._effective_interval = interval
+        for poll in (C_POLL_FAST, C_POLL_NORMAL):
+            if poll in self._next_due:
+                self._next_due[poll] = min(
+                    self._next_due[poll], now + self._poll_interval(poll)
+                )
+
+    @callback
+    def _note_write_activity(self) -> None:
+        """Nach einem Schreibzugriff im adaptiven Modus sofort wieder schnell abfragen."""
+        if self._adaptive_scan:
+            self._write_activity = True
+            self._set_effective_interval(self._adaptive_bounds[0], time.monotonic())
+
+    def _due_polls(self, now: float) -> set[str]:
+        """Pollklassen, deren Periode abgelaufen ist (halber Tick Toleranz gegen Timer-Jitter)."""
+        slack = self._tick.total_seconds() / 2
+        return {poll for poll, due in self._next_due.items() if now + slack >= due}
+
+    def _update_diagnostics(self) -> None:
+        """Diagnosewerte des Hubs (DIAGNOSTICS_DICT) in self.data übernehmen."""
+        self.data[C_DIAG_STATE_WRITES] = self.state_writes
+        self.data[C_DIAG_SUPPRESSED_STATE_WRITES] = self.state_writes_suppressed
+        self.data[C_DIAG_FILTERED_STATE_WRITES] = self.state_writes_filtered
+        self.data[C_DIAG_SCAN_INTERVAL] = round(self._effective_interval, 1)
+        self.data[C_DIAG_CYCLE_OVERRUNS] = self.cycle_overruns
+        self.data[C_DIAG_SKIPPED_TICKS] = self.skipped_ticks
+        self.data[C_DIAG_CYCLE_P50] = self._percentile_ms(self._cycle_durations, 0.5)
+        self.data[C_DIAG_CYCLE_P95] = self._percentile_ms(self._cycle_durations, 0.95)
+        self.data[C_DIAG_IO_QUEUE_DEPTH] = self._io.peak_depth
+        self.data[C_DIAG_WRITE_WAIT] = self._percentile_ms(
+            self._io.wait_times[PRIORITY_WRITE], 0.95
+        )
+        self.data[C_DIAG_READ_WAIT] = self._percentile_ms(
+            self._io.wait_times[PRIORITY_READ], 0.95
+        )
+        self.data[C_DIAG_IO_SERVICE] = self._percentile_ms(self._io.service_times, 0.5)
+        self.data[C_DIAG_COALESCED_WRITES] = self._coalescer.collapsed
+        self.data[C_DIAG_SUPPRESSED_WRITES] = self._shadow.suppressed
+        self.data[C_DIAG_CONNECTION_FAILURES] = self._supervisor.failures
+        srtt = self._rtt.srtt
+        self.data[C_DIAG_RTT] = None if srtt is None else round(srtt * 1000, 1)
+        self.data[C_DIAG_REQUEST_TIMEOUT] = round(self._rtt.max_timeout * 1000)
+        # Zustand = Maximum, je Funktionscode als Attribute (ms)
+        attributes = {
+            C_DIAG_RTT: {
+                f"fc{fc}": round(value * 1000, 1)
+                for fc, value in self._rtt.srtt_by_function_code().items()
+            },
+            C_DIAG_REQUEST_TIMEOUT: {
+                f"fc{fc}": round(value * 1000)
+                for fc, value in self._rtt.timeout_by_function_code().items()
+            },
+        }
+        for key, value in attributes.items():
+            if self._diagnostic_attributes.get(key) != value:
+                self._diagnostic_attributes[key] = value
+                self._changed_attributes.add(key)
+
+    @callback
+    def _async_dispatch_changes(
+        self,
+        previous: Dict[str, Any],
+        force_keys: Iterable[str] = (),
+        keys: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Nur Entitäten benachrichtigen, deren Wert sich geändert hat.
+        Entitäten mit Publish-Filter werden gegen den zuletzt veröffentlichten Wert
+        geprüft (Deadband, Mindestabstand), siehe _passes_publish_filter.
+        Alle forced_refresh_interval Sekunden werden alle Entitäten aktualisiert.
+        keys: nur diese Entity-Keys prüfen (None = alle abonnierten); ohne Change-Stream
+        und ohne die periodische Vollaktualisierung.
+        """
+        now = time.monotonic()
+        force_all = False
+        if keys is None:
+            if self._changes.active:
+                self._async_publish_changes(previous)
+            force_all = now - self._last_forced_refresh >= self._forced_refresh_interval
+            if force_all:
+                self._last_forced_refresh = now
+            subscribers = list(self._subscribers.items())
+        else:
+            subscribers = [
+                (key, self._subscribers[key]) for key in keys if key in self._subscribers
+            ]
+        force_keys = {*force_keys, *self._changed_attributes}
+        self._changed_attributes.clear()
+
+        for entity_key, callbacks in subscribers:
+            value = self.data.get(entity_key, _MISSING)
+            if entity_key in self._publish_filters:
+                publish = self._passes_publish_filter(entity_key, value, now)
+                if publish is None:
+                    self.state_writes_filtered += len(callbacks)
+            else:
+                publish = value != previous.get(entity_key, _MISSING)
+            if force_all or entity_key in force_keys or publish:
+                if entity_key in self._publish_filters:
+                    self._published[entity_key] = (value, now)
+                self.state_writes += len(callbacks)
+                for update_callback in list(callbacks):
+                    update_callback()
+            elif publish is False:
+                self.state_writes_suppressed += len(callbacks)
+
+    @callback
+    def async_subscribe_changes(self, change_callback: ChangeCallback) -> Callable[[], None]:
+        """
+        change_callback(changes) wird je Zyklus mit Änderungen aufgerufen,
+        changes = {key: {"old": ..., "new": ..., "raw": ...}}. Gibt die Abmeldefunktion zurück.
+        """
+        return self._changes.subscribe(change_callback)
+
+    @callback
+    def _async_publish_changes(self, previous: Dict[str, Any]) -> None:
+        """Geänderte Keys seit previous als ein Event bzw. an die Abonnenten melden."""
+        changes = self._changes.diff(previous, self.data)
+        if not changes:
+            return
+        self._changes.notify(changes)
+        if self._changes.events_enabled:
+            self._hass.bus.async_fire(EVENT_CHANGES, {ATTR_HUB: self._name, ATTR_CHANGES: changes})
+
+    def _passes_publish_filter(self, entity_key: str, value: Any, now: float) -> bool | None:
+        """
+        True: veröffentlichen, False: unverändert, None: geändert, aber vom Filter
+        zurückgehalten (kleiner als das Deadband oder Mindestabstand nicht erreicht).
+        Zurückgehaltene Werte werden im nächsten Zyklus erneut geprüft.
+        """
+        last_value, last_time = self._published.get(entity_key, (_MISSING, 0.0))
+        if value == last_value:
+            return False
+        # Erster Wert, None (Lesefehler) oder Text: sofort veröffentlichen
+        if not all(
+            isinstance(v, (int, float)) and not isinstance(v, bool)
+            for v in (value, last_value)
+        ):
+            return True
+        deadband, min_interval = self._publish_filters[entity_key]
+        if abs(value - last_value) + _DEADBAND_EPSILON < deadband:
+            return None
+        if now - last_time < min_interval:
+            return None
+        return True
 
     @property
     def name(self):
         """Return the name of this hub."""
         return self._name
 
-    def close(self):
-        """Disconnect client."""
-        with self._lock:
-            self._client.close()
+    @property
+    def read_plan(self) -> list[dict[str, Any]]:
+        """Aktueller Leseplan (Funktionscode, Adresse, Anzahl, Entitäten)."""
+        return describe_read_plan(self._read_plan)
 
-    def connect(self):
+    @property
+    def skipped_ticks(self) -> int:
+        """Ausgelassene Ticks; im Fleet-Modus zählt der Scheduler die Überschneidungen."""
+        if self._fleet is None:
+            return self._skipped_ticks
+        return self._skipped_ticks + self._fleet.skipped_ticks(self._async_scheduled_refresh)
+
+    async def async_close(self) -> None:
+        """
+        Disconnect client (wartende Requests schlagen fehl, der laufende wird abgebrochen).
+        Eine Pool-Verbindung bleibt für die anderen Units offen; die eigenen Requests
+        bricht die Zyklus-Deadline ab.
+        """
+        if self._connection is None:
+            self._io.stop()
+            self._client.close()
+        # Nach Verbindungsverlust ist der Gerätezustand unbekannt
+        self._shadow.clear()
+
+    async def async_shutdown(self) -> None:
+        """Hub beenden (Entry entladen): Verbindung schließen bzw. an den Pool zurückgeben."""
+        # Kein verzögertes Schreiben mehr gegen die geschlossene Verbindung
+        self._coalescer.cancel()
+        await self.async_close()
+        self._release_pipeline()
+        if self._fleet is not None:
+            # _connection bleibt gesetzt: ein späteres async_close schließt nie die Pool-Verbindung
+            self._fleet.release(self._connection)
+            self._fleet = None
+
+    def _release_pipeline(self) -> None:
+        """Pipeline-Verbindung an den Pool zurückgeben (die anderen Hubs lesen weiter)."""
+        if self._pipeline is not None:
+            self._pipelines.release(self._pipeline)
+            self._pipeline = None
+
+    async def async_connect(self) -> bool:
         """Connect client."""
-        with self._lock:
-            self._client.connect()
+
+        async def connect() -> bool:
+            if self._client.connected:
+                return True
+            try:
+                return await self._client.connect()
+            except ModbusException as exc:
+                _LOGGER.error(f"Verbindungsaufbau fehlgeschlagen: {exc}")
+                return False
+
+        return await self._io.submit(PRIORITY_CONTROL, connect)
 
     # ---- Helper ----------------------------------------------------------
 
@@ -204,15 +898,6 @@ class MyModbusHub:
         else:
             return 1 if bool(v) else 0
 
-    def _decode_switch(self, props: Dict[str, Any], raw: int) -> str:
-        """
-        SWITCH-Mapping -> 'off'/'on'.
-        Erlaubt {"off": 0}  oder {"off": 0, "on": 1}.
-        """
-        m: Dict[str, int] = get_entity_switch(props) or {}
-        off_v = m.get("off", 0)
-        return "off" if raw == off_v else "on"
-
     # ---- Numerische Werte ----------------------------------------------------------
     def _encode_numeric(
         self, value: float, faktor: float, min_v: float | None, max_v: float | None
@@ -230,26 +915,6 @@ class MyModbusHub:
 
         return round(value / faktor)
 
-    def _decode_numeric(self, props: Dict[str, Any], raw: int) -> float:
-        """Rohwert -> physikalischer Wert mittels FAKTOR (raw * faktor)."""
-        # Sentinel für 'ungültig': -500
-        if raw == -500:
-            return None
-        faktor = get_entity_factor(props) or 1.0
-        value = raw * faktor
-        return float(value)
-
-    def _decode_climate(self, props: Dict[str, Any], raw: int) -> dict:
-        value = self._decode_numeric(props, raw)
-        min_value = get_entity_min(props)
-        max_value = get_entity_max(props)
-
-        return {
-            "temperature": value,
-            "target_temp_low": min_value,
-            "target_temp_high": max_value,
-        }
-
     # ---- Select Werte ----------------------------------------------------------
     def _encode_select(self, props: Dict[str, Any], value: Any) -> int:
         """Ermittle den zu schreibenden Integer aus VALUES-Mapping (Label oder Index erlaubt)."""
@@ -277,29 +942,104 @@ class MyModbusHub:
             )
         return iv
 
-    def _decode_select(self, props: Dict[str, Any], raw: int) -> str | None:
-        """
-        Invertiere VALUES (Index->Text) zu Text
-        Unbekannte Indizes -> None.
-        """
-        values: Dict[Any, Any] = get_entity_select(props) or {}
-        return values.get(raw, f"Ungültiger Wert: {raw}")
-
     # ***************************************** SCHREIBEN **************************************************************
 
-    async def write_entity_value(self, entity_key: str, value: Any) -> None:
+    async def write_entity_value(
+        self, entity_key: str, value: Any, force: bool = False
+    ) -> Dict[str, str]:
         """
         Generisches Schreiben für alle beschreibbaren Entitäten.
         - SWITCH: akzeptiert bool / 'on'/'off'/0/1
         - SELECT (VALUES): akzeptiert Label (String) oder Index (int)
         - NUMBER/CLIMATE: beachtet FAKTOR, MIN/MAX
-        - UINT32: wird Big-Endian in zwei Registern geschrieben (REG, REG+1)
+        - UINT32: wird Big-Endian in zwei Registern geschrieben (REG, REG+1), ein FC16-Request
         - HA (Hand-Aktiv): falls vorhanden und activate_hand=True -> 1 schreiben
+        - force=True: auch schreiben, wenn der Wert laut Schattenkopie bereits gesetzt ist
         """
-
         _LOGGER.info(f"Schreibe Entität {entity_key} -> {value}")
         print(f"write_entity_value: {entity_key} -> {value}")
+        return await self.write_entity_values({entity_key: value}, force=force)
 
+    async def write_entity_values(
+        self, values: Dict[str, Any], force: bool = False
+    ) -> Dict[str, str]:
+        """
+        Schreibt mehrere Entitäten mit möglichst wenigen Requests:
+        zusammenhängende Register/Coils werden zu einem FC16/FC15-Request zusammengefasst.
+        Alle Werte werden vor dem ersten Request kodiert und geprüft.
+        Werte, die laut Schattenkopie bereits im Gerät stehen, werden übersprungen
+        (außer bei force=True).
+        Rückgabe: Ergebnis je Key (C_WRITE_WRITTEN / C_WRITE_UNCHANGED / C_WRITE_UNCONFIRMED).
+        """
+        _LOGGER.info(f"Schreibe Entitäten {values}")
+
+        # 1) Werte in Roh-Registerwerte umwandeln
+        writes = [self._encode_entity_value(key, value) for key, value in values.items()]
+
+        # 2) Unveränderte Werte nicht senden, gelten als bestätigt
+        confirmed: list[str] = []
+        results: Dict[str, str] = {}
+        if not force:
+            unchanged = [
+                write
+                for write in writes
+                if self._shadow.matches(write, self._shadow_max_age(write.key))
+            ]
+            if unchanged:
+                confirmed = [write.key for write in unchanged]
+                results = dict.fromkeys(confirmed, C_WRITE_UNCHANGED)
+                self._shadow.suppressed += len(unchanged)
+                writes = [write for write in writes if write not in unchanged]
+                _LOGGER.info(f"Werte unverändert, Schreiben übersprungen: {confirmed}")
+
+        # 3) Schreiben, geschriebenen Bereich direkt zurücklesen (FC23 falls unterstützt)
+        previous = dict(self.data)
+        for block in build_write_plan(writes):
+            try:
+                read_back = await self._write_modbus_registers(
+                    block.reg_type, block.address, block.values, read_back=True
+                )
+            except BaseException:
+                self._shadow.invalidate(block.reg_type, block.address, len(block.values))
+                raise
+            if read_back is None:
+                self._shadow.invalidate(block.reg_type, block.address, len(block.values))
+                continue
+            self._shadow.update(block.reg_type, block.address, read_back)
+            decoded = self._decode_plan.decode_range(
+                block.keys, block.address, read_back, self.data
+            )
+            if self._changes.active:
+                self._changes.update_range(decoded, block.address, read_back)
+            confirmed += decoded
+        if writes:
+            self._note_write_activity()
+
+        # 4) Nur die geschriebenen Entitäten aktualisieren (korrigiert optimistische UI-Werte)
+        for key in values:
+            if key not in results:
+                results[key] = C_WRITE_WRITTEN if key in confirmed else C_WRITE_UNCONFIRMED
+        missing = [key for key in values if key not in confirmed]
+        if missing:
+            _LOGGER.info(f"Read-back unvollständig ({missing}). Löse Refresh-Zyklus aus.")
+            await self.async_refresh_modbus_data(force_keys=tuple(values), full=True)
+            return results
+        _LOGGER.info("Schreibvorgang abgeschlossen und bestätigt.")
+        self._async_dispatch_changes(previous, force_keys=confirmed)
+        return results
+
+    def validate_entity_values(self, values: Dict[str, Any]) -> Dict[str, str]:
+        """Kodiert alle Werte probeweise; Rückgabe: Fehlermeldung je ungültigem Key."""
+        errors: Dict[str, str] = {}
+        for key, value in values.items():
+            try:
+                self._encode_entity_value(key, value)
+            except (ValueError, TypeError, KeyError, PermissionError) as exc:
+                errors[key] = str(exc)
+        return errors
+
+    def _encode_entity_value(self, entity_key: str, value: Any) -> EncodedWrite:
+        """Prüft die Entität und kodiert den Wert in Registerwörter bzw. Bits."""
         # Props finden
         props = get_entity_props(entity_key)
         if not props:
@@ -313,16 +1053,15 @@ class MyModbusHub:
         if reg is None or dt is None:
             raise ValueError(f"Fehlende Registerdefinition für {entity_key}.")
 
-        # 1) Wert in Roh-Registerwert(e) umwandeln
-        reg_words: Tuple[int, ...] | list[int]
-
         if is_entity_switch(props):
             raw = self._encode_switch(value)
         elif is_entity_select(props):
             raw = self._encode_select(props, value)
         elif is_entity_climate(props):
+            # Climate-Entität übergibt kwargs, der Service auch eine reine Zahl
+            temperature = value["temperature"] if isinstance(value, dict) else value
             raw = self._encode_numeric(
-                float(value["temperature"]),
+                float(temperature),
                 get_entity_factor(props),
                 get_entity_min(props),
                 get_entity_max(props),
@@ -336,28 +1075,59 @@ class MyModbusHub:
                 get_entity_max(props),
             )
 
-        if dt == ModbusTcpClient.DATATYPE.BITS:
+        reg_words: Tuple[int | bool, ...]
+        if dt == AsyncModbusTcpClient.DATATYPE.BITS:
             reg_words = (bool(raw),)
         else:
-            reg_words = self._client.convert_to_registers(value=raw, data_type=dt)
-
-        # 2) Schreiben
-        await self._write_modbus_registers(reg, reg_words, dt)
-
-        # 3) Daten neu lesen
-        _LOGGER.info("Schreibvorgang abgeschlossen. Löse Refresh-Zyklus aus.")
-        await self.async_refresh_modbus_data()
+            # Mit int(word) & 0xFFFF: sicherstellen, dass der Wert in den gültigen Bereich passt.
+            # Beispiel: 70000 & 0xFFFF → 4464, -1 & 0xFFFF → 65535
+            reg_words = tuple(
+                int(word) & 0xFFFF
+                for word in self._client.convert_to_registers(value=raw, data_type=dt)
+            )
+        return EncodedWrite(entity_key, get_entity_type(props), reg, reg_words)
 
     async def setter_function_callback(self, entity: Entity, option):
         await self.write_entity_value(entity.entity_description.key, option)
 
+    async def coalesced_setter_callback(self, entity: Entity, option):
+        """Wie setter_function_callback, Werte innerhalb des Sammelfensters werden zusammengefasst."""
+        await self._coalescer.submit(entity.entity_description.key, option)
+
+    # ***************************************** REQUESTS ***********************************************************
+
+    async def _request(self, function_code: int, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Ein Client-Request mit adaptivem Timeout aus der gemessenen RTT des Funktionscodes.
+        Nach einem Timeout wird mit doppeltem Timeout wiederholt; wiederholte Requests
+        liefern keinen RTT-Messwert (Karn).
+        """
+        timeout = self._rtt.timeout(function_code)
+        attempts = self._rtt.retries(function_code) + 1
+        for attempt in range(attempts):
+            start = time.monotonic()
+            try:
+                async with asyncio.timeout(timeout):
+                    response = await call()
+            except TimeoutError:
+                _LOGGER.debug(
+                    f"FC{function_code}: keine Antwort nach {timeout * 1000:.0f} ms "
+                    f"(Versuch {attempt + 1}/{attempts})."
+                )
+                timeout = min(timeout * 2, self._rtt.timeout_max)
+                continue
+            if attempt == 0:
+                self._rtt.sample(function_code, time.monotonic() - start)
+            return response
+        raise ModbusIOException(f"FC{function_code}: keine Antwort nach {attempts} Versuchen")
+
     # ***************************************** LESEN **************************************************************
 
     def read_entity_value(
-        self, buf: list[int | bool], idx: int, dt: ModbusTcpClient.DATATYPE
+        self, buf: list[int | bool], idx: int, dt: AsyncModbusTcpClient.DATATYPE
     ):
         if buf:
-            if dt == ModbusTcpClient.DATATYPE.BITS:
+            if dt == AsyncModbusTcpClient.DATATYPE.BITS:
                 dtlen = 1
             else:
                 dtlen = dt.value[1]
@@ -368,7 +1138,7 @@ class MyModbusHub:
                     "Puffer hat nur {buflen} Elemente und ist damit zu klein zum Lesen von {dtlen} Elementen ab Index {idx}!!"
                 )
             else:
-                if dt == ModbusTcpClient.DATATYPE.BITS:
+                if dt == AsyncModbusTcpClient.DATATYPE.BITS:
                     return buf[idx]
                 else:
                     return self._client.convert_from_registers(
@@ -379,157 +1149,217 @@ class MyModbusHub:
                 "Puffer hat keine Elemente. Fehler in Definition const.ENTITIES_DICT!!"
             )
 
-    def read_modbus_registers(self):
-        """Read from modbus registers"""
-
-        if C_MAX_INPUT_REGISTER >= C_MIN_INPUT_REGISTER:
-            _LOGGER.debug(
-                f"Lese Input-Register {C_MIN_INPUT_REGISTER} bis {C_MAX_INPUT_REGISTER}..."
+    async def _async_read_block(self, block: ReadBlock) -> list[int | bool] | None:
+        """
+        Liest einen Block des Leseplans (Register oder Bits) über den async-Client.
+        Gibt None zurück, wenn der Lesevorgang fehlschlägt.
+        """
+        label, method_name, attr = _BLOCK_READERS[block.reg_type]
+        _LOGGER.debug(f"Lese {label} {block.address} bis {block.end}...")
+        try:
+            response = await self._io.submit(
+                PRIORITY_READ,
+                lambda: self._request(
+                    block.function_code,
+                    lambda: getattr(self._client, method_name)(
+                        address=block.address, count=block.count, device_id=self._hostid
+                    ),
+                ),
             )
-            with self._lock:
-                modbusdata_input = self._client.read_input_registers(
-                    address=C_MIN_INPUT_REGISTER,
-                    count=C_MAX_INPUT_REGISTER - C_MIN_INPUT_REGISTER + 1,
-                    device_id=self._hostid,
-                )
-                if modbusdata_input is None or not hasattr(
-                    modbusdata_input, "registers"
-                ):
-                    _LOGGER.error("Fehler beim Lesen der Input-Register.")
-                    return False
-                _LOGGER.debug(
-                    f"{len(modbusdata_input.registers)} Input-Register: {modbusdata_input.registers}"
-                )
-                input_regs = modbusdata_input.registers
-        else:
-            _LOGGER.debug("Keine Input-Register definiert.")
-            input_regs = None
+        except ModbusException as exc:
+            _LOGGER.error(f"Fehler beim Lesen der {label}: {exc}")
+            return None
+        if response is None or response.isError() or not hasattr(response, attr):
+            _LOGGER.error(f"Fehler beim Lesen der {label}.")
+            return None
+        values = getattr(response, attr)
+        _LOGGER.debug(f"{len(values)} {label}: {values}")
+        return values
 
-        if C_MAX_HOLDING_REGISTER >= C_MIN_HOLDING_REGISTER:
-            _LOGGER.debug(
-                f"Lese Holding-Register {C_MIN_HOLDING_REGISTER} bis {C_MAX_HOLDING_REGISTER}..."
-            )
-            with self._lock:
-                modbusdata_holding = self._client.read_holding_registers(
-                    address=C_MIN_HOLDING_REGISTER,
-                    count=C_MAX_HOLDING_REGISTER - C_MIN_HOLDING_REGISTER + 1,
-                    device_id=self._hostid,
-                )
-                if modbusdata_holding is None or not hasattr(
-                    modbusdata_holding, "registers"
-                ):
-                    _LOGGER.error("Fehler beim Lesen der Holding-Register.")
-                    return False
-                _LOGGER.debug(
-                    f"{len(modbusdata_holding.registers)} Holding-Register: {modbusdata_holding.registers}"
-                )
-                holding_regs = modbusdata_holding.registers
-        else:
-            _LOGGER.debug("Keine Holding-Register definiert.")
-            holding_regs = None
-
-        if C_MAX_COILS >= C_MIN_COILS:
-            _LOGGER.debug(f"Lese Coils {C_MIN_COILS} bis {C_MAX_COILS}...")
-            with self._lock:
-                modbusdata_coils = self._client.read_coils(
-                    address=C_MIN_COILS,
-                    count=C_MAX_COILS - C_MIN_COILS + 1,
-                    device_id=self._hostid,
-                )
-                if modbusdata_coils is None or not hasattr(modbusdata_coils, "bits"):
-                    _LOGGER.error("Fehler beim Lesen der Coils.")
+    async def async_read_modbus_registers(
+        self, buffer_ids: Iterable[int] | None = None
+    ) -> bool:
+        """
+        Read from modbus registers (alle Blöcke des Leseplans; optional nur buffer_ids).
+        Überlappende fällige Blöcke werden in einem Request gelesen und danach zerlegt.
+        """
+        if buffer_ids is None:
+            buffer_ids = range(len(self._read_plan))
+        ids = tuple(sorted(buffer_ids))
+        requests = self._read_requests.get(ids)
+        if requests is None:
+            requests = plan_requests(self._read_plan, ids, self._cost_model)
+            self._read_requests[ids] = requests
+
+        buffers: list[tuple[int, list[int | bool]]] | None = None
+        pipeline_error: Exception | None = None
+        if self._pipeline is not None and len(requests) > 1:
+            buffers, pipeline_error = await self._async_read_blocks_pipelined(requests)
+            if buffers is not None:
+                self._pipeline_failures = 0
+        if buffers is None:
+            buffers = []
+            for request in requests:
+                values = await self._async_read_block(request.block)
+                if values is None:
                     return False
-                _LOGGER.debug(
-                    f"{len(modbusdata_coils.bits)} Coils: {modbusdata_coils.bits}"
-                )
-                coils = modbusdata_coils.bits
-        else:
-            _LOGGER.debug("Keine Coils definiert.")
-            coils = None
-
-        if C_MAX_DISCRETE_INPUTS >= C_MIN_DISCRETE_INPUTS:
-            _LOGGER.debug(
-                f"Lese Discrete Inputs {C_MIN_DISCRETE_INPUTS} bis {C_MAX_DISCRETE_INPUTS} ..."
-            )
-            with self._lock:
-                modbusdata_discrete = self._client.read_discrete_inputs(
-                    address=C_MIN_DISCRETE_INPUTS,
-                    count=C_MAX_DISCRETE_INPUTS - C_MIN_DISCRETE_INPUTS + 1,
-                    device_id=self._hostid,
-                )
-                if modbusdata_discrete is None or not hasattr(
-                    modbusdata_discrete, "bits"
+                buffers.extend(request.split(values))
+            if pipeline_error is not None and self._pipeline is not None:
+                # Seriell klappt, pipelined nicht: bei ausdrücklicher Ablehnung sofort,
+                # sonst (Timeout, getrennter Socket) erst nach mehreren Fehlern in Folge
+                # seriell weiter; bis dahin verbindet der nächste Zyklus neu
+                self._pipeline_failures += 1
+                if (
+                    isinstance(pipeline_error, PipelineRejected)
+                    or self._pipeline_failures >= PIPELINE_MAX_FAILURES
                 ):
-                    _LOGGER.error("Fehler beim Lesen der Discrete Inputs.")
-                    return False
-                _LOGGER.debug(
-                    f"{len(modbusdata_discrete.bits)} Discrete Inputs: {modbusdata_discrete.bits}"
-                )
-                discrete = modbusdata_discrete.bits
-        else:
-            _LOGGER.debug("Keine Discrete Inputs definiert.")
-            discrete = None
-
-        for entity_key, props in ENTITIES_DICT.items():
-            reg_type = get_entity_type(props)
-            reg, dt = get_entity_reg(props)
-            if reg is None:
-                continue  # defensiv
-            _LOGGER.debug(f"Lese Entität '{entity_key}'.")
-            match reg_type:
-                case const.C_REG_TYPE_COILS:
-                    raw = self.read_entity_value(coils, reg - C_MIN_COILS, dt)
-                case const.C_REG_TYPE_DISCRETE_INPUTS:
-                    raw = self.read_entity_value(
-                        discrete, reg - C_MIN_DISCRETE_INPUTS, dt
-                    )
-                case const.C_REG_TYPE_INPUT_REGISTERS:
-                    raw = self.read_entity_value(
-                        input_regs, reg - C_MIN_INPUT_REGISTER, dt
-                    )
-                case const.C_REG_TYPE_HOLDING_REGISTERS:
-                    raw = self.read_entity_value(
-                        holding_regs, reg - C_MIN_HOLDING_REGISTER, dt
-                    )
-
-            if is_entity_switch(props):
-                value = self._decode_switch(props, raw)
-            elif is_entity_select(props):
-                value = self._decode_select(props, raw)
-            elif is_entity_climate(props):
-                if is_entity_readonly(props):
-                    value = self._decode_numeric(props, raw)
-                else:
-                    value = self._decode_climate(props, raw)
-            else:
-                value = self._decode_numeric(props, raw)
-
-            self.data[entity_key] = value
+                    _LOGGER.warning("Gateway lehnt Pipelining ab, lese ab jetzt seriell.")
+                    self._release_pipeline()
+
+        for buffer_id, buf in buffers:
+            self._decode_plan.decode_block(buffer_id, buf, self.data)
+            block = self._read_plan[buffer_id]
+            self._shadow.update(block.reg_type, block.address, buf[: block.count])
+            if self._changes.active:
+                self._changes.update_block(buffer_id, buf)
+        errors = self._active_errors.update(buffers)
+        if errors is not None:
+            self.data[C_ACTIVE_ERRORS] = self._active_errors.count
+            if any(errors):
+                self._error_transitions.append(errors)
+        read_keys = [key for buffer_id, _buf in buffers for key in self._read_plan[buffer_id].keys]
+        if self._adaptive_scan:
+            self._cycle_values = {key: self.data.get(key) for key in read_keys}
+        if self._oversampler is not None:
+            self._fresh_aggregates.update(
+                self._oversampler.sample(read_keys, self.data, time.monotonic())
+            )
+        # Nach dem Oversampling: abgeleitet wird aus den veröffentlichten Werten
+        if not self._derived.inputs.isdisjoint(read_keys):
+            self._derived.compute(self.data)
 
         _LOGGER.info("Lesen der Register erfolgreich abgeschlossen.")
         return True
 
+    async def _async_read_blocks_pipelined(
+        self, requests: list[ReadRequest]
+    ) -> tuple[list[tuple[int, list[int | bool]]] | None, Exception | None]:
+        """
+        Alle Requests als ein Queue-Job: direkt hintereinander, Antworten per
+        Transaction-ID. Der Timeout deckt auch ein Gateway ab, das intern seriell arbeitet.
+        Gibt (Puffer, None) zurück bzw. (None, Fehler), wenn der Batch fehlschlägt.
+        """
+        blocks = [request.block for request in requests]
+        frames = [(block.function_code, block.address, block.count) for block in blocks]
+        timeout = sum(self._rtt.timeout(block.function_code) for block in blocks)
+        try:
+            results = await self._io.submit(
+                PRIORITY_READ,
+                lambda: self._pipeline.read_many(self._hostid, frames, timeout),
+            )
+        except (ModbusException, TimeoutError) as exc:
+            _LOGGER.info(f"Pipelined Lesen fehlgeschlagen ({exc}), lese seriell.")
+            return None, exc
+        buffers = [
+            part for request, values in zip(requests, results) for part in request.split(values)
+        ]
+        return buffers, None
+
     # ***************************************** SCHREIBEN **************************************************************
 
     async def _write_modbus_registers(
-        self, base_reg: int, reg_values: Iterable[int], dt: ModbusTcpClient.DATATYPE
-    ):
+        self,
+        reg_type: int,
+        base_reg: int,
+        reg_values: Tuple[int | bool, ...],
+        read_back: bool = False,
+    ) -> list[int | bool] | None:
         """
-        Schreibt eine Sequenz 16-bit Registerwerte ab base_reg.
-
-        Mit int(word) & 0xFFFF: sicherstellen, dass der Wert in den gültigen Bereich passt.
-        Beispiel: 70000 & 0xFFFF → 4464
-                  -1 & 0xFFFF → 65535
+        Schreibt zusammenhängende Registerwörter bzw. Coils ab base_reg in einem Request:
+        FC6/FC5 für ein Element, FC16/FC15 für mehrere (kein halb geschriebener UINT32).
+        read_back=True: liest den Bereich im selben Queue-Job zurück und gibt ihn zurück
+        (Holding Register per FC23 in einem Round-Trip, sofern das Gateway es unterstützt).
+        Ob es FC23 unterstützt, entscheidet der erste Versuch: ILLEGAL_FUNCTION oder gar
+        keine Antwort (manche Gateways verwerfen FC23 stillschweigend) heißt FC16 + FC3.
         """
         _LOGGER.info(f"Schreibzugriff auf Register {base_reg}: {reg_values}")
-        for offset, word in enumerate(reg_values):
-            if dt == ModbusTcpClient.DATATYPE.BITS:
-                self._client.write_coil(
-                    address=base_reg + offset, value=bool(word), device_id=self._hostid
+
+        async def write_read() -> list[int | bool] | None:
+            if reg_type == C_REG_TYPE_HOLDING_REGISTERS and self._fc23_supported is not False:
+                response = await self._readwrite_registers(base_reg, reg_values)
+                if response is not None and not response.isError():
+                    self._fc23_supported = True
+                    return list(response.registers)
+                if response is not None and response.exception_code != _ILLEGAL_FUNCTION:
+                    raise ModbusException(
+                        f"Schreibzugriff auf Register {base_reg} fehlgeschlagen: {response}"
+                    )
+                _LOGGER.info("Gateway unterstützt FC23 nicht, verwende FC16 + FC3.")
+                self._fc23_supported = False
+            await write()
+            label, method_name, attr = _BLOCK_READERS[reg_type]
+            response = await self._request(
+                FUNCTION_CODE[reg_type],
+                lambda: getattr(self._client, method_name)(
+                    address=base_reg, count=len(reg_values), device_id=self._hostid
+                ),
+            )
+            if response.isError():
+                _LOGGER.warning(f"Read-back der {label} ab {base_reg} fehlgeschlagen.")
+                return None
+            return list(getattr(response, attr))[: len(reg_values)]
+
+        async def write() -> None:
+            single = len(reg_values) == 1
+            if reg_type == C_REG_TYPE_COILS:
+                function_code = 5 if single else 15
+                call = (
+                    partial(self._client.write_coil, value=bool(reg_values[0]))
+                    if single
+                    else partial(self._client.write_coils, values=[bool(v) for v in reg_values])
                 )
             else:
-                self._client.write_register(
-                    address=base_reg + offset,
-                    value=int(word) & 0xFFFF,
-                    device_id=self._hostid,
+                function_code = 6 if single else 16
+                call = (
+                    partial(self._client.write_register, value=int(reg_values[0]))
+                    if single
+                    else partial(
+                        self._client.write_registers, values=[int(v) for v in reg_values]
+                    )
                 )
+            response = await self._request(
+                function_code, partial(call, address=base_reg, device_id=self._hostid)
+            )
+            if response is not None and response.isError():
+                raise ModbusException(
+                    f"Schreibzugriff auf Register {base_reg} fehlgeschlagen: {response}"
+                )
+
+        return await self._io.submit(PRIORITY_WRITE, write_read if read_back else write)
+
+    async def _readwrite_registers(
+        self, base_reg: int, reg_values: Tuple[int | bool, ...]
+    ) -> Any:
+        """
+        FC23 (Schreiben und Zurücklesen in einem Request). Solange die Unterstützung
+        unbekannt ist, gibt es genau einen Versuch bis timeout_max; bleibt die Antwort aus,
+        wird None zurückgegeben (keine Wiederholungen gegen ein Gateway, das FC23 verwirft).
+        """
+
+        def call() -> Awaitable[Any]:
+            return self._client.readwrite_registers(
+                read_address=base_reg,
+                read_count=len(reg_values),
+                write_address=base_reg,
+                values=[int(v) for v in reg_values],
+                device_id=self._hostid,
+            )
+
+        if self._fc23_supported:
+            return await self._request(23, call)
+        try:
+            async with asyncio.timeout(self._rtt.timeout_max):
+                return await call()
+        except (TimeoutError, ModbusIOException):
+            _LOGGER.debug(f"FC23: keine Antwort nach {self._rtt.timeout_max * 1000:.0f} ms.")
+            return None
@@ -0,0 +1,89 @@
+"""Change-Stream: Unterschiede von hub.data je Zyklus (alt, neu, Rohwörter) an Abonnenten."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from .decode_plan import DecodePlan
+
+_MISSING = object()
+
+ChangeCallback = Callable[[Dict[str, Dict[str, Any]]], None]
+
+
+class ChangeStream:
+    """
+    Vergleicht hub.data vor und nach einem Zyklus und meldet nur die geänderten Keys:
+    {key: {"old": ..., "new": ..., "raw": [Wörter bzw. Bits] oder None}}.
+    Ein Key, der zum ersten Mal gelesen wird, gilt nicht als Änderung. Ausgenommene Keys
+    (Diagnosewerte) erscheinen nie. Die Rohwörter werden nur mitgeführt, solange jemand
+    zuhört (active), der Lesezyklus bleibt sonst unverändert.
+    """
+
+    def __init__(self, decode_plan: DecodePlan, excluded: Iterable[str]) -> None:
+        # Key -> (Block im Leseplan, Offset im Block, Anzahl Wörter bzw. Bits, Adresse)
+        self._locations: Dict[str, Tuple[int, int, int, int]] = {
+            slot.key: (
+                slot.buffer_id,
+                slot.offset,
+                slot.size,
+                decode_plan.blocks[slot.buffer_id].block.address + slot.offset,
+            )
+            for slot in decode_plan.slots
+        }
+        self._excluded = frozenset(excluded)
+        # Zuletzt gelesener Puffer je Block (Referenz, Rohwörter werden erst bei einer
+        # Änderung herausgeschnitten; Blöcke können sich überlappen)
+        self._buffers: Dict[int, List[int | bool]] = {}
+        self._callbacks: List[ChangeCallback] = []
+        self.events_enabled = False
+
+    @property
+    def active(self) -> bool:
+        return self.events_enabled or bool(self._callbacks)
+
+    def subscribe(self, change_callback: ChangeCallback) -> Callable[[], None]:
+        """Callback je Zyklus mit Änderungen; gibt die Funktion zum Abmelden zurück."""
+        self._callbacks.append(change_callback)
+
+        def unsubscribe() -> None:
+            if change_callback in self._callbacks:
+                self._callbacks.remove(change_callback)
+
+        return unsubscribe
+
+    def update_block(self, buffer_id: int, values: List[int | bool]) -> None:
+        """Puffer eines gelesenen Blocks des Leseplans übernehmen."""
+        self._buffers[buffer_id] = values
+
+    def update_range(self, keys: Iterable[str], address: int, values: List[int | bool]) -> None:
+        """Rohwerte der keys aus einem Lesebereich ab address (Read-back nach Schreiben)."""
+        for key in keys:
+            buffer_id, offset, size, key_address = self._locations[key]
+            buf = self._buffers.get(buffer_id)
+            if buf is not None:
+                start = key_address - address
+                buf[offset : offset + size] = values[start : start + size]
+
+    def diff(
+        self, previous: Dict[str, Any], data: Dict[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        changes: Dict[str, Dict[str, Any]] = {}
+        for key, new in data.items():
+            old = previous.get(key, _MISSING)
+            if old is _MISSING or old == new or key in self._excluded:
+                continue
+            changes[key] = {"old": old, "new": new, "raw": self._raw(key)}
+        return changes
+
+    def notify(self, changes: Dict[str, Dict[str, Any]]) -> None:
+        for change_callback in list(self._callbacks):
+            change_callback(changes)
+
+    def _raw(self, key: str) -> List[int | bool] | None:
+        location = self._locations.get(key)
+        if location is None:
+            return None
+        buffer_id, offset, size, _address = location
+        buf = self._buffers.get(buffer_id)
+        return None if buf is None else list(buf[offset : offset + size])
@@ -88,7 +88,7 @@ class MyClimate(HubBackedEntity, ClimateEntity):
             self._attr_target_temperature_high = float(kwargs["target_temp_high"])
 
         # Tatsächliches Schreiben an den Hub
-        self.hass.add_job(self._hub.setter_function_callback(self, kwargs))
+        self.hass.add_job(self._hub.coalesced_setter_callback(self, kwargs))
 
     async def async_set_temperature(self, **kwargs) -> None:
         """
@@ -104,4 +104,4 @@ class MyClimate(HubBackedEntity, ClimateEntity):
         if "target_temp_high" in kwargs:
             self._attr_target_temperature_high = float(kwargs["target_temp_high"])
 
-        await self._hub.setter_function_callback(self, kwargs)
+        await self._hub.coalesced_setter_callback(self, kwargs)
@@ -0,0 +1,82 @@
+"""Schreib-Coalescing: Bursts (Slider, Thermostat-Pfeile) je Entität zu einem Schreibzugriff."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+
+@dataclass
+class _Pending:
+    value: Any
+    future: asyncio.Future
+    handle: asyncio.TimerHandle | None = None
+
+
+class WriteCoalescer:
+    """
+    Sammelt Schreibwerte je Entity-Key für settle Sekunden ab dem ersten Wert.
+    Nur der letzte Wert im Fenster wird geschrieben; alle wartenden Aufrufer erhalten
+    dasselbe Ergebnis (bzw. dieselbe Exception).
+    Werte, die während des laufenden Schreibzugriffs eintreffen, öffnen ein neues Fenster.
+    """
+
+    def __init__(
+        self, write: Callable[[str, Any], Awaitable[None]], settle: float
+    ) -> None:
+        self._write = write
+        self._settle = settle
+        self._pending: Dict[str, _Pending] = {}
+        self.submitted = 0
+        self.collapsed = 0
+
+    async def submit(self, key: str, value: Any) -> None:
+        """Wert einreihen und warten, bis der (ggf. neuere) Wert geschrieben wurde."""
+        self.submitted += 1
+        if self._settle <= 0:
+            await self._write(key, value)
+            return
+        pending = self._pending.get(key)
+        if pending is None:
+            loop = asyncio.get_running_loop()
+            pending = _Pending(value, loop.create_future())
+            # Haben alle Aufrufer abgebrochen, holt niemand die Exception ab
+            pending.future.add_done_callback(_retrieve)
+            self._pending[key] = pending
+            pending.handle = loop.call_later(self._settle, self._flush, key)
+        else:
+            pending.value = value
+            self.collapsed += 1
+        # shield: ein abgebrochener Aufrufer bricht den Schreibzugriff der anderen nicht ab
+        await asyncio.shield(pending.future)
+
+    def cancel(self) -> None:
+        """Offene Fenster verwerfen (Hub wird beendet): kein Schreiben mehr, Aufrufer erhalten CancelledError."""
+        for pending in self._pending.values():
+            pending.handle.cancel()
+            pending.future.cancel()
+        self._pending.clear()
+
+    def _flush(self, key: str) -> None:
+        pending = self._pending.pop(key)
+        task = asyncio.get_running_loop().create_task(self._write(key, pending.value))
+        task.add_done_callback(lambda t: _resolve(pending.future, t))
+
+
+def _retrieve(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+def _resolve(future: asyncio.Future, task: asyncio.Task) -> None:
+    # Exception immer abholen, auch wenn niemand mehr wartet ("never retrieved")
+    exc = None if task.cancelled() else task.exception()
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(None)
@@ -26,7 +26,23 @@ from .const import (
     DEFAULT_PORT,
     DEFAULT_HOSTID,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_ADAPTIVE_SCAN,
     CONF_HOSTID,
+    CONF_ADAPTIVE_SCAN,
+    CONF_WRITE_SETTLE_MS,
+    DEFAULT_WRITE_SETTLE_MS,
+    CONF_TIMEOUT_MIN_MS,
+    CONF_TIMEOUT_MAX_MS,
+    DEFAULT_TIMEOUT_MIN_MS,
+    DEFAULT_TIMEOUT_MAX_MS,
+    CONF_PIPELINE_READS,
+    DEFAULT_PIPELINE_READS,
+    CONF_FLEET_MODE,
+    DEFAULT_FLEET_MODE,
+    CONF_OVERSAMPLING_WINDOW,
+    DEFAULT_OVERSAMPLING_WINDOW,
+    CONF_CHANGE_EVENTS,
+    DEFAULT_CHANGE_EVENTS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -38,6 +54,22 @@ DATA_SCHEMA = vol.Schema(
         vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
         vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
         vol.Optional(CONF_HOSTID, default=DEFAULT_HOSTID): int,
+        vol.Optional(CONF_ADAPTIVE_SCAN, default=DEFAULT_ADAPTIVE_SCAN): bool,
+        vol.Optional(CONF_WRITE_SETTLE_MS, default=DEFAULT_WRITE_SETTLE_MS): vol.All(
+            int, vol.Range(min=0, max=5000)
+        ),
+        vol.Optional(CONF_TIMEOUT_MIN_MS, default=DEFAULT_TIMEOUT_MIN_MS): vol.All(
+            int, vol.Range(min=20, max=10000)
+        ),
+        vol.Optional(CONF_TIMEOUT_MAX_MS, default=DEFAULT_TIMEOUT_MAX_MS): vol.All(
+            int, vol.Range(min=100, max=30000)
+        ),
+        vol.Optional(CONF_PIPELINE_READS, default=DEFAULT_PIPELINE_READS): bool,
+        vol.Optional(CONF_FLEET_MODE, default=DEFAULT_FLEET_MODE): bool,
+        vol.Optional(
+            CONF_OVERSAMPLING_WINDOW, default=DEFAULT_OVERSAMPLING_WINDOW
+        ): vol.All(int, vol.Range(min=0, max=3600)),
+        vol.Optional(CONF_CHANGE_EVENTS, default=DEFAULT_CHANGE_EVENTS): bool,
     }
 )
 
@@ -52,11 +84,21 @@ def host_valid(host):
         return all(x and not disallowed.search(x) for x in host.split("."))
 
 
+def _device_address(data: dict[str, Any]) -> tuple[str, int, int]:
+    """Ein Gerät ist host:port plus Unit-ID (mehrere Units hinter einem Gateway)."""
+    return (
+        data[CONF_HOST],
+        data.get(CONF_PORT, DEFAULT_PORT),
+        data.get(CONF_HOSTID, DEFAULT_HOSTID),
+    )
+
+
 @callback
 def ha_my_modbus_entries(hass: HomeAssistant):
-    """Return the hosts already configured."""
+    """Return the devices (host, port, unit ID) already configured."""
     return set(
-        entry.data[CONF_HOST] for entry in hass.config_entries.async_entries(DOMAIN)
+        _device_address(entry.data)
+        for entry in hass.config_entries.async_entries(DOMAIN)
     )
 
 
@@ -67,9 +109,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     CONNECTION_CLASS = config_entries.CONN_CLASS_LOCAL_POLL
 
-    def _host_in_configuration_exists(self, host) -> bool:
-        """Return True if host exists in configuration."""
-        if host in ha_my_modbus_entries(self.hass):
+    def _device_in_configuration_exists(self, user_input: dict[str, Any]) -> bool:
+        """Return True if host, port and unit ID exist in configuration."""
+        if _device_address(user_input) in ha_my_modbus_entries(self.hass):
             return True
         return False
 
@@ -78,14 +120,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            host = user_input[CONF_HOST]
-
-            if self._host_in_configuration_exists(host):
+            if self._device_in_configuration_exists(user_input):
                 errors[CONF_HOST] = "already_configured"
             elif not host_valid(user_input[CONF_HOST]):
                 errors[CONF_HOST] = "invalid host IP"
             else:
-                await self.async_set_unique_id(user_input[CONF_HOST])
+                # Ältere Entries haben nur den Host als unique_id, Duplikate erkennt
+                # die Prüfung oben über host, port und Unit-ID
+                await self.async_set_unique_id(
+                    "{}:{}:{}".format(*_device_address(user_input))
+                )
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
                     title=user_input[CONF_NAME], data=user_input
@@ -140,6 +184,54 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_HOSTID,
                         default=self.config_entry.data.get(CONF_HOSTID, DEFAULT_HOSTID),
                     ): int,
+                    vol.Optional(
+                        CONF_ADAPTIVE_SCAN,
+                        default=self.config_entry.data.get(
+                            CONF_ADAPTIVE_SCAN, DEFAULT_ADAPTIVE_SCAN
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_WRITE_SETTLE_MS,
+                        default=self.config_entry.data.get(
+                            CONF_WRITE_SETTLE_MS, DEFAULT_WRITE_SETTLE_MS
+                        ),
+                    ): vol.All(int, vol.Range(min=0, max=5000)),
+                    vol.Optional(
+                        CONF_TIMEOUT_MIN_MS,
+                        default=self.config_entry.data.get(
+                            CONF_TIMEOUT_MIN_MS, DEFAULT_TIMEOUT_MIN_MS
+                        ),
+                    ): vol.All(int, vol.Range(min=20, max=10000)),
+                    vol.Optional(
+                        CONF_TIMEOUT_MAX_MS,
+                        default=self.config_entry.data.get(
+                            CONF_TIMEOUT_MAX_MS, DEFAULT_TIMEOUT_MAX_MS
+                        ),
+                    ): vol.All(int, vol.Range(min=100, max=30000)),
+                    vol.Optional(
+                        CONF_PIPELINE_READS,
+                        default=self.config_entry.data.get(
+                            CONF_PIPELINE_READS, DEFAULT_PIPELINE_READS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_FLEET_MODE,
+                        default=self.config_entry.data.get(
+                            CONF_FLEET_MODE, DEFAULT_FLEET_MODE
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_OVERSAMPLING_WINDOW,
+                        default=self.config_entry.data.get(
+                            CONF_OVERSAMPLING_WINDOW, DEFAULT_OVERSAMPLING_WINDOW
+                        ),
+                    ): vol.All(int, vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_CHANGE_EVENTS,
+                        default=self.config_entry.data.get(
+                            CONF_CHANGE_EVENTS, DEFAULT_CHANGE_EVENTS
+                        ),
+                    ): bool,
                 }
             ),
         )
@@ -28,6 +28,7 @@ from homeassistant.const import (
     UnitOfEnergy,
     UnitOfPower,
     CONF_NAME,
+    EntityCategory,
     Platform,
 )
 
@@ -50,6 +51,112 @@ DEFAULT_HOSTID = 1
 CONF_HOSTID = "hostid"
 CONF_HUB = "hacomfoconnectpro_hub"
 ATTR_MANUFACTURER = "Zehnder"
+# Unchanged values are re-sent to the entities at least this often (seconds)
+DEFAULT_FORCED_REFRESH_INTERVAL = 300
+
+# Poll classes (key "POLL" in ENTITIES_DICT); NORMAL uses the configured scan interval
+C_POLL_FAST = "fast"
+C_POLL_NORMAL = "normal"
+C_POLL_SLOW = "slow"
+C_POLL_ONCE = "once"  # read on the first successful cycle only
+DEFAULT_POLL_FAST_INTERVAL = 5
+DEFAULT_POLL_SLOW_INTERVAL = 300
+
+# Adaptive scan interval: the effective interval grows while all values stay within
+# ADAPTIVE_DELTAS (per UNIT) and drops to the minimum on movement or after a write.
+CONF_ADAPTIVE_SCAN = "adaptive_scan"
+DEFAULT_ADAPTIVE_SCAN = False
+MIN_SCAN_INTERVAL = 5
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 120
+ADAPTIVE_INCREASE_FACTOR = 1.5
+ADAPTIVE_DELTAS: Dict[str, float] = {"°C": 0.3, "%": 2, "ppm": 50, "m³": 10}
+
+# Publish filter before state writes (keys DEADBAND / MIN_PUBLISH_INTERVAL in
+# ENTITIES_DICT and DIAGNOSTICS_DICT): changes smaller than the deadband against the
+# last published value are not published, and an entity is published at most every
+# MIN_PUBLISH_INTERVAL seconds (the latest value follows in a later cycle). Read-only
+# measurements without own values get the defaults of their UNIT.
+DEFAULT_DEADBANDS: Dict[str, float] = {"°C": 0.2, "%": 1, "ppm": 20, "g/m³": 0.2}
+DEFAULT_MIN_PUBLISH_INTERVALS: Dict[str, float] = {
+    "°C": 15,
+    "%": 15,
+    "ppm": 30,
+    "g/m³": 15,
+    "ms": 60,
+}
+
+# Oversampling: read-only measurements are collected in fixed-size ring buffers and
+# published once per window (s) as mean, with min/max/std as attributes. 0 = off.
+CONF_OVERSAMPLING_WINDOW = "oversampling_window"
+DEFAULT_OVERSAMPLING_WINDOW = 0
+OVERSAMPLING_CAPACITY = 120  # samples per entity and window, older ones are overwritten
+
+# Write coalescing for NUMBER/CLIMATE: values within the settle window (ms) after the
+# first one are collapsed, only the latest value is written.
+CONF_WRITE_SETTLE_MS = "write_settle_ms"
+DEFAULT_WRITE_SETTLE_MS = 300
+
+# Request timeouts (ms) are derived from the measured RTT per function code
+# (srtt + 4 * rttvar) within these bounds; retries fit into the upper bound.
+CONF_TIMEOUT_MIN_MS = "timeout_min_ms"
+CONF_TIMEOUT_MAX_MS = "timeout_max_ms"
+DEFAULT_TIMEOUT_MIN_MS = 200
+DEFAULT_TIMEOUT_MAX_MS = 3000
+DEFAULT_MAX_RETRIES = 3
+
+# Pipelined reads: all blocks of a cycle are sent back-to-back on one connection and
+# matched by transaction ID; falls back to serial reads for good if the gateway rejects it
+# (exception response, foreign transaction ID) or after PIPELINE_MAX_FAILURES consecutive
+# failed batches that serial reads could answer (timeouts, dropped sockets).
+CONF_PIPELINE_READS = "pipeline_reads"
+DEFAULT_PIPELINE_READS = False
+PIPELINE_MAX_FAILURES = 3
+DATA_PIPELINES = f"{DOMAIN}_pipelines"  # hass.data key of the shared PipelinePool
+
+# Fleet mode: hubs share one connection per host:port (unit IDs multiplexed over it) and
+# one scheduler that runs each hub on its own tick with staggered start times, at most
+# FLEET_MAX_CONCURRENT_CYCLES cycles running at the same time.
+CONF_FLEET_MODE = "fleet_mode"
+DEFAULT_FLEET_MODE = False
+FLEET_MAX_CONCURRENT_CYCLES = 4
+DATA_FLEET = f"{DOMAIN}_fleet"  # hass.data key of the shared FleetScheduler
+
+# Connection supervisor: after a failed cycle the circuit opens, reads are skipped for a
+# jittered exponential backoff (s) until a health-check probe succeeds.
+DEFAULT_BACKOFF_MIN = 5
+DEFAULT_BACKOFF_MAX = 300
+
+# Service "apply": several entity values in as few batched writes as possible
+SERVICE_APPLY = "apply"
+ATTR_HUB = "hub"
+ATTR_VALUES = "values"
+ATTR_FORCE = "force"
+# Per-key results of write_entity_values
+C_WRITE_WRITTEN = "written"  # written and confirmed by read-back
+C_WRITE_UNCHANGED = "unchanged"  # value already set, write skipped
+C_WRITE_UNCONFIRMED = "unconfirmed"  # written, confirmed only by the following refresh
+
+# Error events: fired once per code when it becomes active / is no longer active
+# (see C_ACTIVE_ERRORS), with the hub name, the code and its ERROR_DICT description
+EVENT_ERROR_RAISED = f"{DOMAIN}_error_raised"
+EVENT_ERROR_CLEARED = f"{DOMAIN}_error_cleared"
+ATTR_CODE = "code"
+ATTR_DESCRIPTION = "description"
+
+# Change stream: per cycle one event with the changed keys of the hub data (old value,
+# new value, raw words), diagnostics excluded. Off by default, the event is recorded.
+CONF_CHANGE_EVENTS = "change_events"
+DEFAULT_CHANGE_EVENTS = False
+EVENT_CHANGES = f"{DOMAIN}_changes"
+ATTR_CHANGES = "changes"
+
+# Poll scheduler: a cycle must finish within CYCLE_DEADLINE_FACTOR * tick, otherwise its
+# outstanding requests are cancelled. Ticks arriving while a cycle runs are skipped; the
+# poll classes that became due are merged into the next cycle. An overrun keeps the
+# connection; only MAX_CONSECUTIVE_OVERRUNS overruns in a row count as a device failure.
+CYCLE_DEADLINE_FACTOR = 0.9
+MAX_CONSECUTIVE_OVERRUNS = 3
+CYCLE_STATS_WINDOW = 100  # number of cycle durations used for the percentiles
 
 
 
@@ -292,6 +399,9 @@ C_COMFOCOOL = "comfocool"
 #    INC: 1, if entity provides continuously increasing values.
 #    SWITCH: Values for "off" and optionally for "on". If "on" is not specified, all other integer values are valid for "on"
 #    PF: Override display variant in HA. "PF":Platform.NUMBER v=> Temperature value is treated as NUMBER instead of CLIMATE.
+#    POLL: Poll class C_POLL_FAST / C_POLL_NORMAL (default) / C_POLL_SLOW / C_POLL_ONCE
+#    DEADBAND: Smallest change that is published (default per UNIT: DEFAULT_DEADBANDS)
+#    MIN_PUBLISH_INTERVAL: Minimum seconds between two state writes (default per UNIT: DEFAULT_MIN_PUBLISH_INTERVALS)
 #
 #    *: Mandatory value
 # --------------------------------------------------------------------------------------------
@@ -308,6 +418,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 0,
         "NAME": "Connection State",
+        "POLL": C_POLL_SLOW,
         "VALUES": {
             0: "ok",
             30: "the detected ventilation unit is not a CAQ",
@@ -362,6 +473,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 7,
         "NAME": "Room Air Temperature",
+        "POLL": C_POLL_FAST,
         "FAKTOR": 0.1,
         "UNIT": "°C",
         "DT": C_DT_INT16,
@@ -370,6 +482,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 8,
         "NAME": "Extract Air Temperature",
+        "POLL": C_POLL_FAST,
         "FAKTOR": 0.1,
         "UNIT": "°C",
         "DT": C_DT_INT16,
@@ -378,6 +491,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 9,
         "NAME": "Exhaust Air Temperature",
+        "POLL": C_POLL_FAST,
         "FAKTOR": 0.1,
         "UNIT": "°C",
         "DT": C_DT_INT16,
@@ -386,6 +500,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 10,
         "NAME": "Outdoor Air Temperature",
+        "POLL": C_POLL_FAST,
         "FAKTOR": 0.1,
         "UNIT": "°C",
         "DT": C_DT_INT16,
@@ -394,6 +509,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 11,
         "NAME": "Supply Air Temperature",
+        "POLL": C_POLL_FAST,
         "FAKTOR": 0.1,
         "UNIT": "°C",
         "DT": C_DT_INT16,
@@ -437,6 +553,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 17,
         "NAME": "CO2 Sensor Zone 1",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -444,6 +561,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 18,
         "NAME": "CO2 Sensor Zone 2",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -451,6 +569,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 19,
         "NAME": "CO2 Sensor Zone 3",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -458,6 +577,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 20,
         "NAME": "CO2 Sensor Zone 4",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -465,6 +585,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 21,
         "NAME": "CO2 Sensor Zone 5",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -472,6 +593,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 22,
         "NAME": "CO2 Sensor Zone 6",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -479,6 +601,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 23,
         "NAME": "CO2 Sensor Zone 7",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -486,6 +609,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 24,
         "NAME": "CO2 Sensor Zone 8",
+        "POLL": C_POLL_FAST,
         "UNIT": "ppm",
         "DT": C_DT_UINT16,
     },
@@ -493,6 +617,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_INPUT_REGISTERS,
         "REG": 25,
         "NAME": "Filter replacement in",
+        "POLL": C_POLL_SLOW,
         "UNIT": "d",
         "DT": C_DT_UINT16,
     },
@@ -505,11 +630,12 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "REG": 3,
         "NAME": "Change filter",
     },
-    # HOLDING_REGISTERS
+    # HOLDING_REGISTERS (can be changed on the wall panel at any time -> NORMAL)
     C_VENTILATION_PRESET: {
         "RT": C_REG_TYPE_HOLDING_REGISTERS,
         "REG": 0,
         "NAME": "Ventilation Level",
+        "POLL": C_POLL_NORMAL,
         "DT": C_DT_UINT16,  # byte -> in 16 Bit Register
         "VALUES": {
             0: "Away",
@@ -523,6 +649,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_HOLDING_REGISTERS,
         "REG": 1,
         "NAME": "Temperature Profile",
+        "POLL": C_POLL_NORMAL,
         "DT": C_DT_UINT16,  # byte -> in 16 Bit Register
         "VALUES": {0: "Comfort", 1: "Eco", 2: "Warm", "default": 0},
         # Note: only works in mode 0 or 1
@@ -531,6 +658,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_HOLDING_REGISTERS,
         "REG": 2,
         "NAME": "Temperature Profile Mode",
+        "POLL": C_POLL_NORMAL,
         "DT": C_DT_UINT16,  # byte -> in 16 Bit Register
         "VALUES": {0: "Adaptive", 1: "Fixed", 2: "according to ext. setpoint", "default": 0},
     },
@@ -538,6 +666,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_HOLDING_REGISTERS,
         "REG": 3,
         "NAME": "External Setpoint",
+        "POLL": C_POLL_NORMAL,
         "FAKTOR": 0.1,
         "MIN": 5.0,
         "MAX": 35.0,
@@ -549,6 +678,7 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
         "RT": C_REG_TYPE_HOLDING_REGISTERS,
         "REG": 4,
         "NAME": "Boost Time [min.]",
+        "POLL": C_POLL_NORMAL,
         "FAKTOR": 0.016666666667,  # Seconds: 1.0, register contains seconds, conversion to minutes
         "UNIT": "min",
         "STEP": 1,  # Seconds: 60,
@@ -588,6 +718,108 @@ ENTITIES_DICT: Dict[str, Dict[str, Any]] = {
 }
 
 
+# --------------------------------------------------------------------------------------------
+# 3) DIAGNOSTICS_DICT: values are provided by the hub itself (no Modbus register).
+#    Same keys as ENTITIES_DICT where applicable (NAME, UNIT, INC).
+# --------------------------------------------------------------------------------------------
+C_DIAG_STATE_WRITES = "diag_state_writes"
+C_DIAG_SUPPRESSED_STATE_WRITES = "diag_suppressed_state_writes"
+C_DIAG_SCAN_INTERVAL = "diag_scan_interval"
+C_DIAG_CYCLE_OVERRUNS = "diag_cycle_overruns"
+C_DIAG_SKIPPED_TICKS = "diag_skipped_ticks"
+C_DIAG_CYCLE_P50 = "diag_cycle_duration_p50"
+C_DIAG_CYCLE_P95 = "diag_cycle_duration_p95"
+C_DIAG_IO_QUEUE_DEPTH = "diag_io_queue_depth"
+C_DIAG_WRITE_WAIT = "diag_write_wait_p95"
+C_DIAG_READ_WAIT = "diag_read_wait_p95"
+C_DIAG_IO_SERVICE = "diag_io_service_p50"
+C_DIAG_COALESCED_WRITES = "diag_coalesced_writes"
+C_DIAG_SUPPRESSED_WRITES = "diag_suppressed_writes"
+C_DIAG_CONNECTION_FAILURES = "diag_connection_failures"
+C_DIAG_RTT = "diag_rtt"
+C_DIAG_REQUEST_TIMEOUT = "diag_request_timeout"
+C_DIAG_FILTERED_STATE_WRITES = "diag_filtered_state_writes"
+
+DIAGNOSTICS_DICT: Dict[str, Dict[str, Any]] = {
+    # The state write counters change every cycle
+    C_DIAG_STATE_WRITES: {"NAME": "State writes", "INC": 1, "MIN_PUBLISH_INTERVAL": 60},
+    C_DIAG_SUPPRESSED_STATE_WRITES: {
+        "NAME": "Suppressed state writes",
+        "INC": 1,
+        "MIN_PUBLISH_INTERVAL": 60,
+    },
+    C_DIAG_FILTERED_STATE_WRITES: {
+        "NAME": "Filtered state writes",
+        "INC": 1,
+        "MIN_PUBLISH_INTERVAL": 60,
+    },
+    C_DIAG_SCAN_INTERVAL: {"NAME": "Effective scan interval", "UNIT": "s"},
+    C_DIAG_CYCLE_OVERRUNS: {"NAME": "Poll cycle overruns", "INC": 1},
+    C_DIAG_SKIPPED_TICKS: {"NAME": "Skipped poll ticks", "INC": 1},
+    C_DIAG_CYCLE_P50: {"NAME": "Poll cycle duration p50", "UNIT": "ms"},
+    C_DIAG_CYCLE_P95: {"NAME": "Poll cycle duration p95", "UNIT": "ms"},
+    C_DIAG_IO_QUEUE_DEPTH: {"NAME": "I/O queue peak depth"},
+    C_DIAG_WRITE_WAIT: {"NAME": "Write queue wait p95", "UNIT": "ms"},
+    C_DIAG_READ_WAIT: {"NAME": "Read queue wait p95", "UNIT": "ms"},
+    C_DIAG_IO_SERVICE: {"NAME": "Modbus request time p50", "UNIT": "ms"},
+    C_DIAG_COALESCED_WRITES: {"NAME": "Coalesced writes", "INC": 1},
+    C_DIAG_SUPPRESSED_WRITES: {"NAME": "Suppressed Modbus writes", "INC": 1},
+    C_DIAG_CONNECTION_FAILURES: {"NAME": "Connection failures", "INC": 1},
+    C_DIAG_RTT: {"NAME": "Modbus RTT (smoothed)", "UNIT": "ms"},
+    C_DIAG_REQUEST_TIMEOUT: {"NAME": "Modbus request timeout", "UNIT": "ms"},
+}
+
+
+# --------------------------------------------------------------------------------------------
+# 4) DERIVED_DICT: values computed by the hub from the decoded values of the same cycle
+#    (no Modbus register). Same keys as ENTITIES_DICT where applicable (NAME, UNIT,
+#    DEADBAND, MIN_PUBLISH_INTERVAL). Inputs: HUMIDITY_PAIRS, HEAT_RECOVERY_INPUTS and
+#    ACTIVE_ERROR_KEYS.
+# --------------------------------------------------------------------------------------------
+C_HEAT_RECOVERY_EFFICIENCY = "heat_recovery_efficiency"
+C_ROOM_ABSOLUTE_HUMIDITY = "room_absolute_humidity"
+C_EXTRACT_ABSOLUTE_HUMIDITY = "extract_absolute_humidity"
+C_EXHAUST_ABSOLUTE_HUMIDITY = "exhaust_absolute_humidity"
+C_OUTDOOR_ABSOLUTE_HUMIDITY = "outdoor_absolute_humidity"
+C_SUPPLY_ABSOLUTE_HUMIDITY = "supply_absolute_humidity"
+C_ROOM_DEW_POINT = "room_dew_point"
+C_EXTRACT_DEW_POINT = "extract_dew_point"
+C_EXHAUST_DEW_POINT = "exhaust_dew_point"
+C_OUTDOOR_DEW_POINT = "outdoor_dew_point"
+C_SUPPLY_DEW_POINT = "supply_dew_point"
+C_ACTIVE_ERRORS = "active_errors"
+
+# (temperature, relative humidity) -> (absolute humidity, dew point)
+HUMIDITY_PAIRS: list[tuple[str, str, str, str]] = [
+    (C_ROOM_TEMPERATURE, C_ROOM_HUMIDITY, C_ROOM_ABSOLUTE_HUMIDITY, C_ROOM_DEW_POINT),
+    (C_EXTRACT_TEMPERATURE, C_EXTRACT_HUMIDITY, C_EXTRACT_ABSOLUTE_HUMIDITY, C_EXTRACT_DEW_POINT),
+    (C_EXHAUST_TEMPERATURE, C_EXHAUST_HUMIDITY, C_EXHAUST_ABSOLUTE_HUMIDITY, C_EXHAUST_DEW_POINT),
+    (C_OUTDOOR_TEMPERATURE, C_OUTDOOR_HUMIDITY, C_OUTDOOR_ABSOLUTE_HUMIDITY, C_OUTDOOR_DEW_POINT),
+    (C_SUPPLY_TEMPERATURE, C_SUPPLY_HUMIDITY, C_SUPPLY_ABSOLUTE_HUMIDITY, C_SUPPLY_DEW_POINT),
+]
+# Supply-side temperature ratio (supply - outdoor) / (extract - outdoor)
+HEAT_RECOVERY_INPUTS = (C_OUTDOOR_TEMPERATURE, C_SUPPLY_TEMPERATURE, C_EXTRACT_TEMPERATURE)
+# Below this extract/outdoor difference (K) the efficiency is not meaningful (None)
+HEAT_RECOVERY_MIN_DELTA = 3.0
+# Raw codes of these registers form the active error set (state: number of active errors)
+ACTIVE_ERROR_KEYS = (C_ACTIVEERROR1, C_ACTIVEERROR2, C_ACTIVEERROR3, C_ACTIVEERROR4, C_ACTIVEERROR5)
+
+DERIVED_DICT: Dict[str, Dict[str, Any]] = {
+    C_HEAT_RECOVERY_EFFICIENCY: {"NAME": "Heat Recovery Efficiency", "UNIT": "%"},
+    C_ROOM_ABSOLUTE_HUMIDITY: {"NAME": "Room Air Absolute Humidity", "UNIT": "g/m³"},
+    C_EXTRACT_ABSOLUTE_HUMIDITY: {"NAME": "Extract Air Absolute Humidity", "UNIT": "g/m³"},
+    C_EXHAUST_ABSOLUTE_HUMIDITY: {"NAME": "Exhaust Air Absolute Humidity", "UNIT": "g/m³"},
+    C_OUTDOOR_ABSOLUTE_HUMIDITY: {"NAME": "Outdoor Air Absolute Humidity", "UNIT": "g/m³"},
+    C_SUPPLY_ABSOLUTE_HUMIDITY: {"NAME": "Supply Air Absolute Humidity", "UNIT": "g/m³"},
+    C_ROOM_DEW_POINT: {"NAME": "Room Air Dew Point", "UNIT": "°C"},
+    C_EXTRACT_DEW_POINT: {"NAME": "Extract Air Dew Point", "UNIT": "°C"},
+    C_EXHAUST_DEW_POINT: {"NAME": "Exhaust Air Dew Point", "UNIT": "°C"},
+    C_OUTDOOR_DEW_POINT: {"NAME": "Outdoor Air Dew Point", "UNIT": "°C"},
+    C_SUPPLY_DEW_POINT: {"NAME": "Supply Air Dew Point", "UNIT": "°C"},
+    C_ACTIVE_ERRORS: {"NAME": "Active Errors"},
+}
+
+
 # ------------------------------------------------------------
 # Class definitions for the different entity types
 # ------------------------------------------------------------
@@ -646,6 +878,8 @@ SELECT_TYPES: dict[str, MySelectEntityDescription] = {}
 CLIMATE_TYPES: dict[str, MyClimateEntityDescription] = {}
 NUMBER_TYPES: dict[str, MyNumberEntityDescription] = {}
 BINARY_TYPES: dict[str, MyBinaryEntityDescription] = {}
+DIAGNOSTIC_TYPES: dict[str, MySensorEntityDescription] = {}
+DERIVED_TYPES: dict[str, MySensorEntityDescription] = {}
 
 
 # --------------------------------------------------------------------
@@ -730,6 +964,35 @@ def get_entity_hvac_modes(
     return props.get("HVAC_MODES") or default
 
 
+def get_entity_poll(props: Dict[str, Any]) -> str:
+    return props.get("POLL", C_POLL_NORMAL)
+
+
+def get_entity_deadband(props: Dict[str, Any]) -> float:
+    return props.get("DEADBAND", _publish_default(props, DEFAULT_DEADBANDS))
+
+
+def get_entity_min_publish_interval(props: Dict[str, Any]) -> float:
+    return props.get(
+        "MIN_PUBLISH_INTERVAL", _publish_default(props, DEFAULT_MIN_PUBLISH_INTERVALS)
+    )
+
+
+def _publish_default(props: Dict[str, Any], defaults: Dict[str, float]) -> float:
+    """Unit default for read-only measurements; writable values are published at once."""
+    if not is_entity_measurement(props):
+        return 0
+    return defaults.get(get_entity_unit(props), 0)
+
+
+def is_entity_measurement(props: Dict[str, Any]) -> bool:
+    """Read-only numeric value with state class MEASUREMENT (see _unit_mapping)."""
+    if is_entity_readwrite(props) or is_entity_switch(props) or is_entity_select(props):
+        return False
+    _unit, _device_class, state_class = _unit_mapping(get_entity_unit(props))
+    return state_class == SensorStateClass.MEASUREMENT
+
+
 def get_entity_switch(props: Dict[str, Any]) -> dict[str, int] | None:
     return props.get("SWITCH")
 
@@ -758,6 +1021,13 @@ def get_entity_reg(
     return props.get("REG"), dt
 
 
+def get_register_count(dt: ModbusTcpClient.DATATYPE) -> int:
+    """Number of registers (or bits for BITS) occupied by the data type."""
+    if dt == ModbusTcpClient.DATATYPE.BITS:
+        return 1
+    return dt.value[1]
+
+
 def get_entity_props(entity: str) -> dict:
     return ENTITIES_DICT[entity]
 
@@ -786,11 +1056,7 @@ def _classify_register(props: Dict[str, Any]) -> int | None:
     reg_from, dt = get_entity_reg(props)
     if reg_from is None or dt is None:
         return None
-    if dt == ModbusTcpClient.DATATYPE.BITS:
-        sizeofdt = 1
-    else:
-        sizeofdt = dt.value[1]
-    reg_to = reg_from + sizeofdt - 1
+    reg_to = reg_from + get_register_count(dt) - 1
 
     match reg_type:
         case thismodule.C_REG_TYPE_DISCRETE_INPUTS:
@@ -904,6 +1170,8 @@ def _unit_mapping(
         return "min", SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT
     if u.lower() in {"s", "sek", "sec"}:
         return "s", SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT
+    if u.lower() in {"ms"}:
+        return "ms", SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT
 
     # Remaining duration
     if u.lower() in {"d", "days"}:
@@ -924,7 +1192,9 @@ def init():
         SELECT_TYPES, \
         CLIMATE_TYPES, \
         NUMBER_TYPES, \
-        BINARY_TYPES
+        BINARY_TYPES, \
+        DIAGNOSTIC_TYPES, \
+        DERIVED_TYPES
     if _initialized:
         return
     _LOGGER.info(
@@ -937,6 +1207,8 @@ def init():
     thismodule.CLIMATE_TYPES = {}
     thismodule.NUMBER_TYPES = {}
     thismodule.BINARY_TYPES = {}
+    thismodule.DIAGNOSTIC_TYPES = {}
+    thismodule.DERIVED_TYPES = {}
 
     for c_key, props in ENTITIES_DICT.items():
         entity_key: str = c_key
@@ -1030,6 +1302,29 @@ def init():
                 _LOGGER.warning(f"Unknown entity type {entity_key}: {props}")
                 print(f"Sensor could not be assigned: {entity_key}/{name}")
 
+    for entity_key, props in DIAGNOSTICS_DICT.items():
+        unit, device_class, state_class = _unit_mapping(get_entity_unit(props))
+        if props.get("INC"):
+            state_class = SensorStateClass.TOTAL_INCREASING
+        DIAGNOSTIC_TYPES[entity_key] = MySensorEntityDescription(
+            name=get_entity_name(props, entity_key),
+            key=entity_key,
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=state_class or SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+
+    for entity_key, props in DERIVED_DICT.items():
+        unit, device_class, state_class = _unit_mapping(get_entity_unit(props))
+        DERIVED_TYPES[entity_key] = MySensorEntityDescription(
+            name=get_entity_name(props, entity_key),
+            key=entity_key,
+            native_unit_of_measurement=unit,
+            device_class=device_class,
+            state_class=state_class,
+        )
+
     _initialized = True
     _LOGGER.debug(
         f"Status registers (r/o) from {C_MIN_INPUT_REGISTER} to {C_MAX_INPUT_REGISTER}"
@@ -1047,6 +1342,8 @@ def init():
     _LOGGER.debug(f"- {len(BINARY_TYPES)} Switches")
     _LOGGER.debug(f"- {len(CLIMATE_TYPES)} Temperature Setpoints")
     _LOGGER.debug(f"- {len(NUMBER_TYPES)} Numerical Setpoints")
+    _LOGGER.debug(f"- {len(DIAGNOSTIC_TYPES)} Diagnostic Sensors")
+    _LOGGER.debug(f"- {len(DERIVED_TYPES)} Derived Sensors")
     _LOGGER.info(
         "****************************************  initalized ****************************************"
     )
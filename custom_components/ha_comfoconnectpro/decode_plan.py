@@ -0,0 +1,221 @@
+"""Kompilierter Dekodierplan: Leseplan + ENTITIES_DICT -> flache Slot-Tabelle je Block."""
+
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+from pymodbus.client import ModbusTcpClient
+
+from .const import (
+    get_entity_factor,
+    get_entity_max,
+    get_entity_min,
+    get_entity_reg,
+    get_entity_select,
+    get_entity_switch,
+    get_register_count,
+    is_entity_climate,
+    is_entity_readonly,
+    is_entity_select,
+    is_entity_switch,
+)
+from .read_plan import ReadBlock
+
+# Dekodierarten (entsprechen MyModbusHub._decode_*)
+KIND_NUMERIC = 0
+KIND_SWITCH = 1
+KIND_SELECT = 2
+KIND_CLIMATE = 3
+
+# Sentinel für 'ungültig' bei numerischen Werten
+INVALID_RAW = -500
+
+
+@dataclass(frozen=True)
+class DecodeSlot:
+    """Eine Entität im kompilierten Plan."""
+
+    key: str
+    buffer_id: int  # Index des Blocks im Leseplan
+    offset: int  # Offset im Block (Register bzw. Bits)
+    fmt: str  # struct-Format ('h', 'H', 'i', 'I') bzw. '?' für Bits
+    size: int  # Anzahl Register bzw. Bits
+    factor: float
+    kind: int
+    # SWITCH: Rohwert für "off"; SELECT: VALUES-Dict; CLIMATE: (MIN, MAX)
+    mapping: Any = None
+
+
+@dataclass(frozen=True)
+class BlockDecoder:
+    """Slots eines Blocks mit vorkompiliertem struct für einen unpack_from-Durchlauf."""
+
+    block: ReadBlock
+    is_bits: bool
+    pack: struct.Struct | None  # Register-Wörter -> Bytes
+    unpack: struct.Struct | None  # alle nicht überlappenden Slots in einem Durchlauf
+    slots: Tuple[DecodeSlot, ...]  # Reihenfolge = Reihenfolge in unpack
+    # Slots, die sich mit anderen überlappen, werden einzeln gelesen
+    extra: Tuple[Tuple[DecodeSlot, struct.Struct], ...] = ()
+
+
+def _decoder_kind(props: Dict[str, Any]) -> Tuple[int, Any]:
+    """Klassifizierung: Switch vor Select vor beschreibbarem Climate, sonst numerisch."""
+    if is_entity_switch(props):
+        return KIND_SWITCH, (get_entity_switch(props) or {}).get("off", 0)
+    if is_entity_select(props):
+        return KIND_SELECT, get_entity_select(props) or {}
+    if is_entity_climate(props) and not is_entity_readonly(props):
+        return KIND_CLIMATE, (get_entity_min(props), get_entity_max(props))
+    return KIND_NUMERIC, None
+
+
+def _compile_block(
+    buffer_id: int, block: ReadBlock, entities: Dict[str, Dict[str, Any]]
+) -> BlockDecoder:
+    slots: List[DecodeSlot] = []
+    for key in block.keys:
+        props = entities[key]
+        reg, dt = get_entity_reg(props)
+        kind, mapping = _decoder_kind(props)
+        fmt = "?" if dt == ModbusTcpClient.DATATYPE.BITS else dt.value[0]
+        slots.append(
+            DecodeSlot(
+                key=key,
+                buffer_id=buffer_id,
+                offset=reg - block.address,
+                fmt=fmt,
+                size=get_register_count(dt),
+                factor=get_entity_factor(props) or 1.0,
+                kind=kind,
+                mapping=mapping,
+            )
+        )
+    slots.sort(key=lambda s: s.offset)
+
+    if slots and slots[0].fmt == "?":
+        return BlockDecoder(
+            block=block, is_bits=True, pack=None, unpack=None, slots=tuple(slots)
+        )
+
+    # Format mit Füllbytes ('x') für Lücken; überlappende Slots separat
+    fmt = ">"
+    pos = 0  # aktuelle Position in Registern
+    main: List[DecodeSlot] = []
+    extra: List[Tuple[DecodeSlot, struct.Struct]] = []
+    for slot in slots:
+        if slot.offset < pos:
+            extra.append((slot, struct.Struct(">" + slot.fmt)))
+            continue
+        if slot.offset > pos:
+            fmt += f"{(slot.offset - pos) * 2}x"
+        fmt += slot.fmt
+        pos = slot.offset + slot.size
+        main.append(slot)
+
+    return BlockDecoder(
+        block=block,
+        is_bits=False,
+        pack=struct.Struct(f">{block.count}H"),
+        unpack=struct.Struct(fmt),
+        slots=tuple(main),
+        extra=tuple(extra),
+    )
+
+
+def decode_raw(slot: DecodeSlot, raw: int | bool) -> Any:
+    """Rohwert -> HA-Wert gemäß Dekodierart des Slots."""
+    kind = slot.kind
+    if kind == KIND_SWITCH:
+        return "off" if raw == slot.mapping else "on"
+    if kind == KIND_SELECT:
+        return slot.mapping.get(raw, f"Ungültiger Wert: {raw}")
+    if raw == INVALID_RAW:
+        value = None
+    else:
+        value = float(raw * slot.factor)
+    if kind == KIND_CLIMATE:
+        return {
+            "temperature": value,
+            "target_temp_low": slot.mapping[0],
+            "target_temp_high": slot.mapping[1],
+        }
+    return value
+
+
+class DecodePlan:
+    """Einmal beim Laden kompilierte Dekodiertabelle für alle Blöcke eines Leseplans."""
+
+    def __init__(
+        self, read_plan: List[ReadBlock], entities: Dict[str, Dict[str, Any]]
+    ) -> None:
+        self.blocks: Tuple[BlockDecoder, ...] = tuple(
+            _compile_block(buffer_id, block, entities)
+            for buffer_id, block in enumerate(read_plan)
+        )
+        # Key -> (Slot, absolute Adresse) für Teil-Lesezugriffe (Read-back nach Schreiben)
+        self._by_key: Dict[str, Tuple[DecodeSlot, int]] = {
+            slot.key: (slot, decoder.block.address + slot.offset)
+            for decoder in self.blocks
+            for slot in (*decoder.slots, *(s for s, _ in decoder.extra))
+        }
+
+    @property
+    def slots(self) -> List[DecodeSlot]:
+        return [
+            slot
+            for decoder in self.blocks
+            for slot in (*decoder.slots, *(s for s, _ in decoder.extra))
+        ]
+
+    def decode_block(
+        self, buffer_id: int, values: List[int | bool], out: Dict[str, Any]
+    ) -> None:
+        """Dekodiert alle Slots eines Blocks und schreibt die Werte nach out."""
+        decoder = self.blocks[buffer_id]
+        if decoder.is_bits:
+            for slot in decoder.slots:
+                out[slot.key] = decode_raw(slot, values[slot.offset])
+            return
+
+        if len(values) < decoder.block.count:
+            raise ValueError(
+                f"Puffer hat nur {len(values)} Elemente, erwartet {decoder.block.count}!!"
+            )
+        packed = decoder.pack.pack(*values[: decoder.block.count])
+        for slot, raw in zip(decoder.slots, decoder.unpack.unpack_from(packed)):
+            out[slot.key] = decode_raw(slot, raw)
+        for slot, single in decoder.extra:
+            out[slot.key] = decode_raw(slot, single.unpack_from(packed, slot.offset * 2)[0])
+
+    def decode_range(
+        self,
+        keys: Iterable[str],
+        address: int,
+        values: List[int | bool],
+        out: Dict[str, Any],
+    ) -> List[str]:
+        """
+        Dekodiert einzelne Keys aus einem beliebigen Lesebereich ab address.
+        Gibt die Keys zurück, die vollständig im Bereich lagen.
+        """
+        decoded: List[str] = []
+        packed: bytes | None = None
+        for key in keys:
+            slot, slot_address = self._by_key.get(key, (None, None))
+            if slot is None:
+                continue
+            offset = slot_address - address
+            if offset < 0 or offset + slot.size > len(values):
+                continue
+            if slot.fmt == "?":
+                raw = values[offset]
+            else:
+                if packed is None:
+                    packed = struct.pack(f">{len(values)}H", *values)
+                raw = struct.unpack_from(">" + slot.fmt, packed, offset * 2)[0]
+            out[key] = decode_raw(slot, raw)
+            decoded.append(key)
+        return decoded
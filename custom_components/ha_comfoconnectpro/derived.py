@@ -0,0 +1,80 @@
+"""Abgeleitete Werte (DERIVED_DICT): Wärmerückgewinnung, absolute Feuchte und Taupunkt."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Magnus-Formel über Wasser (Sonntag 1990), T in °C
+_MAGNUS_B = 17.62
+_MAGNUS_C = 243.12
+_MAGNUS_E0 = 6.112  # Sättigungsdampfdruck bei 0 °C in hPa
+# 100 * M_Wasser / R in g·K/(hPa·m³): ρ = 216.7 * e / T
+_ABS_HUMIDITY_FACTOR = 216.7
+_KELVIN = 273.15
+_DIGITS = 1
+
+
+def _to_array(data: Dict[str, Any], keys: Iterable[str]) -> np.ndarray:
+    """Werte als float-Array, fehlende bzw. nicht numerische Werte als NaN."""
+    return np.array(
+        [
+            value if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+            for value in (data.get(key) for key in keys)
+        ],
+        dtype=float,
+    )
+
+
+def _publish(data: Dict[str, Any], keys: List[str], values: np.ndarray) -> None:
+    """Gerundet in data übernehmen; NaN (Eingang fehlt, nicht definiert) wird None."""
+    for key, value in zip(keys, values.round(_DIGITS).tolist()):
+        data[key] = None if math.isnan(value) else value
+
+
+class DerivedValues:
+    """
+    Berechnet alle abgeleiteten Werte aus den dekodierten Werten eines Zyklus in einem
+    vektorisierten Durchlauf (keine zusätzlichen Modbus-Zugriffe). Die Ergebnisse stehen
+    wie dekodierte Werte in data und laufen durch denselben Änderungs-Dispatch.
+    """
+
+    def __init__(
+        self,
+        humidity_pairs: Iterable[Tuple[str, str, str, str]],
+        heat_recovery: Tuple[str, str, str],
+        heat_recovery_key: str,
+        heat_recovery_min_delta: float,
+    ) -> None:
+        temperatures, humidities, absolute, dew_points = zip(*humidity_pairs)
+        self._temperatures = list(temperatures)
+        self._humidities = list(humidities)
+        self._absolute = list(absolute)
+        self._dew_points = list(dew_points)
+        self._heat_recovery = list(heat_recovery)
+        self._heat_recovery_key = heat_recovery_key
+        self._min_delta = heat_recovery_min_delta
+        self.inputs = {*self._temperatures, *self._humidities, *self._heat_recovery}
+
+    def compute(self, data: Dict[str, Any]) -> None:
+        """Alle abgeleiteten Werte aus data berechnen und in data schreiben."""
+        t = _to_array(data, self._temperatures)
+        rh = _to_array(data, self._humidities)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            magnus = _MAGNUS_B * t / (_MAGNUS_C + t)
+            # Relative Feuchte 0 % hat keinen Taupunkt (log(0)) -> NaN
+            gamma = np.log(np.where(rh > 0, rh, np.nan) / 100) + magnus
+            dew_point = _MAGNUS_C * gamma / (_MAGNUS_B - gamma)
+            vapour_pressure = rh / 100 * _MAGNUS_E0 * np.exp(magnus)
+            absolute = _ABS_HUMIDITY_FACTOR * vapour_pressure / (_KELVIN + t)
+        _publish(data, self._absolute, absolute)
+        _publish(data, self._dew_points, dew_point)
+
+        outdoor, supply, extract = _to_array(data, self._heat_recovery)
+        delta = extract - outdoor
+        efficiency = (
+            (supply - outdoor) / delta * 100 if abs(delta) >= self._min_delta else math.nan
+        )
+        _publish(data, [self._heat_recovery_key], np.array([efficiency]))
@@ -45,10 +45,21 @@ class HubBackedEntity(Entity):
         self._attr_suggested_object_id = base
 
     async def async_added_to_hass(self) -> None:
-        self._hub.async_add_my_modbus_sensor(self._on_hub_update)
+        key = self.entity_description.key
+        self._hub.async_add_my_modbus_sensor(key, self._on_hub_update)
+        # Der Hub meldet nur Änderungen -> vorhandene Daten sofort übernehmen
+        if key in self._hub.data:
+            self._on_hub_update()
 
     async def async_will_remove_from_hass(self) -> None:
-        self._hub.async_remove_my_modbus_sensor(self._on_hub_update)
+        self._hub.async_remove_my_modbus_sensor(
+            self.entity_description.key, self._on_hub_update
+        )
+
+    @property
+    def available(self) -> bool:
+        """Unavailable, solange der Hub das Gerät nicht erreicht (Diagnosewerte ausgenommen)."""
+        return self._hub.is_available(self.entity_description.key)
 
     @callback
     def _on_hub_update(self) -> None:
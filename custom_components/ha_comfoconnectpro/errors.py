@@ -0,0 +1,76 @@
+"""Aktive Fehler: Rohcodes der Fehlerregister als Bitset, Übergänge für Events."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .decode_plan import DecodePlan
+
+
+def error_codes(bits: int) -> List[int]:
+    """Gesetzte Bits eines Bitsets als aufsteigende Liste von Fehlercodes."""
+    return [code for code in range(bits.bit_length()) if bits >> code & 1]
+
+
+class ActiveErrors:
+    """
+    Liest die Rohcodes der Fehlerregister (activeerror1..5) direkt aus den Lesepuffern,
+    ohne Umweg über die Klartexte aus ERROR_DICT, und hält die aktiven Codes als Bitset
+    (Bit n gesetzt = Code n aktiv; Code 0 bedeutet "kein Fehler" und wird nicht gesetzt).
+    Die Reihenfolge der Register spielt keine Rolle: wandert ein Fehler von Register 2
+    nach Register 1, ändert sich das Bitset nicht. Der erste Lesevorgang (Start, Reload)
+    übernimmt die bereits aktiven Fehler ohne Übergänge.
+    """
+
+    def __init__(
+        self, decode_plan: DecodePlan, keys: Iterable[str], descriptions: Dict[int, str]
+    ) -> None:
+        keys = set(keys)
+        # buffer_id -> [(Index in _codes, Offset im Block)]
+        self._positions: Dict[int, List[Tuple[int, int]]] = {}
+        index = 0
+        for slot in decode_plan.slots:
+            if slot.key in keys:
+                self._positions.setdefault(slot.buffer_id, []).append((index, slot.offset))
+                index += 1
+        self._codes = [0] * index
+        self._descriptions = descriptions
+        self.bits = 0
+        self._primed = False
+
+    def update(self, buffers: Iterable[Tuple[int, List[int]]]) -> Tuple[int, int] | None:
+        """
+        Rohcodes aus den gelesenen Blöcken übernehmen. Gibt (neu aktiv, behoben) als
+        Bitsets zurück, None wenn kein Fehlerregister gelesen wurde; beim ersten Lesen
+        (0, 0).
+        """
+        read = False
+        for buffer_id, buf in buffers:
+            for index, offset in self._positions.get(buffer_id, ()):
+                self._codes[index] = buf[offset]
+                read = True
+        if not read:
+            return None
+        bits = 0
+        for code in self._codes:
+            if code:
+                bits |= 1 << code
+        if not self._primed:
+            self._primed = True
+            self.bits = bits
+            return 0, 0
+        raised, cleared = bits & ~self.bits, self.bits & ~bits
+        self.bits = bits
+        return raised, cleared
+
+    @property
+    def count(self) -> int:
+        return self.bits.bit_count()
+
+    def describe(self, code: int) -> str:
+        return self._descriptions.get(code, f"Unbekannter Fehler {code}")
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        codes = error_codes(self.bits)
+        return {"codes": codes, "errors": [self.describe(code) for code in codes]}
@@ -0,0 +1,175 @@
+"""Fleet-Modus: geteilte Verbindungen je host:port und ein Scheduler für alle Hubs."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from homeassistant.core import HomeAssistant, callback
+
+from .io_queue import ModbusIOQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledConnection:
+    """Ein Client und eine I/O-Queue je host:port; die Hubs dahinter unterscheiden sich nur in der Unit-ID."""
+
+    host: str
+    port: int
+    client: AsyncModbusTcpClient
+    io: ModbusIOQueue = field(default_factory=ModbusIOQueue)
+    users: int = 0
+
+
+@dataclass
+class _Member:
+    refresh: Callable[[], Awaitable[None]]
+    tick: float
+    task: asyncio.Task | None = None
+    skipped: int = 0
+
+
+class FleetScheduler:
+    """
+    Gemeinsamer Scheduler für alle Hubs im Fleet-Modus.
+    Ein Worker startet jeden Hub in dessen eigenem Tick (Heap nach nächster Fälligkeit);
+    die erste Fälligkeit ist je Hub versetzt, damit nicht alle im selben Moment lesen.
+    Höchstens max_concurrent Zyklen laufen gleichzeitig, weitere warten auf einen freien
+    Platz. Läuft der Zyklus eines Hubs noch, zählt der Scheduler den Tick als ausgelassen. Verbindungen werden je host:port geteilt, die
+    I/O-Queue der Verbindung serialisiert die Requests aller Unit-IDs dahinter.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_concurrent: int) -> None:
+        self._hass = hass
+        self._max_concurrent = max_concurrent
+        self._connections: Dict[Tuple[str, int], PooledConnection] = {}
+        self._members: List[_Member] = []
+        # (nächste Fälligkeit in loop.time(), laufende Nummer, Hub)
+        self._due: List[Tuple[float, int, _Member]] = []
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+        self._slots: asyncio.Semaphore | None = None
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def idle(self) -> bool:
+        """Keine Verbindung mehr im Pool (Scheduler kann verworfen werden)."""
+        return not self._connections
+
+    # ---- Verbindungspool ----------------------------------------------------
+
+    def acquire(self, host: str, port: int, timeout: float) -> PooledConnection:
+        """
+        Verbindung für host:port holen bzw. anlegen. Der Client-Timeout ist nur die
+        Obergrenze (die Hubs regeln Timeouts pro Request), es gilt der des ersten Hubs.
+        """
+        connection = self._connections.get((host, port))
+        if connection is None:
+            connection = PooledConnection(
+                host,
+                port,
+                AsyncModbusTcpClient(host=host, port=port, timeout=timeout, retries=0),
+            )
+            self._connections[(host, port)] = connection
+            _LOGGER.debug(f"Neue Pool-Verbindung {host}:{port}.")
+        connection.users += 1
+        return connection
+
+    def release(self, connection: PooledConnection) -> None:
+        """Verbindung zurückgeben; der letzte Nutzer schließt sie."""
+        connection.users -= 1
+        if connection.users > 0:
+            return
+        connection.io.stop()
+        connection.client.close()
+        self._connections.pop((connection.host, connection.port), None)
+        _LOGGER.debug(f"Pool-Verbindung {connection.host}:{connection.port} geschlossen.")
+
+    # ---- Scheduler ------------------------------------------------------------
+
+    @callback
+    def async_track(
+        self, refresh: Callable[[], Awaitable[None]], interval: timedelta
+    ) -> Callable[[], None]:
+        """
+        Wie async_track_time_interval: refresh wird jeden Tick aufgerufen, der
+        Rückgabewert meldet wieder ab.
+        """
+        member = _Member(refresh, interval.total_seconds())
+        self._members.append(member)
+        # Versatz je Hub über das goldene Verhältnis: auch bei wachsender Flotte gleichmäßig
+        phase = (len(self._members) * 0.618034) % 1
+        self._schedule(member, self._hass.loop.time() + phase * member.tick)
+        if self._worker is None or self._worker.done():
+            self._slots = asyncio.Semaphore(self._max_concurrent)
+            self._worker = self._hass.async_create_background_task(
+                self._run(), "ha_comfoconnectpro fleet scheduler"
+            )
+
+        @callback
+        def remove() -> None:
+            if member in self._members:
+                self._members.remove(member)
+            if not self._members and self._worker is not None:
+                self._worker.cancel()
+                self._worker = None
+                self._due.clear()
+
+        return remove
+
+    def skipped_ticks(self, refresh: Callable[[], Awaitable[None]]) -> int:
+        """Ausgelassene Ticks eines angemeldeten Hubs (sein Zyklus lief noch)."""
+        return sum(member.skipped for member in self._members if member.refresh == refresh)
+
+    def _schedule(self, member: _Member, due: float) -> None:
+        heapq.heappush(self._due, (due, next(self._sequence), member))
+        self._changed.set()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._members:
+            if not self._due:
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            due, _sequence, member = self._due[0]
+            delay = due - loop.time()
+            if delay > 0:
+                # Neu angemeldete Hubs können früher fällig sein: dann neu entscheiden
+                self._changed.clear()
+                try:
+                    async with asyncio.timeout(delay):
+                        await self._changed.wait()
+                except TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._due)
+            if member not in self._members:
+                continue
+            # Im Takt bleiben; nach einem Stau (alle Plätze belegt) nicht nachholen
+            self._schedule(member, max(due + member.tick, loop.time()))
+            if member.task is not None and not member.task.done():
+                member.skipped += 1
+                _LOGGER.debug("Vorheriger Zyklus läuft noch, Tick ausgelassen.")
+                continue
+            await self._slots.acquire()
+            member.task = self._hass.async_create_background_task(
+                self._run_cycle(member), "ha_comfoconnectpro fleet cycle"
+            )
+
+    async def _run_cycle(self, member: _Member) -> None:
+        try:
+            await member.refresh()
+        except Exception as exc:  # noqa: BLE001 (ein Hub darf den Scheduler nicht stoppen)
+            _LOGGER.exception(f"Zyklus im Fleet-Scheduler fehlgeschlagen: {exc}")
+        finally:
+            self._slots.release()
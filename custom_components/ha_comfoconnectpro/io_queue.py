@@ -0,0 +1,161 @@
+"""Priorisierte Modbus-I/O-Warteschlange: ein Worker besitzt die Verbindung."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable
+
+from pymodbus.exceptions import ConnectionException
+
+_LOGGER = logging.getLogger(__name__)
+
+# Prioritäten (kleiner = wichtiger)
+PRIORITY_CONTROL = 0  # Verbindungsaufbau
+PRIORITY_WRITE = 1  # Benutzerbefehle
+PRIORITY_READ = 2  # Hintergrund-Lesezugriffe
+
+# Nach so vielen bevorzugten Jobs in Folge kommt ein wartender Lesezugriff dran
+DEFAULT_MAX_BURST = 4
+STATS_WINDOW = 100
+
+
+def percentile(values: Iterable[float], q: float) -> float | None:
+    """Einfaches Perzentil (nearest rank); None ohne Werte."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class _Job:
+    priority: int
+    func: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued: float = field(default_factory=time.monotonic)
+    task: asyncio.Task | None = None
+
+
+class ModbusIOQueue:
+    """
+    Serialisiert alle Requests auf einer Verbindung.
+    Schreibzugriffe haben Vorrang vor Lesezugriffen, nach max_burst bevorzugten Jobs
+    wird ein wartender Lesezugriff eingeschoben (kein Aushungern des Pollings).
+    Gemessen werden Warteschlangentiefe, Wartezeit je Priorität und Bedienzeit.
+    """
+
+    def __init__(self, max_burst: int = DEFAULT_MAX_BURST) -> None:
+        self._max_burst = max_burst
+        self._burst = 0
+        self._queues: Dict[int, Deque[_Job]] = {
+            PRIORITY_CONTROL: deque(),
+            PRIORITY_WRITE: deque(),
+            PRIORITY_READ: deque(),
+        }
+        self._wakeup: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        # Laufender Job: stop() muss auch dessen Aufrufer freigeben
+        self._current: _Job | None = None
+        self.peak_depth = 0
+        self.wait_times: Dict[int, Deque[float]] = {
+            prio: deque(maxlen=STATS_WINDOW) for prio in self._queues
+        }
+        self.service_times: Deque[float] = deque(maxlen=STATS_WINDOW)
+
+    @property
+    def depth(self) -> int:
+        """Anzahl wartender Jobs (ohne den gerade laufenden)."""
+        return sum(len(q) for q in self._queues.values())
+
+    def reset_peak_depth(self) -> None:
+        """Neues Messfenster für peak_depth (beginnt mit der aktuellen Tiefe)."""
+        self.peak_depth = self.depth
+
+    async def submit(self, priority: int, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Job einreihen und auf das Ergebnis warten.
+        Wird der Aufrufer abgebrochen (z. B. Zyklus-Deadline), wird auch der laufende
+        Request abgebrochen bzw. der wartende Job verworfen.
+        """
+        self._ensure_worker()
+        job = _Job(priority, func, asyncio.get_running_loop().create_future())
+        self._queues[priority].append(job)
+        self.peak_depth = max(self.peak_depth, self.depth)
+        self._wakeup.set()
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            if job.task is not None:
+                job.task.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Worker beenden; laufender und wartende Jobs schlagen mit ConnectionException fehl."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        jobs = [job for queue in self._queues.values() for job in queue]
+        for queue in self._queues.values():
+            queue.clear()
+        if self._current is not None:
+            jobs.append(self._current)
+            self._current = None
+        for job in jobs:
+            _fail(job)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def _next_job(self) -> _Job | None:
+        reads = self._queues[PRIORITY_READ]
+        if reads and self._burst >= self._max_burst:
+            self._burst = 0
+            return reads.popleft()
+        for priority, queue in self._queues.items():
+            if queue:
+                self._burst = self._burst + 1 if priority != PRIORITY_READ else 0
+                return queue.popleft()
+        return None
+
+    async def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if job.future.done():  # Aufrufer hat bereits aufgegeben
+                continue
+            start = time.monotonic()
+            self.wait_times[job.priority].append(start - job.enqueued)
+            job.task = asyncio.get_running_loop().create_task(job.func())
+            self._current = job
+            try:
+                await asyncio.wait((job.task,))
+            except asyncio.CancelledError:
+                job.task.cancel()
+                _fail(job)
+                raise
+            finally:
+                if self._current is job:
+                    self._current = None
+            self.service_times.append(time.monotonic() - start)
+            if job.future.done():
+                continue
+            if job.task.cancelled():
+                job.future.cancel()
+            elif job.task.exception() is not None:
+                job.future.set_exception(job.task.exception())
+            else:
+                job.future.set_result(job.task.result())
+
+
+def _fail(job: _Job) -> None:
+    if not job.future.done():
+        job.future.set_exception(ConnectionException("Modbus-Verbindung wurde geschlossen"))
@@ -39,8 +39,8 @@ class MyNumber(HubBackedEntity, NumberEntity):
     async def async_set_native_value(self, value: float) -> None:
         """Write new value via hub."""
         self._attr_native_value = value
-        # Einheitliches Schreiben wie bei select/climate:
-        await self._hub.setter_function_callback(self, value)
+        # Einheitliches Schreiben wie bei climate (Slider-Bursts zusammengefasst):
+        await self._hub.coalesced_setter_callback(self, value)
 
     @property
     def native_unit_of_measurement(self) -> str | None:
@@ -0,0 +1,113 @@
+"""Oversampling: Ringpuffer je Messwert in einem NumPy-Array, veröffentlicht werden Fenster-Aggregate."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+# Nachkommastellen der veröffentlichten Aggregate
+_DIGITS = 2
+
+
+class Oversampler:
+    """
+    Ein vorab angelegtes Array (Keys x capacity) für alle überabgetasteten Werte, freie
+    Plätze sind NaN; pro Messwert entsteht kein Python-Objekt im Puffer.
+    sample() schreibt die Rohwerte eines Lesezyklus in die Ringpuffer. Nach Ablauf des
+    Fensters werden Mittelwert, Minimum, Maximum und Standardabweichung aller Zeilen in
+    einem Schritt berechnet und die Puffer geleert. Läuft ein Puffer innerhalb eines
+    Fensters über, werden die ältesten Werte überschrieben (Speicher bleibt konstant).
+    Veröffentlicht wird immer ein Mittelwert: bis zum ersten abgeschlossenen Fenster der
+    laufende Mittelwert des angefangenen Fensters. Ein ungültiger Rohwert (None) bleibt
+    stehen und wird nicht vom Mittelwert verdeckt.
+    """
+
+    def __init__(self, keys: Iterable[str], window: float, capacity: int) -> None:
+        self._keys = list(keys)
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._window = window
+        self._samples = np.full((len(self._keys), capacity), np.nan)
+        # Schreibposition je Zeile (fortlaufend, Spalte = Position % capacity)
+        self._next = np.zeros(len(self._keys), dtype=np.intp)
+        self._window_end: float | None = None
+        # Ergebnis des letzten abgeschlossenen Fensters je Key
+        self.means: Dict[str, float] = {}
+        self.attributes: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        """Speicherbedarf der Puffer (fest, unabhängig von der Laufzeit)."""
+        return self._samples.nbytes + self._next.nbytes
+
+    def sample(self, keys: Iterable[str], data: Dict[str, Any], now: float) -> List[str]:
+        """
+        Frische Rohwerte der gelesenen keys aus data übernehmen. In data stehen danach
+        wieder Mittelwerte (veröffentlichter Zustand), außer bei ungültigen Rohwerten.
+        Gibt die Keys zurück, deren Aggregate gerade neu berechnet wurden.
+        """
+        rows: List[int] = []
+        values: List[float] = []
+        invalid: List[str] = []
+        for key in keys:
+            row = self._rows.get(key)
+            if row is None:
+                continue
+            value = data.get(key)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                invalid.append(key)
+                continue
+            rows.append(row)
+            values.append(value)
+        if rows:
+            index = np.array(rows, dtype=np.intp)
+            self._samples[index, self._next[index] % self._samples.shape[1]] = values
+            self._next[index] += 1
+
+        published: List[str] = []
+        if self._window_end is None:
+            self._window_end = now + self._window
+        elif now >= self._window_end:
+            published = self._aggregate()
+            self._window_end = now + self._window
+        # Noch kein abgeschlossenes Fenster: laufender Mittelwert des angefangenen
+        running = [row for row in rows if self._keys[row] not in self.means]
+        if running:
+            partial = np.nanmean(self._samples[running], axis=1).round(_DIGITS).tolist()
+            data.update(zip((self._keys[row] for row in running), partial))
+        data.update(self.means)
+        for key in invalid:
+            data[key] = None
+        return published
+
+    def _aggregate(self) -> List[str]:
+        counts = np.count_nonzero(~np.isnan(self._samples), axis=1)
+        valid = counts > 0
+        if not valid.any():
+            return []
+        samples = self._samples[valid]
+        keys = [self._keys[row] for row in np.flatnonzero(valid)]
+        aggregates = zip(
+            keys,
+            np.nanmean(samples, axis=1).round(_DIGITS).tolist(),
+            np.nanmin(samples, axis=1).round(_DIGITS).tolist(),
+            np.nanmax(samples, axis=1).round(_DIGITS).tolist(),
+            np.nanstd(samples, axis=1).round(_DIGITS + 1).tolist(),
+            counts[valid].tolist(),
+        )
+        for key, mean, minimum, maximum, std, count in aggregates:
+            self.means[key] = mean
+            self.attributes[key] = {
+                "mean": mean,
+                "min": minimum,
+                "max": maximum,
+                "std": std,
+                "samples": count,
+            }
+        self._samples.fill(np.nan)
+        self._next.fill(0)
+        return keys
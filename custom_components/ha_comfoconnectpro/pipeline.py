@@ -0,0 +1,193 @@
+"""Pipelined Lesezugriffe: alle Leseblöcke eines Zyklus gleichzeitig in der Leitung."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+from typing import Dict, List, Set, Tuple
+
+from pymodbus.exceptions import ConnectionException, ModbusException
+
+_LOGGER = logging.getLogger(__name__)
+
+_MBAP = struct.Struct(">HHHB")  # Transaction-ID, Protocol-ID, Länge, Unit-ID
+_READ_PDU = struct.Struct(">BHH")  # Funktionscode, Startadresse, Anzahl
+_BIT_FUNCTIONS = (1, 2)
+
+
+class PipelineRejected(ModbusException):
+    """Das Gateway lehnt Pipelining ausdrücklich ab (Exception-Antwort, fremde Transaction-ID)."""
+
+
+class PipelinedReader:
+    """
+    Minimaler Modbus-TCP-Client nur für die Lese-Funktionscodes 1-4.
+    read_many() schickt alle Requests direkt hintereinander auf dieselbe Verbindung und
+    ordnet die Antworten über die Transaction-ID zu (Reihenfolge beliebig).
+    Jede Exception-Antwort, jeder Timeout und jeder Verbindungsfehler lässt den ganzen
+    Batch fehlschlagen; der Aufrufer entscheidet über den Rückfall auf serielles Lesen.
+    Die Unit-ID kommt je Batch, so teilen sich alle Hubs eines Gateways eine Verbindung
+    (siehe PipelinePool). Ein gescheiterter Batch schließt sie deshalb nicht: späte
+    Antworten verwirft der Empfänger über die unbekannte Transaction-ID.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self.users = 0
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._receiver: asyncio.Task | None = None
+        self._pending: Dict[int, Tuple[int, int, asyncio.Future]] = {}
+        # Transaction-IDs aufgegebener Batches: deren späte Antworten sind kein Protokollfehler
+        self._abandoned: Set[int] = set()
+        self._tid = 0
+        # Mehrere Hubs können gleichzeitig den ersten Batch schicken: nur einer verbindet
+        self._connecting = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        async with self._connecting:
+            if self.connected:
+                return
+            try:
+                self._reader, self._writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+            except OSError as exc:
+                raise ConnectionException(f"Pipeline-Verbindung fehlgeschlagen: {exc}") from exc
+            self._abandoned.clear()
+            self._receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    def close(self) -> None:
+        if self._receiver is not None:
+            self._receiver.cancel()
+            self._receiver = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(ConnectionException("Pipeline-Verbindung geschlossen"))
+
+    async def read_many(
+        self, unit: int, requests: List[Tuple[int, int, int]], timeout: float
+    ) -> List[List[int | bool]]:
+        """
+        requests: (Funktionscode 1-4, Adresse, Anzahl) je Block, alle an dieselbe Unit-ID.
+        Gibt die Register bzw. Bits in derselben Reihenfolge zurück.
+        """
+        await self.connect()
+        loop = asyncio.get_running_loop()
+        tids: List[int] = []
+        futures: List[asyncio.Future] = []
+        frames = bytearray()
+        for function_code, address, count in requests:
+            self._tid = (self._tid + 1) & 0xFFFF
+            future = loop.create_future()
+            self._pending[self._tid] = (function_code, count, future)
+            tids.append(self._tid)
+            futures.append(future)
+            frames += _MBAP.pack(self._tid, 0, _READ_PDU.size + 1, unit)
+            frames += _READ_PDU.pack(function_code, address, count)
+        try:
+            self._writer.write(frames)
+            await self._writer.drain()
+            async with asyncio.timeout(timeout):
+                return list(await asyncio.gather(*futures))
+        except TimeoutError:
+            raise
+        except OSError as exc:
+            self.close()
+            raise ConnectionException(f"Pipeline-Verbindung getrennt: {exc}") from exc
+        finally:
+            # Nur den eigenen Batch aufgeben, die Verbindung gehört allen Hubs des Gateways
+            for tid in tids:
+                if self._pending.pop(tid, None) is not None:
+                    self._abandoned.add(tid)
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+                elif not future.cancelled():
+                    future.exception()  # als abgerufen markieren (keine Warnung im Log)
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                header = await self._reader.readexactly(_MBAP.size)
+                tid, _pid, length, _unit = _MBAP.unpack(header)
+                pdu = await self._reader.readexactly(length - 1)
+                entry = self._pending.pop(tid, None)
+                if entry is None:
+                    if tid in self._abandoned:
+                        self._abandoned.discard(tid)
+                        _LOGGER.debug(f"Späte Antwort mit Transaction-ID {tid} verworfen.")
+                    else:
+                        # Nie vergeben: das Gateway ordnet die Transaction-IDs nicht zu
+                        self._fail_pending(
+                            PipelineRejected(f"Antwort mit fremder Transaction-ID {tid}")
+                        )
+                    continue
+                function_code, count, future = entry
+                if future.done():
+                    continue
+                try:
+                    future.set_result(_decode_response(function_code, count, pdu))
+                except ModbusException as exc:
+                    future.set_exception(exc)
+        except (asyncio.IncompleteReadError, OSError) as exc:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(ConnectionException(f"Pipeline-Verbindung getrennt: {exc}"))
+
+    def _fail_pending(self, exc: Exception) -> None:
+        pending, self._pending = self._pending, {}
+        for _fc, _count, future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+
+class PipelinePool:
+    """
+    Eine Pipeline-Verbindung je host:port, geteilt von allen Hubs (mit und ohne Fleet-Modus).
+    Neben dem pymodbus-Client bleibt das der einzige zusätzliche Socket je Gateway.
+    """
+
+    def __init__(self) -> None:
+        self._readers: Dict[Tuple[str, int], PipelinedReader] = {}
+
+    @property
+    def idle(self) -> bool:
+        """Keine Verbindung mehr im Pool (Pool kann verworfen werden)."""
+        return not self._readers
+
+    def acquire(self, host: str, port: int) -> PipelinedReader:
+        reader = self._readers.get((host, port))
+        if reader is None:
+            reader = self._readers[(host, port)] = PipelinedReader(host, port)
+            _LOGGER.debug(f"Neue Pipeline-Verbindung {host}:{port}.")
+        reader.users += 1
+        return reader
+
+    def release(self, reader: PipelinedReader) -> None:
+        """Verbindung zurückgeben; der letzte Nutzer schließt sie."""
+        reader.users -= 1
+        if reader.users > 0:
+            return
+        reader.close()
+        self._readers.pop((reader.host, reader.port), None)
+        _LOGGER.debug(f"Pipeline-Verbindung {reader.host}:{reader.port} geschlossen.")
+
+
+def _decode_response(function_code: int, count: int, pdu: bytes) -> List[int | bool]:
+    if pdu[0] != function_code:
+        code = pdu[1] if len(pdu) > 1 else None
+        raise PipelineRejected(f"FC{function_code}: Exception-Antwort (Code {code})")
+    data = pdu[2 : 2 + pdu[1]]
+    if function_code in _BIT_FUNCTIONS:
+        return [bool(data[i // 8] >> (i % 8) & 1) for i in range(count)]
+    return list(struct.unpack(f">{len(data) // 2}H", data))
+
@@ -0,0 +1,270 @@
+"""Leseplanung: ENTITIES_DICT -> minimale Liste zusammenhängender Modbus-Lesezugriffe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .const import (
+    C_POLL_FAST,
+    C_POLL_NORMAL,
+    C_POLL_ONCE,
+    C_POLL_SLOW,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+    get_entity_poll,
+    get_entity_reg,
+    get_entity_type,
+    get_register_count,
+)
+
+# Maximale Anzahl Elemente je Request laut Modbus-Spezifikation (PDU-Limit)
+MAX_COUNT: Dict[int, int] = {
+    C_REG_TYPE_COILS: 2000,  # FC1
+    C_REG_TYPE_DISCRETE_INPUTS: 2000,  # FC2
+    C_REG_TYPE_HOLDING_REGISTERS: 125,  # FC3
+    C_REG_TYPE_INPUT_REGISTERS: 125,  # FC4
+}
+
+FUNCTION_CODE: Dict[int, int] = {
+    C_REG_TYPE_COILS: 1,
+    C_REG_TYPE_DISCRETE_INPUTS: 2,
+    C_REG_TYPE_HOLDING_REGISTERS: 3,
+    C_REG_TYPE_INPUT_REGISTERS: 4,
+}
+
+# Feste Reihenfolge der Registertypen im Plan (wie bisher: IR, HR, Coils, DI)
+_TYPE_ORDER = (
+    C_REG_TYPE_INPUT_REGISTERS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_DISCRETE_INPUTS,
+)
+
+_POLL_ORDER = (C_POLL_FAST, C_POLL_NORMAL, C_POLL_SLOW, C_POLL_ONCE)
+
+
+@dataclass(frozen=True)
+class ReadCostModel:
+    """
+    Kostenmodell für die Planung.
+    Kosten eines Requests = round_trip + Antwortbytes * per_byte.
+    Mit den Defaults lohnt sich ein zusätzlicher Request erst ab einer Lücke von
+    ca. 32 Registern (64 Bytes) bzw. 512 Bits.
+    """
+
+    round_trip: float = 1.0
+    per_byte: float = 1.0 / 64
+
+    def block_cost(self, reg_type: int, count: int) -> float:
+        return self.round_trip + response_bytes(reg_type, count) * self.per_byte
+
+
+@dataclass(frozen=True)
+class ReadBlock:
+    """Ein Lesezugriff: Registertyp, Startadresse, Anzahl, enthaltene Entitäten, Pollklasse."""
+
+    reg_type: int
+    address: int
+    count: int
+    keys: Tuple[str, ...]
+    poll: str = C_POLL_NORMAL
+
+    @property
+    def function_code(self) -> int:
+        return FUNCTION_CODE[self.reg_type]
+
+    @property
+    def end(self) -> int:
+        """Letzte gelesene Adresse (inklusive)."""
+        return self.address + self.count - 1
+
+
+@dataclass(frozen=True)
+class ReadRequest:
+    """
+    Ein physischer Lesezugriff für die fälligen Blöcke eines Zyklus. parts nennt je
+    abgedecktem Block (buffer_id, Offset im Request, Anzahl).
+    """
+
+    block: ReadBlock
+    parts: Tuple[Tuple[int, int, int], ...]
+
+    def split(self, values: List[int | bool]) -> List[Tuple[int, List[int | bool]]]:
+        """Antwort des Requests in die Puffer der abgedeckten Blöcke zerlegen."""
+        return [
+            (buffer_id, values[offset : offset + count])
+            for buffer_id, offset, count in self.parts
+        ]
+
+
+def response_bytes(reg_type: int, count: int) -> int:
+    """Nutzdaten der Antwort in Bytes (Bits werden zu Bytes gepackt)."""
+    if reg_type in (C_REG_TYPE_COILS, C_REG_TYPE_DISCRETE_INPUTS):
+        return (count + 7) // 8
+    return count * 2
+
+
+def _collect_spans(
+    entities: Dict[str, Dict[str, Any]],
+) -> Dict[Tuple[str, int], List[Tuple[int, int, str]]]:
+    """(Start, Ende inkl., Key) je Pollklasse und Registertyp, aufsteigend sortiert."""
+    spans: Dict[Tuple[str, int], List[Tuple[int, int, str]]] = {}
+    for entity_key, props in entities.items():
+        reg_type = get_entity_type(props)
+        reg, dt = get_entity_reg(props)
+        if reg is None or dt is None or reg_type not in MAX_COUNT:
+            continue
+        size = get_register_count(dt)
+        group = (get_entity_poll(props), reg_type)
+        spans.setdefault(group, []).append((reg, reg + size - 1, entity_key))
+    for items in spans.values():
+        items.sort()
+    return spans
+
+
+def _plan_type(
+    poll: str,
+    reg_type: int,
+    spans: List[Tuple[int, int, str]],
+    cost_model: ReadCostModel,
+) -> List[ReadBlock]:
+    """
+    Optimale Aufteilung der sortierten Spannen in Blöcke (dynamische Programmierung).
+    best[j] = minimale Kosten, um die Spannen 0..j-1 abzudecken.
+    """
+    max_count = MAX_COUNT[reg_type]
+    n = len(spans)
+    best = [0.0] + [float("inf")] * n
+    split = [0] * (n + 1)
+    for j in range(1, n + 1):
+        end = -1
+        for i in range(j, 0, -1):
+            end = max(end, spans[i - 1][1])
+            count = end - spans[i - 1][0] + 1
+            if count > max_count:
+                break
+            cost = best[i - 1] + cost_model.block_cost(reg_type, count)
+            if cost < best[j]:
+                best[j] = cost
+                split[j] = i - 1
+
+    blocks: List[ReadBlock] = []
+    j = n
+    while j > 0:
+        i = split[j]
+        members = spans[i:j]
+        start = members[0][0]
+        end = max(s[1] for s in members)
+        blocks.append(
+            ReadBlock(
+                reg_type=reg_type,
+                address=start,
+                count=end - start + 1,
+                keys=tuple(s[2] for s in members),
+                poll=poll,
+            )
+        )
+        j = i
+    blocks.reverse()
+    return blocks
+
+
+def build_read_plan(
+    entities: Dict[str, Dict[str, Any]],
+    cost_model: ReadCostModel | None = None,
+) -> List[ReadBlock]:
+    """
+    Erzeugt den Leseplan: nahe beieinanderliegende Register werden zusammengefasst,
+    an großen Lücken wird getrennt, die maximale Anzahl je Funktionscode wird eingehalten.
+    Register unterschiedlicher Pollklassen landen nie im selben Block.
+    """
+    cost_model = cost_model or ReadCostModel()
+    spans = _collect_spans(entities)
+    plan: List[ReadBlock] = []
+    for poll in _POLL_ORDER:
+        for reg_type in _TYPE_ORDER:
+            if (poll, reg_type) in spans:
+                plan.extend(
+                    _plan_type(poll, reg_type, spans[(poll, reg_type)], cost_model)
+                )
+    return plan
+
+
+def plan_requests(
+    plan: List[ReadBlock],
+    buffer_ids: Iterable[int],
+    cost_model: ReadCostModel | None = None,
+) -> List[ReadRequest]:
+    """
+    Requests für die fälligen Blöcke eines Zyklus. Sind mehrere Pollklassen fällig,
+    werden überlappende Blöcke desselben Registertyps zu einem Request zusammengelegt
+    (kein Register doppelt), nahe beieinanderliegende, wenn es nach dem Kostenmodell
+    günstiger ist. Reihenfolge wie im Leseplan (nach dem ersten abgedeckten Block).
+    """
+    cost_model = cost_model or ReadCostModel()
+    by_type: Dict[int, List[int]] = {}
+    for buffer_id in sorted(set(buffer_ids)):
+        by_type.setdefault(plan[buffer_id].reg_type, []).append(buffer_id)
+
+    groups: List[List[int]] = []
+    for reg_type, ids in by_type.items():
+        ids.sort(key=lambda buffer_id: (plan[buffer_id].address, plan[buffer_id].end))
+        group = [ids[0]]
+        start, end = plan[ids[0]].address, plan[ids[0]].end
+        for buffer_id in ids[1:]:
+            block = plan[buffer_id]
+            merged_count = max(end, block.end) - start + 1
+            if merged_count <= MAX_COUNT[reg_type] and (
+                block.address <= end + 1
+                or cost_model.block_cost(reg_type, merged_count)
+                <= cost_model.block_cost(reg_type, end - start + 1)
+                + cost_model.block_cost(reg_type, block.count)
+            ):
+                group.append(buffer_id)
+                end = max(end, block.end)
+                continue
+            groups.append(group)
+            group = [buffer_id]
+            start, end = block.address, block.end
+        groups.append(group)
+    groups.sort(key=min)
+
+    requests: List[ReadRequest] = []
+    for group in groups:
+        if len(group) == 1:
+            block = plan[group[0]]
+            requests.append(ReadRequest(block, ((group[0], 0, block.count),)))
+            continue
+        blocks = [plan[buffer_id] for buffer_id in group]
+        start = min(block.address for block in blocks)
+        end = max(block.end for block in blocks)
+        merged = ReadBlock(
+            reg_type=blocks[0].reg_type,
+            address=start,
+            count=end - start + 1,
+            keys=tuple(key for block in blocks for key in block.keys),
+            poll=plan[min(group)].poll,
+        )
+        parts = tuple(
+            (buffer_id, plan[buffer_id].address - start, plan[buffer_id].count)
+            for buffer_id in sorted(group)
+        )
+        requests.append(ReadRequest(merged, parts))
+    return requests
+
+
+def describe_read_plan(plan: List[ReadBlock]) -> List[Dict[str, Any]]:
+    """Plan als Liste einfacher Dicts (Logging/Diagnose)."""
+    return [
+        {
+            "poll": block.poll,
+            "function_code": block.function_code,
+            "address": block.address,
+            "count": block.count,
+            "entities": list(block.keys),
+        }
+        for block in plan
+    ]
@@ -0,0 +1,87 @@
+"""Adaptive Request-Timeouts aus gemessenen Round-Trip-Zeiten (wie TCP-RTO, RFC 6298)."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict
+
+# Glättungsfaktoren und Varianz-Gewicht laut RFC 6298
+_ALPHA = 1 / 8
+_BETA = 1 / 4
+_K = 4
+
+
+@dataclass
+class RttEstimate:
+    """Geglättete RTT (srtt) und Schwankung (rttvar) eines Funktionscodes in Sekunden."""
+
+    srtt: float | None = None
+    rttvar: float = 0.0
+    samples: int = 0
+
+
+class RttEstimator:
+    """
+    Hält je Funktionscode eine RTT-Schätzung und leitet daraus Timeout und Anzahl
+    Wiederholungen ab. Timeout = srtt + 4 * rttvar, begrenzt auf [timeout_min, timeout_max];
+    ohne Messwerte gilt initial. Wiederholungen: so viele Versuche, wie in timeout_max
+    passen (höchstens max_retries), damit ein verlorenes Paket nicht Sekunden kostet.
+    """
+
+    def __init__(
+        self,
+        timeout_min: float,
+        timeout_max: float,
+        max_retries: int,
+        initial: float = 1.0,
+    ) -> None:
+        self.timeout_min = timeout_min
+        self.timeout_max = timeout_max
+        self.max_retries = max_retries
+        self._initial = min(max(initial, timeout_min), timeout_max)
+        self.estimates: Dict[int, RttEstimate] = {}
+
+    def sample(self, function_code: int, rtt: float) -> None:
+        """Messwert eines erfolgreichen, nicht wiederholten Requests übernehmen (Karn)."""
+        est = self.estimates.setdefault(function_code, RttEstimate())
+        if est.srtt is None:
+            est.srtt = rtt
+            est.rttvar = rtt / 2
+        else:
+            est.rttvar = (1 - _BETA) * est.rttvar + _BETA * abs(est.srtt - rtt)
+            est.srtt = (1 - _ALPHA) * est.srtt + _ALPHA * rtt
+        est.samples += 1
+
+    def timeout(self, function_code: int) -> float:
+        """Aktueller Timeout für einen Request mit diesem Funktionscode."""
+        est = self.estimates.get(function_code)
+        if est is None or est.srtt is None:
+            return self._initial
+        rto = est.srtt + _K * est.rttvar
+        return min(max(rto, self.timeout_min), self.timeout_max)
+
+    def retries(self, function_code: int) -> int:
+        """Wiederholungen nach einem Timeout, abgeleitet aus dem Verhältnis timeout_max / Timeout."""
+        attempts = int(self.timeout_max / self.timeout(function_code))
+        return min(max(attempts - 1, 0), self.max_retries)
+
+    def srtt_by_function_code(self) -> Dict[int, float]:
+        """Geglättete RTT je gemessenem Funktionscode."""
+        return {fc: e.srtt for fc, e in sorted(self.estimates.items()) if e.srtt is not None}
+
+    def timeout_by_function_code(self) -> Dict[int, float]:
+        """Aktueller Timeout je gemessenem Funktionscode."""
+        return {fc: self.timeout(fc) for fc in sorted(self.estimates)}
+
+    @property
+    def srtt(self) -> float | None:
+        """Größte geglättete RTT über alle Funktionscodes (None ohne Messwerte)."""
+        values = [e.srtt for e in self.estimates.values() if e.srtt is not None]
+        return max(values) if values else None
+
+    @property
+    def max_timeout(self) -> float:
+        """Größter aktuell gültiger Timeout über alle gemessenen Funktionscodes."""
+        return max(
+            (self.timeout(fc) for fc in self.estimates), default=self._initial
+        )
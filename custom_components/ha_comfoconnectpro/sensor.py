@@ -6,7 +6,7 @@ from typing import Optional, Any
 from homeassistant.components.sensor import SensorEntity
 
 from .entity_common import HubBackedEntity, setup_platform_from_types
-from .const import SENSOR_TYPES, MySensorEntityDescription
+from .const import SENSOR_TYPES, DERIVED_TYPES, DIAGNOSTIC_TYPES, MySensorEntityDescription
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,7 +17,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         hass=hass,
         entry=entry,
         async_add_entities=async_add_entities,
-        types_dict=SENSOR_TYPES,
+        types_dict={**SENSOR_TYPES, **DERIVED_TYPES, **DIAGNOSTIC_TYPES},
         entity_cls=MySensor,
     )
 
@@ -33,4 +33,9 @@ class MySensor(HubBackedEntity, SensorEntity):
         """Map hub payload to native_value."""
         self._attr_native_value = payload
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Aktive Fehlercodes, RTT/Timeout je Funktionscode bzw. Oversampling-Aggregate."""
+        return self._hub.entity_attributes(self.entity_description.key)
+
     # async def async_set_... entfällt, da r/o
@@ -0,0 +1,92 @@
+"""Domain-Services: mehrere Entitätswerte gebündelt schreiben."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from pymodbus.exceptions import ModbusException
+
+from .const import ATTR_FORCE, ATTR_HUB, ATTR_VALUES, DOMAIN, SERVICE_APPLY
+
+if TYPE_CHECKING:
+    from . import MyModbusHub
+
+_LOGGER = logging.getLogger(__name__)
+
+APPLY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_HUB): cv.string,
+        vol.Required(ATTR_VALUES): vol.All(
+            {cv.string: vol.Any(bool, int, float, str, dict)}, vol.Length(min=1)
+        ),
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+
+def _get_hub(hass: HomeAssistant, name: str | None) -> MyModbusHub:
+    """Hub per Name; ohne Namen nur eindeutig, wenn genau ein Gerät eingerichtet ist."""
+    hubs = hass.data.get(DOMAIN, {})
+    if name is None:
+        if len(hubs) != 1:
+            raise ServiceValidationError(
+                f"Parameter '{ATTR_HUB}' erforderlich, eingerichtet: {sorted(hubs)}"
+            )
+        return next(iter(hubs.values()))["hub"]
+    if name not in hubs:
+        raise ServiceValidationError(
+            f"Unbekannter Hub '{name}', eingerichtet: {sorted(hubs)}"
+        )
+    return hubs[name]["hub"]
+
+
+async def _async_apply(call: ServiceCall) -> ServiceResponse:
+    """
+    Alle Werte vorab kodieren und prüfen (ein ungültiger Wert -> nichts wird geschrieben),
+    dann in möglichst wenigen zusammenhängenden Requests schreiben.
+    """
+    hub = _get_hub(call.hass, call.data.get(ATTR_HUB))
+    values: dict[str, Any] = call.data[ATTR_VALUES]
+
+    errors = hub.validate_entity_values(values)
+    if errors:
+        raise ServiceValidationError(f"Ungültige Werte, nichts geschrieben: {errors}")
+
+    try:
+        results = await hub.write_entity_values(values, force=call.data[ATTR_FORCE])
+    except ModbusException as exc:
+        raise HomeAssistantError(f"Schreiben fehlgeschlagen: {exc}") from exc
+    return {"results": results}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Services einmalig für die Domain registrieren."""
+    if hass.services.has_service(DOMAIN, SERVICE_APPLY):
+        return
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY,
+        _async_apply,
+        schema=APPLY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Services entfernen, sobald kein Hub mehr eingerichtet ist."""
+    hass.services.async_remove(DOMAIN, SERVICE_APPLY)
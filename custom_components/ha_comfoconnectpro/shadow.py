@@ -0,0 +1,64 @@
+"""Schattenkopie der beschreibbaren Register/Coils: unveränderte Schreibwerte überspringen."""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, Tuple
+
+from .const import C_REG_TYPE_COILS, C_REG_TYPE_HOLDING_REGISTERS
+from .write_plan import EncodedWrite
+
+_WRITABLE = (C_REG_TYPE_HOLDING_REGISTERS, C_REG_TYPE_COILS)
+
+
+class RegisterShadow:
+    """
+    Letzter bestätigter Rohwert je Adresse (aus Lesezyklen und Read-back nach Schreiben)
+    mit Zeitpunkt der Bestätigung. Ein Schreibwert, dessen Wörter bzw. Bits vollständig
+    mit dem Schatten übereinstimmen, muss nicht gesendet werden. Unbekannte und zu alte
+    Adressen gelten nie als gleich: das Gerät kann sich seitdem geändert haben
+    (Bedienteil), der Schatten ist höchstens so aktuell wie die letzte Lesung.
+    """
+
+    def __init__(self) -> None:
+        # Adresse -> (Rohwert, monotonic der Bestätigung)
+        self._cells: Dict[int, Dict[int, Tuple[int | bool, float]]] = {
+            reg_type: {} for reg_type in _WRITABLE
+        }
+        self.suppressed = 0
+
+    def update(
+        self, reg_type: int, address: int, values: Iterable[int | bool]
+    ) -> None:
+        """Bestätigte Werte ab address übernehmen (Input-Register/Discrete Inputs ignoriert)."""
+        cells = self._cells.get(reg_type)
+        if cells is None:
+            return
+        now = time.monotonic()
+        convert = bool if reg_type == C_REG_TYPE_COILS else int
+        for offset, value in enumerate(values):
+            cells[address + offset] = (convert(value), now)
+
+    def invalidate(self, reg_type: int, address: int, count: int) -> None:
+        """Zustand unbekannt (Schreiben ohne Bestätigung oder fehlgeschlagen)."""
+        cells = self._cells.get(reg_type, {})
+        for addr in range(address, address + count):
+            cells.pop(addr, None)
+
+    def clear(self) -> None:
+        """Alles vergessen, z. B. nach Verbindungsabbruch."""
+        for cells in self._cells.values():
+            cells.clear()
+
+    def matches(self, write: EncodedWrite, max_age: float) -> bool:
+        """
+        True, wenn alle Wörter bzw. Bits des Schreibwerts bereits im Gerät stehen und
+        höchstens max_age Sekunden alt sind.
+        """
+        cells = self._cells.get(write.reg_type, {})
+        oldest = time.monotonic() - max_age
+        for offset, value in enumerate(write.values):
+            current = cells.get(write.address + offset)
+            if current is None or current[0] != value or current[1] < oldest:
+                return False
+        return True
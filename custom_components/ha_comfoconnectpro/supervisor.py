@@ -0,0 +1,80 @@
+"""Verbindungsüberwachung: Circuit Breaker mit exponentiellem Backoff (mit Jitter)."""
+
+from __future__ import annotations
+
+import logging
+import random
+
+_LOGGER = logging.getLogger(__name__)
+
+# Zustände des Circuit Breakers
+CIRCUIT_CLOSED = "closed"  # Gerät erreichbar, normaler Betrieb
+CIRCUIT_OPEN = "open"  # Gerät nicht erreichbar, Lesezugriffe werden übersprungen
+CIRCUIT_HALF_OPEN = "half_open"  # Wartezeit abgelaufen, ein Health-Check darf laufen
+
+
+class ConnectionSupervisor:
+    """
+    Ein fehlgeschlagener Zyklus öffnet den Circuit: Entitäten werden sofort unavailable,
+    weitere Zyklen werden bis zum nächsten Versuch übersprungen, statt gegen eine tote
+    Verbindung in die Timeouts zu laufen. Die Wartezeit verdoppelt sich je Fehlschlag
+    (begrenzt auf backoff_max) und wird zufällig um bis zu jitter verkürzt, damit mehrere
+    Geräte nicht im Gleichtakt neu verbinden. Erst ein erfolgreicher Health-Check schließt
+    den Circuit wieder.
+    """
+
+    def __init__(
+        self, backoff_min: float, backoff_max: float, jitter: float = 0.5
+    ) -> None:
+        self._backoff_min = backoff_min
+        self._backoff_max = backoff_max
+        self._jitter = jitter
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.failures = 0
+        self._next_attempt = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Gerät gilt als erreichbar (nur bei geschlossenem Circuit)."""
+        return self.state == CIRCUIT_CLOSED
+
+    def backoff(self) -> float:
+        """Wartezeit nach der aktuellen Anzahl aufeinanderfolgender Fehlschläge."""
+        exponent = max(self.consecutive_failures - 1, 0)
+        delay = min(self._backoff_min * 2**exponent, self._backoff_max)
+        return delay * (1 - self._jitter * random.random())
+
+    def allow(self, now: float) -> bool:
+        """
+        Darf jetzt ein Request laufen?
+        Bei offenem Circuit erst nach Ablauf der Wartezeit, dann als Health-Check (HALF_OPEN).
+        """
+        if self.state == CIRCUIT_OPEN and now >= self._next_attempt:
+            self.state = CIRCUIT_HALF_OPEN
+        return self.state != CIRCUIT_OPEN
+
+    def record_success(self) -> bool:
+        """Erfolg melden; True, wenn sich die Verfügbarkeit dadurch geändert hat."""
+        changed = self.state != CIRCUIT_CLOSED
+        if changed:
+            _LOGGER.info(
+                f"Verbindung wiederhergestellt nach {self.consecutive_failures} Fehlversuchen."
+            )
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        return changed
+
+    def record_failure(self, now: float) -> bool:
+        """Fehlschlag melden, Circuit öffnen; True, wenn sich die Verfügbarkeit geändert hat."""
+        changed = self.state == CIRCUIT_CLOSED
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.state = CIRCUIT_OPEN
+        delay = self.backoff()
+        self._next_attempt = now + delay
+        _LOGGER.warning(
+            f"Gerät nicht erreichbar ({self.consecutive_failures}. Fehlschlag), "
+            f"nächster Versuch in {delay:.1f} s."
+        )
+        return changed
@@ -0,0 +1,80 @@
+"""Schreibplanung: kodierte Entitätswerte -> minimale Anzahl zusammenhängender Schreibzugriffe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from .const import C_REG_TYPE_COILS, C_REG_TYPE_HOLDING_REGISTERS
+
+# Maximale Anzahl Elemente je Request laut Modbus-Spezifikation
+MAX_WRITE_COUNT: Dict[int, int] = {
+    C_REG_TYPE_COILS: 1968,  # FC15
+    C_REG_TYPE_HOLDING_REGISTERS: 123,  # FC16
+}
+
+
+@dataclass(frozen=True)
+class EncodedWrite:
+    """Ein kodierter Entitätswert: Registertyp, Startadresse, Wörter bzw. Bits."""
+
+    key: str
+    reg_type: int
+    address: int
+    values: Tuple[int | bool, ...]
+
+
+@dataclass(frozen=True)
+class WriteBlock:
+    """Ein Schreibzugriff über zusammenhängende Adressen."""
+
+    reg_type: int
+    address: int
+    values: Tuple[int | bool, ...]
+    keys: Tuple[str, ...]
+
+    @property
+    def function_code(self) -> int:
+        """FC5/FC6 für ein einzelnes Element, sonst FC15/FC16."""
+        single = len(self.values) == 1
+        if self.reg_type == C_REG_TYPE_COILS:
+            return 5 if single else 15
+        return 6 if single else 16
+
+
+def build_write_plan(writes: Iterable[EncodedWrite]) -> List[WriteBlock]:
+    """
+    Fasst Schreibwerte je Registertyp zu lückenlosen Blöcken zusammen.
+    Mehrfach geschriebene Adressen: der spätere Wert gewinnt.
+    Lücken werden nie mitgeschrieben (keine Annahmen über fremde Register).
+    """
+    cells: Dict[int, Dict[int, Tuple[int | bool, str]]] = {}
+    for write in writes:
+        target = cells.setdefault(write.reg_type, {})
+        for offset, value in enumerate(write.values):
+            target[write.address + offset] = (value, write.key)
+
+    plan: List[WriteBlock] = []
+    for reg_type in (C_REG_TYPE_HOLDING_REGISTERS, C_REG_TYPE_COILS):
+        if reg_type not in cells:
+            continue
+        max_count = MAX_WRITE_COUNT[reg_type]
+        run: List[Tuple[int, int | bool, str]] = []
+        for address in sorted(cells[reg_type]):
+            value, key = cells[reg_type][address]
+            if run and (address != run[-1][0] + 1 or len(run) >= max_count):
+                plan.append(_make_block(reg_type, run))
+                run = []
+            run.append((address, value, key))
+        if run:
+            plan.append(_make_block(reg_type, run))
+    return plan
+
+
+def _make_block(reg_type: int, run: List[Tuple[int, int | bool, str]]) -> WriteBlock:
+    return WriteBlock(
+        reg_type=reg_type,
+        address=run[0][0],
+        values=tuple(value for _, value, _ in run),
+        keys=tuple(dict.fromkeys(key for _, _, key in run)),
+    )
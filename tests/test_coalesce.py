@@ -0,0 +1,112 @@
+"""WriteCoalescer: letzter Wert gewinnt, Abbruch und Fehler erreichen alle Aufrufer."""
+
+import asyncio
+import gc
+
+import pytest
+
+from custom_components.ha_comfoconnectpro.coalesce import WriteCoalescer
+
+
+def test_last_value_in_window_wins():
+    async def run():
+        written = []
+
+        async def write(key, value):
+            written.append((key, value))
+
+        coalescer = WriteCoalescer(write, settle=0.01)
+        await asyncio.gather(*(coalescer.submit("level", value) for value in (1, 2, 3)))
+        await coalescer.submit("level", 4)
+        assert written == [("level", 3), ("level", 4)]
+        assert (coalescer.submitted, coalescer.collapsed) == (4, 2)
+
+    asyncio.run(run())
+
+
+def test_without_settle_every_value_is_written():
+    async def run():
+        written = []
+
+        async def write(key, value):
+            written.append(value)
+
+        coalescer = WriteCoalescer(write, settle=0)
+        await coalescer.submit("level", 1)
+        await coalescer.submit("level", 2)
+        assert written == [1, 2]
+
+    asyncio.run(run())
+
+
+def test_error_reaches_every_waiting_caller():
+    async def run():
+        async def write(key, value):
+            raise ValueError(value)
+
+        coalescer = WriteCoalescer(write, settle=0.01)
+        results = await asyncio.gather(
+            coalescer.submit("level", 1), coalescer.submit("level", 2), return_exceptions=True
+        )
+        assert [str(exc) for exc in results] == ["2", "2"]
+
+    asyncio.run(run())
+
+
+def test_cancelled_caller_does_not_cancel_write():
+    async def run():
+        written = []
+
+        async def write(key, value):
+            written.append(value)
+
+        coalescer = WriteCoalescer(write, settle=0.01)
+        first = asyncio.create_task(coalescer.submit("level", 1))
+        second = asyncio.create_task(coalescer.submit("level", 2))
+        await asyncio.sleep(0)
+        first.cancel()
+        await second
+        assert written == [2]
+
+    asyncio.run(run())
+
+
+def test_cancel_drops_open_windows():
+    async def run():
+        written = []
+
+        async def write(key, value):
+            written.append(value)
+
+        coalescer = WriteCoalescer(write, settle=0.01)
+        caller = asyncio.create_task(coalescer.submit("level", 1))
+        await asyncio.sleep(0)
+        coalescer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0.02)
+        assert written == []
+
+    asyncio.run(run())
+
+
+def test_unawaited_error_is_not_reported_as_never_retrieved():
+    async def run():
+        reported = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: reported.append(context)
+        )
+
+        async def write(key, value):
+            raise ValueError(value)
+
+        coalescer = WriteCoalescer(write, settle=0.01)
+        caller = asyncio.create_task(coalescer.submit("level", 1))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.sleep(0.03)
+        del caller
+        gc.collect()
+        assert reported == []
+
+    asyncio.run(run())
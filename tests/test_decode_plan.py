@@ -0,0 +1,93 @@
+"""DecodePlan: kompilierte Slots gegen den früheren Dekodierer je Entität."""
+
+import random
+import struct
+
+from benchmarks.decode import legacy_decode_value
+from custom_components.ha_comfoconnectpro.const import (
+    C_DT_INT16,
+    C_DT_UINT16,
+    C_DT_UINT32,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+    ENTITIES_DICT,
+    get_entity_reg,
+)
+from custom_components.ha_comfoconnectpro.decode_plan import INVALID_RAW, DecodePlan
+from custom_components.ha_comfoconnectpro.read_plan import ReadBlock, build_read_plan
+
+
+def _ir(reg, dt=C_DT_UINT16, **props):
+    return {"RT": C_REG_TYPE_INPUT_REGISTERS, "REG": reg, "DT": dt, **props}
+
+
+def _decode(entities, address, values):
+    block = ReadBlock(C_REG_TYPE_INPUT_REGISTERS, address, len(values), tuple(entities))
+    data = {}
+    DecodePlan([block], entities).decode_block(0, values, data)
+    return data
+
+
+def test_matches_legacy_decoder_for_all_entities():
+    read_plan = build_read_plan(ENTITIES_DICT)
+    plan = DecodePlan(read_plan, ENTITIES_DICT)
+    rnd = random.Random(0)
+    for buffer_id, block in enumerate(read_plan):
+        is_bits = plan.blocks[buffer_id].is_bits
+        if is_bits:
+            buf = [rnd.random() < 0.5 for _ in range(block.count)]
+        else:
+            buf = [rnd.randrange(0, 300) for _ in range(block.count)]
+        data = {}
+        plan.decode_block(buffer_id, buf, data)
+        for key in block.keys:
+            props = ENTITIES_DICT[key]
+            reg, dt = get_entity_reg(props)
+            offset = reg - block.address
+            if is_bits:
+                raw = buf[offset]
+            else:
+                words = buf[offset : offset + dt.value[1]]
+                raw = struct.unpack(">" + dt.value[0], struct.pack(f">{len(words)}H", *words))[0]
+            assert data[key] == legacy_decode_value(props, raw), key
+
+
+def test_signed_scaled_and_multi_register_values():
+    entities = {
+        "temp": _ir(0, C_DT_INT16, FAKTOR=0.1),
+        "hours": _ir(2, C_DT_UINT32),
+    }
+    data = _decode(entities, 0, [0xFFFF, 0, 0x0001, 0x0002])
+    assert data == {"temp": -0.1, "hours": 65538.0}
+
+
+def test_invalid_sentinel_becomes_none():
+    data = _decode({"temp": _ir(5, C_DT_INT16, FAKTOR=0.1)}, 5, [INVALID_RAW & 0xFFFF])
+    assert data == {"temp": None}
+
+
+def test_overlapping_slots_are_decoded_separately():
+    entities = {"wide": _ir(0, C_DT_UINT32), "low": _ir(1)}
+    assert _decode(entities, 0, [1, 2]) == {"wide": 65538.0, "low": 2.0}
+
+
+def test_select_and_switch_mapping():
+    entities = {
+        "mode": _ir(0, VALUES={0: "Away", 1: "Home"}),
+        "flag": _ir(1, SWITCH={"off": 0}),
+    }
+    assert _decode(entities, 0, [1, 0]) == {"mode": "Home", "flag": "off"}
+    assert _decode(entities, 0, [9, 3])["mode"] == "Ungültiger Wert: 9"
+
+
+def test_decode_range_only_returns_complete_keys():
+    entities = {
+        "a": {"RT": C_REG_TYPE_HOLDING_REGISTERS, "REG": 0, "DT": C_DT_UINT16},
+        "b": {"RT": C_REG_TYPE_HOLDING_REGISTERS, "REG": 1, "DT": C_DT_UINT32},
+    }
+    plan = DecodePlan(build_read_plan(entities), entities)
+    data = {}
+    assert plan.decode_range(["a", "b", "unknown"], 0, [7, 0], data) == ["a"]
+    assert data == {"a": 7.0}
+    assert plan.decode_range(["b"], 1, [0, 3], data) == ["b"]
+    assert data["b"] == 3.0
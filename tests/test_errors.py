@@ -0,0 +1,57 @@
+"""ActiveErrors: Bitset der aktiven Fehler und Übergänge."""
+
+from custom_components.ha_comfoconnectpro.const import (
+    ACTIVE_ERROR_KEYS,
+    ENTITIES_DICT,
+    ERROR_DICT,
+    get_entity_reg,
+)
+from custom_components.ha_comfoconnectpro.decode_plan import DecodePlan
+from custom_components.ha_comfoconnectpro.errors import ActiveErrors, error_codes
+from custom_components.ha_comfoconnectpro.read_plan import build_read_plan
+
+
+def _setup():
+    read_plan = build_read_plan(ENTITIES_DICT)
+    errors = ActiveErrors(DecodePlan(read_plan, ENTITIES_DICT), ACTIVE_ERROR_KEYS, ERROR_DICT)
+    buffer_id = next(
+        i for i, block in enumerate(read_plan) if ACTIVE_ERROR_KEYS[0] in block.keys
+    )
+    block = read_plan[buffer_id]
+
+    def buffers(*codes):
+        buf = [0] * block.count
+        for key, code in zip(ACTIVE_ERROR_KEYS, codes):
+            buf[get_entity_reg(ENTITIES_DICT[key])[0] - block.address] = code
+        return [(buffer_id, buf)]
+
+    return errors, buffers
+
+
+def test_first_read_primes_without_transitions():
+    errors, buffers = _setup()
+    assert errors.update(buffers(3, 5)) == (0, 0)
+    assert errors.count == 2
+    assert errors.update(buffers(3, 5)) == (0, 0)
+
+
+def test_transitions_after_priming():
+    errors, buffers = _setup()
+    errors.update(buffers(3))
+    raised, cleared = errors.update(buffers(7, 3))
+    assert error_codes(raised) == [7]
+    assert cleared == 0
+    raised, cleared = errors.update(buffers(7))
+    assert raised == 0
+    assert error_codes(cleared) == [3]
+
+
+def test_register_order_does_not_matter():
+    errors, buffers = _setup()
+    errors.update(buffers(0, 4))
+    assert errors.update(buffers(4, 0)) == (0, 0)
+
+
+def test_no_error_register_read():
+    errors, _buffers = _setup()
+    assert errors.update([]) is None
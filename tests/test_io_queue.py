@@ -0,0 +1,107 @@
+"""ModbusIOQueue: Reihenfolge der Prioritäten und Abbruch laufender Jobs."""
+
+import asyncio
+
+import pytest
+from pymodbus.exceptions import ConnectionException
+
+from custom_components.ha_comfoconnectpro.io_queue import (
+    PRIORITY_READ,
+    PRIORITY_WRITE,
+    ModbusIOQueue,
+)
+
+
+def test_stop_fails_job_in_flight():
+    """Ein laufender Job darf seinen Aufrufer nach stop() nicht ewig warten lassen."""
+
+    async def run():
+        queue = ModbusIOQueue()
+        started = asyncio.Event()
+
+        async def slow_write():
+            started.set()
+            await asyncio.sleep(10)
+
+        caller = asyncio.create_task(queue.submit(PRIORITY_WRITE, slow_write))
+        queued = asyncio.create_task(queue.submit(PRIORITY_READ, slow_write))
+        await started.wait()
+        queue.stop()
+        async with asyncio.timeout(1):
+            with pytest.raises(ConnectionException):
+                await caller
+            with pytest.raises(ConnectionException):
+                await queued
+
+    asyncio.run(run())
+
+
+def test_queue_usable_after_stop():
+    async def run():
+        queue = ModbusIOQueue()
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def answer():
+            return 42
+
+        caller = asyncio.create_task(queue.submit(PRIORITY_READ, hang))
+        await started.wait()
+        queue.stop()
+        # Der neue Worker startet, bevor der alte seinen Abbruch verarbeitet hat
+        assert await queue.submit(PRIORITY_READ, answer) == 42
+        with pytest.raises(ConnectionException):
+            await caller
+
+    asyncio.run(run())
+
+
+def test_writes_before_reads_without_starving_reads():
+    async def run():
+        queue = ModbusIOQueue(max_burst=2)
+        order = []
+        gate = asyncio.Event()
+
+        def job(name):
+            async def func():
+                await gate.wait()
+                order.append(name)
+
+            return func
+
+        tasks = [asyncio.create_task(queue.submit(PRIORITY_READ, job("r0")))]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(queue.submit(PRIORITY_READ, job("r1")))]
+        tasks += [
+            asyncio.create_task(queue.submit(PRIORITY_WRITE, job(f"w{i}"))) for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert order == ["r0", "w0", "w1", "r1", "w2"]
+
+    asyncio.run(run())
+
+
+
+def test_peak_depth_survives_reads_until_reset():
+    async def run():
+        queue = ModbusIOQueue()
+        gate = asyncio.Event()
+
+        async def wait():
+            await gate.wait()
+
+        tasks = [asyncio.create_task(queue.submit(PRIORITY_READ, wait)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert queue.peak_depth == 3
+        assert queue.peak_depth == 3
+        queue.reset_peak_depth()
+        assert queue.peak_depth == 0
+
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+"""Oversampler: veröffentlichte Mittelwerte je Fenster."""
+
+from custom_components.ha_comfoconnectpro.oversampling import Oversampler
+
+
+def _sample(sampler, now, **values):
+    data = dict(values)
+    published = sampler.sample(values, data, now)
+    return data, published
+
+
+def test_running_mean_before_first_window():
+    sampler = Oversampler(["a"], window=10, capacity=8)
+    assert _sample(sampler, 0, a=1)[0] == {"a": 1.0}
+    assert _sample(sampler, 1, a=3)[0] == {"a": 2.0}
+
+
+def test_window_mean_and_attributes():
+    sampler = Oversampler(["a"], window=10, capacity=8)
+    for now, value in enumerate((1, 3, 5)):
+        _sample(sampler, now, a=value)
+    data, published = _sample(sampler, 11, a=7)
+    assert published == ["a"]
+    assert data == {"a": 4.0}
+    assert sampler.attributes["a"]["min"] == 1 and sampler.attributes["a"]["samples"] == 4
+    # Neues Fenster: bis zu dessen Ende bleibt der letzte Fenster-Mittelwert stehen
+    assert _sample(sampler, 12, a=100)[0] == {"a": 4.0}
+
+
+def test_invalid_reading_is_not_hidden():
+    sampler = Oversampler(["a"], window=10, capacity=8)
+    _sample(sampler, 0, a=1)
+    _sample(sampler, 11, a=3)
+    assert _sample(sampler, 12, a=None)[0] == {"a": None}
+
+
+def test_ring_buffer_keeps_newest_samples():
+    sampler = Oversampler(["a"], window=10, capacity=2)
+    for now, value in enumerate((1, 2, 3, 4)):
+        _sample(sampler, now, a=value)
+    data, _published = _sample(sampler, 11, a=6)
+    assert data == {"a": 5.0}
@@ -0,0 +1,78 @@
+"""PipelinedReader: geteilte Verbindung, Timeouts und ausdrückliche Ablehnung."""
+
+import asyncio
+import struct
+
+import pytest
+
+from benchmarks.simulator import start_simulator
+from custom_components.ha_comfoconnectpro.pipeline import PipelinePool, PipelineRejected
+
+REQUESTS = [(4, 0, 3), (3, 0, 5), (1, 0, 9)]
+
+
+def test_pool_shares_one_reader_per_gateway():
+    async def run():
+        sim = await start_simulator(latency=0.01, seed=0)
+        pool = PipelinePool()
+        first, second = pool.acquire("127.0.0.1", sim.port), pool.acquire("127.0.0.1", sim.port)
+        assert first is second
+        results = await asyncio.gather(
+            first.read_many(1, REQUESTS, 1.0), second.read_many(2, REQUESTS, 1.0)
+        )
+        assert [len(values) for values in results[0]] == [3, 5, 9]
+        assert len(sim._writers) == 1
+        pool.release(first)
+        assert first.connected
+        pool.release(second)
+        assert not first.connected and pool.idle
+        await sim.stop()
+
+    asyncio.run(run())
+
+
+def test_timeout_keeps_connection_for_next_batch():
+    async def run():
+        sim = await start_simulator(latency=0.05, seed=0)
+        reader = PipelinePool().acquire("127.0.0.1", sim.port)
+        with pytest.raises(TimeoutError):
+            await reader.read_many(1, REQUESTS, 0.01)
+        # Die späten Antworten des ersten Batches werden verworfen
+        assert len(await reader.read_many(1, REQUESTS, 1.0)) == 3
+        assert reader.connected
+        reader.close()
+        await sim.stop()
+
+    asyncio.run(run())
+
+
+def test_exception_response_rejects_pipelining():
+    async def run():
+        sim = await start_simulator(reject_pipelined=True)
+        reader = PipelinePool().acquire("127.0.0.1", sim.port)
+        with pytest.raises(PipelineRejected):
+            await reader.read_many(1, REQUESTS, 1.0)
+        reader.close()
+        await sim.stop()
+
+    asyncio.run(run())
+
+
+def test_foreign_transaction_id_rejects_pipelining():
+    async def handle(reader, writer):
+        while True:
+            tid, _pid, length, unit = struct.unpack(">HHHB", await reader.readexactly(7))
+            pdu = await reader.readexactly(length - 1)
+            response = bytes([pdu[0], 2, 0, 0])
+            writer.write(struct.pack(">HHHB", tid + 1000, 0, len(response) + 1, unit) + response)
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader = PipelinePool().acquire("127.0.0.1", port)
+        with pytest.raises(PipelineRejected):
+            await reader.read_many(1, [(4, 0, 1)], 1.0)
+        reader.close()
+        server.close()
+
+    asyncio.run(run())
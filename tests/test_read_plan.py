@@ -0,0 +1,104 @@
+"""Leseplan: Blöcke mit Lücken, PDU-Limit, Pollklassen und Requests je Zyklus."""
+
+from custom_components.ha_comfoconnectpro.const import (
+    C_DT_UINT16,
+    C_DT_UINT32,
+    C_POLL_FAST,
+    C_POLL_NORMAL,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+    ENTITIES_DICT,
+)
+from custom_components.ha_comfoconnectpro.read_plan import (
+    MAX_COUNT,
+    ReadCostModel,
+    build_read_plan,
+    plan_requests,
+)
+
+
+def _ir(reg, poll=C_POLL_NORMAL, dt=C_DT_UINT16):
+    return {"RT": C_REG_TYPE_INPUT_REGISTERS, "REG": reg, "DT": dt, "POLL": poll}
+
+
+def _layout(plan):
+    return [(block.function_code, block.address, block.count, block.poll) for block in plan]
+
+
+def test_small_gap_is_read_through():
+    plan = build_read_plan({"a": _ir(0), "b": _ir(10)})
+    assert _layout(plan) == [(4, 0, 11, C_POLL_NORMAL)]
+    assert plan[0].keys == ("a", "b")
+
+
+def test_large_gap_splits_block():
+    plan = build_read_plan({"a": _ir(0), "b": _ir(100)})
+    assert _layout(plan) == [(4, 0, 1, C_POLL_NORMAL), (4, 100, 1, C_POLL_NORMAL)]
+
+
+def test_cost_model_decides_split():
+    entities = {"a": _ir(0), "b": _ir(10)}
+    expensive_bytes = ReadCostModel(round_trip=1.0, per_byte=1.0)
+    assert len(build_read_plan(entities, expensive_bytes)) == 2
+
+
+def test_block_respects_pdu_limit():
+    entities = {f"r{reg}": _ir(reg) for reg in range(130)}
+    plan = build_read_plan(entities)
+    assert all(block.count <= MAX_COUNT[C_REG_TYPE_INPUT_REGISTERS] for block in plan)
+    assert sum(block.count for block in plan) == 130
+
+
+def test_multi_register_value_extends_block():
+    plan = build_read_plan({"a": _ir(0), "b": _ir(4, dt=C_DT_UINT32)})
+    assert _layout(plan) == [(4, 0, 6, C_POLL_NORMAL)]
+
+
+def test_poll_classes_never_share_a_block():
+    plan = build_read_plan({"a": _ir(0, C_POLL_FAST), "b": _ir(1), "c": _ir(2, C_POLL_FAST)})
+    assert _layout(plan) == [(4, 0, 3, C_POLL_FAST), (4, 1, 1, C_POLL_NORMAL)]
+
+
+def test_entities_plan_covers_every_readable_key_once():
+    plan = build_read_plan(ENTITIES_DICT)
+    keys = [key for block in plan for key in block.keys]
+    assert len(keys) == len(set(keys))
+    for block in plan:
+        assert block.count <= MAX_COUNT[block.reg_type]
+
+
+def test_overlapping_due_blocks_become_one_request():
+    plan = build_read_plan({"a": _ir(0, C_POLL_FAST), "b": _ir(1), "c": _ir(2, C_POLL_FAST)})
+    (request,) = plan_requests(plan, [0, 1])
+    assert (request.block.address, request.block.count) == (0, 3)
+    assert request.split([10, 11, 12]) == [(0, [10, 11, 12]), (1, [11])]
+
+
+def test_single_due_block_is_read_as_planned():
+    plan = build_read_plan({"a": _ir(0, C_POLL_FAST), "b": _ir(1), "c": _ir(2, C_POLL_FAST)})
+    (request,) = plan_requests(plan, [1])
+    assert request.block is plan[1]
+    assert request.split([7]) == [(1, [7])]
+
+
+def test_distant_or_foreign_blocks_stay_separate():
+    entities = {
+        "a": _ir(0, C_POLL_FAST),
+        "b": _ir(100),
+        "c": {"RT": C_REG_TYPE_HOLDING_REGISTERS, "REG": 1, "DT": C_DT_UINT16},
+    }
+    plan = build_read_plan(entities)
+    requests = plan_requests(plan, range(len(plan)))
+    assert [(r.block.function_code, r.block.address) for r in requests] == [
+        (4, 0),
+        (4, 100),
+        (3, 1),
+    ]
+
+
+def test_requests_never_exceed_pdu_limit():
+    entities = {"a": _ir(0, C_POLL_FAST), "b": _ir(1), "c": _ir(124, C_POLL_FAST)}
+    entities.update({f"r{reg}": _ir(reg) for reg in range(100, 130)})
+    plan = build_read_plan(entities)
+    for request in plan_requests(plan, range(len(plan))):
+        assert request.block.count <= MAX_COUNT[C_REG_TYPE_INPUT_REGISTERS]
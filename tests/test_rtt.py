@@ -0,0 +1,46 @@
+"""RttEstimator: Glättung nach RFC 6298, Grenzen und Wiederholungen."""
+
+import pytest
+
+from custom_components.ha_comfoconnectpro.rtt import RttEstimator
+
+
+def test_initial_timeout_without_samples():
+    rtt = RttEstimator(0.1, 2.0, 3, initial=1.0)
+    assert rtt.timeout(4) == 1.0
+    assert rtt.retries(4) == 1
+    assert rtt.srtt is None
+    assert RttEstimator(0.1, 2.0, 3, initial=5.0).timeout(4) == 2.0
+
+
+def test_smoothing_follows_rfc_6298():
+    rtt = RttEstimator(0.1, 2.0, 3)
+    rtt.sample(4, 0.2)
+    assert rtt.estimates[4].srtt == pytest.approx(0.2)
+    assert rtt.estimates[4].rttvar == pytest.approx(0.1)
+    assert rtt.timeout(4) == pytest.approx(0.6)
+    rtt.sample(4, 0.4)
+    # rttvar = 3/4 * 0.1 + 1/4 * |0.2 - 0.4|, srtt = 7/8 * 0.2 + 1/8 * 0.4
+    assert rtt.estimates[4].rttvar == pytest.approx(0.125)
+    assert rtt.estimates[4].srtt == pytest.approx(0.225)
+    assert rtt.timeout(4) == pytest.approx(0.725)
+
+
+def test_timeout_is_clamped_and_sets_retries():
+    rtt = RttEstimator(0.1, 2.0, 3)
+    rtt.sample(3, 0.001)
+    assert rtt.timeout(3) == 0.1
+    assert rtt.retries(3) == 3
+    rtt.sample(16, 5.0)
+    assert rtt.timeout(16) == 2.0
+    assert rtt.retries(16) == 0
+
+
+def test_estimates_are_kept_per_function_code():
+    rtt = RttEstimator(0.1, 2.0, 3, initial=1.0)
+    rtt.sample(4, 0.2)
+    rtt.sample(3, 0.3)
+    assert rtt.srtt_by_function_code() == {3: 0.3, 4: 0.2}
+    assert rtt.srtt == 0.3
+    assert rtt.max_timeout == pytest.approx(0.9)
+    assert rtt.timeout(1) == 1.0
@@ -0,0 +1,53 @@
+"""RegisterShadow: nur bestätigte, ausreichend aktuelle Werte unterdrücken Schreibzugriffe."""
+
+from custom_components.ha_comfoconnectpro import shadow as shadow_module
+from custom_components.ha_comfoconnectpro.const import (
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+    C_REG_TYPE_INPUT_REGISTERS,
+)
+from custom_components.ha_comfoconnectpro.shadow import RegisterShadow
+from custom_components.ha_comfoconnectpro.write_plan import EncodedWrite
+
+HR = C_REG_TYPE_HOLDING_REGISTERS
+
+
+def _shadow(monkeypatch, now):
+    clock = [now]
+    monkeypatch.setattr(shadow_module.time, "monotonic", lambda: clock[0])
+    return RegisterShadow(), clock
+
+
+def test_matches_confirmed_values(monkeypatch):
+    shadow, _clock = _shadow(monkeypatch, 100.0)
+    shadow.update(HR, 0, [1, 2])
+    assert shadow.matches(EncodedWrite("a", HR, 0, (1, 2)), max_age=10)
+    assert not shadow.matches(EncodedWrite("a", HR, 0, (1, 3)), max_age=10)
+    assert not shadow.matches(EncodedWrite("a", HR, 1, (2, 0)), max_age=10)
+
+
+def test_old_values_do_not_match(monkeypatch):
+    shadow, clock = _shadow(monkeypatch, 100.0)
+    shadow.update(HR, 0, [1])
+    clock[0] = 105.0
+    assert shadow.matches(EncodedWrite("a", HR, 0, (1,)), max_age=10)
+    clock[0] = 111.0
+    assert not shadow.matches(EncodedWrite("a", HR, 0, (1,)), max_age=10)
+
+
+def test_invalidate_and_clear(monkeypatch):
+    shadow, _clock = _shadow(monkeypatch, 100.0)
+    shadow.update(HR, 0, [1, 2])
+    shadow.invalidate(HR, 1, 1)
+    assert shadow.matches(EncodedWrite("a", HR, 0, (1,)), max_age=10)
+    assert not shadow.matches(EncodedWrite("b", HR, 1, (2,)), max_age=10)
+    shadow.clear()
+    assert not shadow.matches(EncodedWrite("a", HR, 0, (1,)), max_age=10)
+
+
+def test_coils_compare_as_bool_and_read_only_types_are_ignored(monkeypatch):
+    shadow, _clock = _shadow(monkeypatch, 100.0)
+    shadow.update(C_REG_TYPE_COILS, 3, [1])
+    shadow.update(C_REG_TYPE_INPUT_REGISTERS, 0, [5])
+    assert shadow.matches(EncodedWrite("c", C_REG_TYPE_COILS, 3, (True,)), max_age=10)
+    assert not shadow.matches(EncodedWrite("i", C_REG_TYPE_INPUT_REGISTERS, 0, (5,)), max_age=10)
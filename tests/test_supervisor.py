@@ -0,0 +1,62 @@
+"""ConnectionSupervisor: Circuit Breaker mit exponentiellem Backoff und Jitter."""
+
+from custom_components.ha_comfoconnectpro import supervisor as supervisor_module
+from custom_components.ha_comfoconnectpro.supervisor import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    ConnectionSupervisor,
+)
+
+
+def _no_jitter(monkeypatch):
+    monkeypatch.setattr(supervisor_module.random, "random", lambda: 0.0)
+
+
+def test_backoff_doubles_up_to_cap(monkeypatch):
+    _no_jitter(monkeypatch)
+    supervisor = ConnectionSupervisor(1.0, 5.0)
+    delays = []
+    for _ in range(5):
+        supervisor.record_failure(0.0)
+        delays.append(supervisor.backoff())
+    assert delays == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_jitter_shortens_delay(monkeypatch):
+    monkeypatch.setattr(supervisor_module.random, "random", lambda: 1.0)
+    supervisor = ConnectionSupervisor(4.0, 60.0, jitter=0.5)
+    supervisor.record_failure(0.0)
+    assert supervisor.backoff() == 2.0
+
+
+def test_open_circuit_waits_then_allows_health_check(monkeypatch):
+    _no_jitter(monkeypatch)
+    supervisor = ConnectionSupervisor(10.0, 60.0)
+    assert supervisor.allow(0.0)
+    assert supervisor.record_failure(100.0) is True
+    assert supervisor.state == CIRCUIT_OPEN and not supervisor.available
+    assert not supervisor.allow(105.0)
+    assert supervisor.allow(110.0)
+    assert supervisor.state == CIRCUIT_HALF_OPEN
+
+
+def test_failed_health_check_reopens_with_longer_backoff(monkeypatch):
+    _no_jitter(monkeypatch)
+    supervisor = ConnectionSupervisor(10.0, 60.0)
+    supervisor.record_failure(0.0)
+    supervisor.allow(10.0)
+    assert supervisor.record_failure(10.0) is False
+    assert not supervisor.allow(25.0)
+    assert supervisor.allow(30.0)
+
+
+def test_success_closes_circuit(monkeypatch):
+    _no_jitter(monkeypatch)
+    supervisor = ConnectionSupervisor(10.0, 60.0)
+    assert supervisor.record_success() is False
+    supervisor.record_failure(0.0)
+    supervisor.allow(10.0)
+    assert supervisor.record_success() is True
+    assert supervisor.state == CIRCUIT_CLOSED
+    assert supervisor.consecutive_failures == 0 and supervisor.failures == 1
@@ -0,0 +1,60 @@
+"""Schreibplan: lückenlose Blöcke je Registertyp, späterer Wert gewinnt."""
+
+from custom_components.ha_comfoconnectpro.const import (
+    C_REG_TYPE_COILS,
+    C_REG_TYPE_HOLDING_REGISTERS,
+)
+from custom_components.ha_comfoconnectpro.write_plan import (
+    MAX_WRITE_COUNT,
+    EncodedWrite,
+    build_write_plan,
+)
+
+HR = C_REG_TYPE_HOLDING_REGISTERS
+
+
+def test_adjacent_writes_share_one_request():
+    plan = build_write_plan(
+        [EncodedWrite("b", HR, 1, (20,)), EncodedWrite("a", HR, 0, (10,))]
+    )
+    assert [(b.address, b.values, b.keys, b.function_code) for b in plan] == [
+        (0, (10, 20), ("a", "b"), 16)
+    ]
+
+
+def test_gap_is_never_written():
+    plan = build_write_plan([EncodedWrite("a", HR, 0, (1,)), EncodedWrite("b", HR, 2, (2,))])
+    assert [(b.address, b.values, b.function_code) for b in plan] == [
+        (0, (1,), 6),
+        (2, (2,), 6),
+    ]
+
+
+def test_later_value_wins_for_same_address():
+    plan = build_write_plan(
+        [EncodedWrite("a", HR, 0, (1, 2)), EncodedWrite("b", HR, 1, (9,))]
+    )
+    assert [(b.values, b.keys) for b in plan] == [((1, 9), ("a", "b"))]
+
+
+def test_registers_before_coils():
+    plan = build_write_plan(
+        [
+            EncodedWrite("c", C_REG_TYPE_COILS, 0, (True,)),
+            EncodedWrite("d", C_REG_TYPE_COILS, 1, (False,)),
+            EncodedWrite("h", HR, 4, (3,)),
+        ]
+    )
+    assert [(b.reg_type, b.function_code) for b in plan] == [
+        (HR, 6),
+        (C_REG_TYPE_COILS, 15),
+    ]
+
+
+def test_long_run_is_split_at_pdu_limit():
+    count = MAX_WRITE_COUNT[HR] + 5
+    plan = build_write_plan([EncodedWrite("a", HR, 0, tuple(range(count)))])
+    assert [(b.address, len(b.values)) for b in plan] == [
+        (0, MAX_WRITE_COUNT[HR]),
+        (MAX_WRITE_COUNT[HR], 5),
+    ]